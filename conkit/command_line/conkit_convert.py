@@ -35,6 +35,15 @@ This script can convert either contact prediction files or sequence files.
 In case of the latter, a file with a single or multiple sequences can be
 converted.
 
+Many files can be converted in parallel, either listed in a tab-separated
+manifest with the columns infile, informat, outfile and outformat:
+
+    conkit-convert --batch manifest.tsv
+
+or all files in a directory, written with the same name to an output directory:
+
+    conkit-convert --input-dir predictions/ informat outdir/ outformat
+
 !!! IMPORTANT
 =============
 Do not attempt to mix formats, i.e. convert from a contact file format
@@ -47,6 +56,7 @@ __date__ = "01 Oct 2016"
 __version__ = "0.13.3"
 
 import argparse
+import os
 
 import conkit.command_line
 import conkit.io
@@ -54,29 +64,83 @@ import conkit.io
 logger = None
 
 
+def read_manifest(fname):
+    """Read the conversion jobs from a tab-separated manifest file"""
+    jobs = []
+    with open(fname, "r") as f_in:
+        for line in f_in:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 4:
+                raise ValueError("Expected four tab-separated columns in manifest line: {}".format(line.strip()))
+            jobs.append(tuple(fields))
+    return jobs
+
+
+def directory_jobs(input_dir, informat, output_dir, outformat, extension=None):
+    """Create the conversion jobs for all files in a directory"""
+    if extension is None:
+        extension = "." + outformat
+    jobs = []
+    for f_name in sorted(os.listdir(input_dir)):
+        infile = os.path.join(input_dir, f_name)
+        if os.path.isfile(infile):
+            outfile = os.path.join(output_dir, os.path.splitext(f_name)[0] + extension)
+            jobs.append((infile, informat, outfile, outformat))
+    return jobs
+
+
 def main():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument("infile")
-    parser.add_argument("informat")
-    parser.add_argument("outfile")
-    parser.add_argument("outformat")
+    parser.add_argument("--batch", metavar="MANIFEST", help="Tab-separated file listing the conversions")
+    parser.add_argument("--input-dir", help="Convert all files in this directory")
+    parser.add_argument("--extension", help="Extension of the output files in directory mode [default: .outformat]")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes [default: all CPUs]")
+    parser.add_argument("files", nargs="*", help="infile informat outfile outformat, or informat outdir outformat")
     args = parser.parse_args()
 
     global logger
     logger = conkit.command_line.setup_logging(level="info")
 
-    if args.outformat == "rosetta":
+    if args.batch:
+        if args.files:
+            parser.error("No positional arguments are allowed with --batch")
+        jobs = read_manifest(args.batch)
+    elif args.input_dir:
+        if len(args.files) != 3:
+            parser.error("--input-dir requires the arguments: informat outdir outformat")
+        informat, output_dir, outformat = args.files
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+        jobs = directory_jobs(args.input_dir, informat, output_dir, outformat, extension=args.extension)
+    else:
+        if len(args.files) != 4:
+            parser.error("the following arguments are required: infile informat outfile outformat")
+        jobs = [tuple(args.files)]
+
+    if any(outformat == "rosetta" for _, _, _, outformat in jobs):
         raise NotImplementedError("This conversion is not yet supported")
 
-    msg = "Converting file{nline}{tab}{infile} of format {informat}{nline}"
-    msg += "to file{nline}{tab}{outfile} of format {outformat}"
-    msg = msg.format(
-        infile=args.infile, informat=args.informat, outfile=args.outfile, outformat=args.outformat, nline="\n", tab="\t"
-    )
-    logger.info(msg)
-    conkit.io.convert(args.infile, args.informat, args.outfile, args.outformat)
-
-    return
+    if not (args.batch or args.input_dir):
+        infile, informat, outfile, outformat = jobs[0]
+        msg = "Converting file{nline}{tab}{infile} of format {informat}{nline}"
+        msg += "to file{nline}{tab}{outfile} of format {outformat}"
+        msg = msg.format(infile=infile, informat=informat, outfile=outfile, outformat=outformat, nline="\n", tab="\t")
+        logger.info(msg)
+        conkit.io.convert(infile, informat, outfile, outformat)
+        return
+
+    logger.info("Converting %d files", len(jobs))
+    results = conkit.io.convert_many(jobs, workers=args.workers)
+    failed = 0
+    for job, error in results:
+        if error:
+            failed += 1
+            logger.error("Failed to convert %s: %s", job[0], error)
+    logger.info("Converted %d of %d files", len(jobs) - failed, len(jobs))
+    if failed:
+        raise RuntimeError("{} of {} conversions failed".format(failed, len(jobs)))
 
 
 if __name__ == "__main__":
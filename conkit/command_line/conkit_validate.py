@@ -33,31 +33,52 @@
 take a sequence, a predicted distogram and a PDB model, then
 compare the distances observed in the model and those predicted.
 It will then report regions in the model where an outlier was
-detected, and use map_align to provide a solution for potential
-register errors.
+detected, and use a contact map alignment to provide a solution
+for potential register errors.
 
-It uses one external program to perform this task:
+Many models can be validated against the same prediction, which
+is only read and prepared once, in a pool of worker processes.
+The models are listed in a file with one path per line and the
+per-residue scores of all models are written to a single TSV or
+JSON file, with the figures of each model being optional:
+
+    conkit-validate seqfile seqformat distfile distformat --models models.txt --workers 8 -scores scores.tsv
+
+Structure files in mmCIF format are validated with --models_format mmcif.
+
+The contact map alignment uses one external program:
 
    map_align for contact map alignment
 
 *** This program needs to be installed separately from https://github.com/sokrypton/map_align***
 
+Alternatively, the alignment can be computed in-process with the
+experimental --align option, which does not require map_align but
+has not yet been shown to give the same alignments.
+
 """
 
 import argparse
-from Bio.PDB import PDBParser
-from Bio.PDB.DSSP import DSSP
+import multiprocessing
 import os
+
+import pandas as pd
 from prettytable import PrettyTable
 
 import conkit.applications
 import conkit.command_line
 import conkit.io
 import conkit.plot
+from conkit.misc.dssp import DsspCache
+from conkit.misc.mapalign import ContactMapAligner
+from conkit.misc.validation import ModelValidator, read_model
 from conkit.plot.tools import is_executable
 
 logger = None
 
+# Set in each worker process by _init_worker
+_WORKER_STATE = None
+
 
 def create_argument_parser():
     """Create a parser for the command line arguments used in conkit-validate"""
@@ -68,14 +89,32 @@ def create_argument_parser():
     parser.add_argument("distfile", type=check_file_exists, help="Path to distance prediction file")
     parser.add_argument("distformat", type=str, help="Format of distance prediction file",
                         choices=list(conkit.io.DISTANCE_FILE_PARSERS.keys()))
-    parser.add_argument("pdbfile", type=check_file_exists, help="Path to structure file")
-    parser.add_argument("pdbformat", type=str, help="Format of structure file", choices=['pdb', 'mmcif'])
+    parser.add_argument("pdbfile", type=check_file_exists, nargs="?", default=None,
+                        help="Path to structure file, not used with --models")
+    parser.add_argument("pdbformat", type=str, nargs="?", default="pdb", choices=['pdb', 'mmcif'],
+                        help="Format of structure file, see --models_format for the files listed with --models")
     parser.add_argument("-dssp_exe", dest="dssp", default='mkdssp', help="path to dssp executable", type=is_executable)
+    parser.add_argument("--dssp_cache", dest="dssp_cache", default=None, type=str,
+                        help="directory to store DSSP outputs in and reuse them for structures with the same coordinates")
     parser.add_argument("-output", dest="output", default="conkit.png", help="path to output figure png file", type=str)
     parser.add_argument("--overwrite", dest="overwrite", default=False, action="store_true",
-                        help="overwrite output figure png file if it already exists")
+                        help="overwrite output files if they already exist")
+    parser.add_argument("--models", dest="models", default=None, type=check_file_exists,
+                        help="file listing the paths of many structure files to validate, one per line")
+    parser.add_argument("--models_format", dest="models_format", default="pdb", type=str,
+                        help="format of the structure files listed with --models", choices=['pdb', 'mmcif'])
+    parser.add_argument("--workers", dest="workers", default=1, type=int,
+                        help="number of worker processes used to validate the models listed with --models")
+    parser.add_argument("-scores", dest="scores", default="conkit_scores.tsv", type=str,
+                        help="path to the per-residue scores of the models listed with --models, in JSON format if "
+                             "the extension is .json and TSV format otherwise")
+    parser.add_argument("--plot_dir", dest="plot_dir", default=None, type=str,
+                        help="directory to write a figure for each of the models listed with --models")
     parser.add_argument("--map_align_exe", dest="map_align_exe", default=None,
                         type=is_executable, help="Path to the map_align executable")
+    parser.add_argument("--align", dest="align", default=False, action="store_true",
+                        help="experimental: align the contact maps in-process instead of using the map_align "
+                             "executable, the alignments have not yet been verified against map_align")
     parser.add_argument("--gap_opening_penalty", dest="gap_opening_penalty", default=-1, type=float,
                         help="Gap opening penalty")
     parser.add_argument("--gap_extension_penalty", dest="gap_extension_penalty", default=-0.01, type=float,
@@ -115,16 +154,152 @@ def check_file_exists(input_path):
         raise FileNotFoundError("{} cannot be found".format(input_path))
 
 
+def read_models_list(fname):
+    """Read the paths of the structure files listed in a file, one per line
+
+    Relative paths are interpreted relative to the directory of the file.
+
+    """
+    pdbfiles = []
+    with open(fname, "r") as f_in:
+        for line in f_in:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            pdbfiles.append(check_file_exists(os.path.join(os.path.dirname(fname), line)))
+    return pdbfiles
+
+
+def validate_models(validator, pdbfiles, pdbformat, dssp_exe, dssp_cache=None, plot_dir=None, overwrite=False,
+                    workers=1, chunksize=None):
+    """Validate many models against the same prediction in a pool of worker processes
+
+    A model that cannot be validated does not abort the remaining ones, but is reported in the results.
+
+    Parameters
+    ----------
+    validator : :obj:`~conkit.misc.validation.ModelValidator`
+       The validator for the prediction, sent to each worker process once
+    pdbfiles : list
+       The paths to the structure files
+    pdbformat : str
+       Format of the structure files
+    dssp_exe : str
+       Path to the DSSP executable
+    dssp_cache : str, optional
+       Directory to store the DSSP outputs in [default: None]
+    plot_dir : str, optional
+       Directory to write a figure for each model in [default: None]
+    overwrite : bool, optional
+       Overwrite existing figures in ``plot_dir`` [default: False]
+    workers : int, optional
+       The number of worker processes, if 1 the models are validated in this process [default: 1]
+    chunksize : int, optional
+       The number of models sent to a worker process at a time [default: spread evenly across workers]
+
+    Returns
+    -------
+    generator
+       A tuple of the structure file, its :obj:`~conkit.misc.validation.ModelValidationResult` or `None` and the
+       error message or `None`, in the order of the structure files
+
+    """
+    workers = max(1, min(workers, len(pdbfiles)))
+    if chunksize is None:
+        chunksize = max(1, len(pdbfiles) // (workers * 4))
+    initargs = (validator, pdbformat, dssp_exe, dssp_cache, plot_dir, overwrite)
+
+    if workers == 1:
+        _init_worker(*initargs)
+        for pdbfile in pdbfiles:
+            yield _validate_job(pdbfile)
+        return
+    with multiprocessing.Pool(workers, _init_worker, initargs) as pool:
+        for result in pool.imap(_validate_job, pdbfiles, chunksize):
+            yield result
+
+
+def _init_worker(validator, pdbformat, dssp_exe, dssp_cache, plot_dir, overwrite):
+    """Store the validator and the options shared by all models in a worker process"""
+    global _WORKER_STATE
+    _WORKER_STATE = (validator, pdbformat, dssp_exe, DsspCache(dssp_cache), plot_dir, overwrite)
+
+
+def _validate_job(pdbfile):
+    """Validate a single model for :func:`validate_models` and capture any error"""
+    validator, pdbformat, dssp_exe, dssp_cache, plot_dir, overwrite = _WORKER_STATE
+    try:
+        model, dssp = read_model(pdbfile, pdbformat, dssp_exe, dssp_cache)
+        if plot_dir is None:
+            result = validator.validate(model, dssp)
+        else:
+            import matplotlib.pyplot as plt
+
+            figure = conkit.plot.ModelValidationFigure(model, None, None, dssp, validator=validator)
+            try:
+                figure.savefig(os.path.join(plot_dir, os.path.splitext(os.path.basename(pdbfile))[0] + ".png"),
+                               overwrite=overwrite)
+            finally:
+                plt.close(figure.fig)
+            result = figure.result
+    except Exception as e:
+        return pdbfile, None, "{}: {}".format(e.__class__.__name__, e)
+    return pdbfile, result, None
+
+
+def write_scores(fname, results):
+    """Write the per-residue scores of many models to a single TSV or JSON file
+
+    Parameters
+    ----------
+    fname : str
+       The path to the output file, in JSON format if the extension is .json and TSV format otherwise
+    results : list
+       A tuple of the structure file and its :obj:`~conkit.misc.validation.ModelValidationResult` for each model
+
+    """
+    frames = []
+    for pdbfile, result in results:
+        residue_scores = result.get_residue_scores()
+        residue_scores.insert(0, 'MODEL', pdbfile)
+        frames.append(residue_scores)
+    if frames:
+        scores = pd.concat(frames, ignore_index=True)
+    else:
+        scores = pd.DataFrame(columns=['MODEL', 'RESNUM', 'SCORE', 'MISALIGNED', 'REGISTER'])
+    if os.path.splitext(fname)[1].lower() == ".json":
+        scores.to_json(fname, orient="records", indent=1)
+    else:
+        scores.to_csv(fname, sep="\t", index=False, float_format="%.6f")
+
+
+def create_aligner(args):
+    """Create the in-process contact map aligner if requested with --align"""
+    if not args.align:
+        return None
+    return ContactMapAligner(gap_opening_penalty=args.gap_opening_penalty,
+                             gap_extension_penalty=args.gap_extension_penalty,
+                             seq_separation_cutoff=args.seq_separation_cutoff, n_iterations=args.n_iterations)
+
+
 def main():
     """The main routine for conkit-validate functionality"""
     parser = create_argument_parser()
     args = parser.parse_args()
 
+    if args.models is None and args.pdbfile is None:
+        parser.error("the following arguments are required: pdbfile, or --models")
+    elif args.models is not None and args.pdbfile is not None:
+        parser.error("pdbfile cannot be used together with --models")
+    if args.align and args.map_align_exe is not None:
+        parser.error("--align cannot be used together with --map_align_exe")
+
     global logger
     logger = conkit.command_line.setup_logging(level="info")
 
-    if os.path.isfile(args.output) and not args.overwrite:
-        raise FileExistsError('The output file {} already exists!'.format(args.output))
+    output = args.output if args.models is None else args.scores
+    if os.path.isfile(output) and not args.overwrite:
+        raise FileExistsError('The output file {} already exists!'.format(output))
 
     logger.info(os.linesep + "Working directory:                           %s", os.getcwd())
     logger.info("Reading input sequence:                      %s", args.seqfile)
@@ -136,18 +311,21 @@ def main():
     logger.info("Length of the sequence:                      %d", len(sequence))
     logger.info("Reading input distance prediction:           %s", args.distfile)
     prediction = conkit.io.read(args.distfile, args.distformat).top
+    validator = ModelValidator(prediction, sequence, map_align_exe=args.map_align_exe, aligner=create_aligner(args))
+
+    if args.models is not None:
+        validate_batch(args, validator)
+        return
+
     logger.info("Reading input PDB model:                     %s", args.pdbfile)
-    model = conkit.io.read(args.pdbfile, args.pdbformat).top
-    p = PDBParser()
-    structure = p.get_structure('structure', args.pdbfile)[0]
-    dssp = DSSP(structure, args.pdbfile, dssp=args.dssp, acc_array='Wilke')
+    model, dssp = read_model(args.pdbfile, args.pdbformat, args.dssp, DsspCache(args.dssp_cache))
 
     logger.info(os.linesep + "Validating model.")
 
     if len(sequence) > 500:
         logger.info("Input model has more than 500 residues, this might take a while...")
 
-    figure = conkit.plot.ModelValidationFigure(model, prediction, sequence, dssp, map_align_exe=args.map_align_exe)
+    figure = conkit.plot.ModelValidationFigure(model, None, None, dssp, validator=validator)
     figure.savefig(args.output, overwrite=args.overwrite)
     logger.info(os.linesep + "Validation plot written to %s", args.output)
 
@@ -177,6 +355,30 @@ def main():
     logger.info(table)
 
 
+def validate_batch(args, validator):
+    """Validate all models listed with --models and write their per-residue scores to a single file"""
+    pdbfiles = read_models_list(args.models)
+    logger.info("Validating %d models with %d worker processes", len(pdbfiles), args.workers)
+    if args.plot_dir is not None and not os.path.isdir(args.plot_dir):
+        os.makedirs(args.plot_dir)
+
+    results = []
+    failed = 0
+    for pdbfile, result, error in validate_models(validator, pdbfiles, args.models_format, args.dssp,
+                                                  dssp_cache=args.dssp_cache, plot_dir=args.plot_dir,
+                                                  overwrite=args.overwrite, workers=args.workers):
+        if error:
+            failed += 1
+            logger.error("Failed to validate %s: %s", pdbfile, error)
+        else:
+            results.append((pdbfile, result))
+
+    write_scores(args.scores, results)
+    logger.info("Validated %d of %d models, scores written to %s", len(results), len(pdbfiles), args.scores)
+    if failed:
+        raise RuntimeError("{} of {} models could not be validated".format(failed, len(pdbfiles)))
+
+
 if __name__ == "__main__":
     import sys
     import traceback
@@ -0,0 +1,116 @@
+"""Testing facility for conkit.command_line.conkit_validate"""
+
+import numpy as np
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from Bio.PDB import MMCIFIO, PDBParser
+
+import conkit.io
+from conkit.command_line import conkit_validate
+from conkit.core.distance import Distance
+from conkit.core.distogram import Distogram
+from conkit.core.sequence import Sequence
+
+BINS = ((0, 4), (4, 6), (6, 8), (8, 10), (10, 12), (12, 14), (14, 16), (16, 18), (18, 20), (20, np.inf))
+BIN_CENTERS = np.array([2, 5, 7, 9, 11, 13, 15, 17, 19, 22])
+
+FAKE_DSSP = """#!{executable}
+import sys
+from Bio.PDB import MMCIFParser, PDBParser
+if sys.argv[1] == "--version":
+    print("mkdssp version 4.0.4")
+    sys.exit(0)
+parser = MMCIFParser(QUIET=True) if sys.argv[-1].endswith(".cif") else PDBParser(QUIET=True)
+residues = [residue.id[1] for residue in parser.get_structure("model", sys.argv[-1])[0]["A"]]
+print("  #  RESIDUE AA STRUCTURE BP1 BP2  ACC     N-H-->O    O-->H-N    N-H-->O    O-->H-N    TCO  KAPPA ALPHA  PHI   PSI")
+for i, resseq in enumerate(residues, 1):
+    line = "{{:5d}}{{:5d}} A A  {{}}".format(i, resseq, "HE "[i % 3]) + " " * 17 + "{{:4d}}".format(10 * (i % 10))
+    line += "{{:7d}} {{:4.1f}}{{:6d}} {{:4.1f}}{{:6d}} {{:4.1f}}{{:6d}} {{:4.1f}}".format(0, 0, 0, 0, 0, 0, 0, 0)
+    print(line + " " * 20 + "{{:6.1f}}{{:6.1f}}".format(-60.0, -45.0))
+"""
+
+
+def _coordinates(nres, seed):
+    random_state = np.random.RandomState(seed)
+    steps = random_state.normal(size=(nres, 3))
+    steps *= 3.8 / np.linalg.norm(steps, axis=1)[:, None]
+    return np.cumsum(steps, axis=0)
+
+
+def _distogram(nres, seed):
+    coordinates = _coordinates(nres, seed)
+    distogram = Distogram("1")
+    for i in range(1, nres + 1):
+        for j in range(i + 1, nres + 1):
+            distance = np.linalg.norm(coordinates[i - 1] - coordinates[j - 1])
+            distance_scores = np.exp(-0.5 * ((BIN_CENTERS - distance) / 2.0) ** 2) + 0.01
+            distogram.add(Distance(i, j, tuple((distance_scores / distance_scores.sum()).tolist()), BINS))
+    return distogram
+
+
+def _pdb_content(coordinates):
+    lines, serial = [], 1
+    for resseq, (x, y, z) in enumerate(coordinates, 1):
+        for name, shift in (("CA", 0.0), ("CB", 0.5)):
+            lines.append("ATOM  {:5d}  {:<3s} ALA A{:4d}    {:8.3f}{:8.3f}{:8.3f}  1.00 10.00           C".format(
+                serial, name, resseq, x + shift, y, z))
+            serial += 1
+    return os.linesep.join(lines + ["END", ""])
+
+
+class TestConkitValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.dssp_exe = os.path.join(self.directory, "mkdssp")
+        with open(self.dssp_exe, "w") as f_out:
+            f_out.write(FAKE_DSSP.format(executable=sys.executable))
+        os.chmod(self.dssp_exe, os.stat(self.dssp_exe).st_mode | stat.S_IEXEC)
+        self.seqfile = os.path.join(self.directory, "seq.fasta")
+        conkit.io.write(self.seqfile, "fasta", Sequence("test", "A" * 30))
+        self.distfile = os.path.join(self.directory, "prediction.rr")
+        conkit.io.write(self.distfile, "caspmode2", _distogram(30, 1))
+
+    def _mmcif_models(self, nmodels):
+        models = os.path.join(self.directory, "models.txt")
+        with open(models, "w") as f_models:
+            for seed in range(nmodels):
+                pdbfile = os.path.join(self.directory, "model_{}.pdb".format(seed))
+                with open(pdbfile, "w") as f_out:
+                    f_out.write(_pdb_content(_coordinates(30, seed)))
+                mmcif_io = MMCIFIO()
+                mmcif_io.set_structure(PDBParser(QUIET=True).get_structure("model", pdbfile))
+                mmcif_io.save(os.path.join(self.directory, "model_{}.cif".format(seed)))
+                f_models.write("model_{}.cif\n".format(seed))
+        return models
+
+    def _main(self, *args):
+        argv = ["conkit-validate", self.seqfile, "fasta", self.distfile, "caspmode2", "-dssp_exe", self.dssp_exe]
+        with mock.patch.object(sys, "argv", argv + list(args)):
+            conkit_validate.main()
+
+    def test_main_1(self):
+        scores = os.path.join(self.directory, "scores.tsv")
+        self._main("--models", self._mmcif_models(2), "--models_format", "mmcif", "-scores", scores)
+        with open(scores, "r") as f_in:
+            lines = [line.rstrip("\n").split("\t") for line in f_in]
+        self.assertEqual(["MODEL", "RESNUM", "SCORE", "MISALIGNED", "REGISTER"], lines[0])
+        self.assertEqual(60, len(lines[1:]))
+        self.assertEqual([os.path.join(self.directory, "model_{}.cif".format(i)) for i in range(2)],
+                         sorted(set(line[0] for line in lines[1:])))
+        self.assertEqual(list(range(1, 31)) * 2, [int(line[1]) for line in lines[1:]])
+
+    def test_main_2(self):
+        scores = os.path.join(self.directory, "scores.tsv")
+        with self.assertRaisesRegex(RuntimeError, "2 of 2 models could not be validated"):
+            self._main("--models", self._mmcif_models(2), "-scores", scores)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
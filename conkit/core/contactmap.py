@@ -465,14 +465,19 @@ class ContactMap(Entity):
         else:
             seq_len = len(self.sequence)
 
-        result = {}
+        result = {resn: set() for resn in range(1, seq_len + 1)}
 
-        if altloc:
-            for resn in range(1, seq_len + 1):
-                result[resn] = {(c.res2_altseq, c.res2_altseq) for c in self if resn in (c.res1_altseq, c.res2_altseq)}
-        else:
-            for resn in range(1, seq_len + 1):
-                result[resn] = {(c.res1_seq, c.res2_seq) for c in self if resn in (c.res1_seq, c.res2_seq)}
+        # Each contact is added to the sets of both of its residues in a single pass over the contacts
+        for c in self:
+            if altloc:
+                residues = (c.res1_altseq, c.res2_altseq)
+                contact_id = (c.res2_altseq, c.res2_altseq)
+            else:
+                residues = (c.res1_seq, c.res2_seq)
+                contact_id = residues
+            for resn in residues:
+                if resn in result:
+                    result[resn].add(contact_id)
 
         return result
 
@@ -597,6 +602,10 @@ class ContactMap(Entity):
         value of :math:`\\sigma` is the smaller of the standard deviation of ``X`` or
         the normalized interquartile range.
 
+        Each contact contributes every residue between its two ends to the density. The number of contacts spanning
+        each residue is counted with a difference array over the residue axis, and both the bandwidth and the kernel
+        density are calculated from these counts.
+
         Parameters
         ----------
         bw_method : str, optional
@@ -609,29 +618,28 @@ class ContactMap(Entity):
 
         Raises
         ------
-        :exc:`ImportError`
-           Cannot find scikit-learn package
         :exc:`ValueError`
            Undefined bandwidth method
         :exc:`ValueError`
            :obj:`~conkit.core.contactmap.ContactMap` is empty
 
         """
-        try:
-            import sklearn.neighbors
-        except ImportError as e:
-            raise ImportError(e)
-
         if self.empty:
             raise ValueError("ContactMap is empty")
 
-        x = np.array([i for c in self for i in np.arange(c.res1_seq, c.res2_seq + 1)], dtype=np.int64)[:, np.newaxis]
-        x_fit = np.arange(x.min(), x.max() + 1)[:, np.newaxis]
-        from conkit.misc.bandwidth import bandwidth_factory
+        from conkit.misc.bandwidth import bandwidth_factory, binned_kde
+
+        residues = np.array([(c.res1_seq, c.res2_seq) for c in self], dtype=np.int64)
+        residues = residues[residues[:, 0] <= residues[:, 1]]
+        start, end = residues[:, 0].min(), residues[:, 1].max()
+        difference = np.zeros(end - start + 2, dtype=np.int64)
+        np.add.at(difference, residues[:, 0] - start, 1)
+        np.add.at(difference, residues[:, 1] - start + 1, -1)
+        counts = np.cumsum(difference[:-1])
 
-        bandwidth = bandwidth_factory(bw_method)(x).bw
-        kde = sklearn.neighbors.KernelDensity(bandwidth=bandwidth).fit(x)
-        return np.exp(kde.score_samples(x_fit)).tolist()
+        x = np.arange(start, end + 1, dtype=np.int64)[:, np.newaxis]
+        bandwidth = bandwidth_factory(bw_method)(x, weights=counts).bw
+        return binned_kde(counts, bandwidth).tolist()
 
     def set_scalar_score(self):
         """Calculate and set the :attr:`~conkit.core.contact.Contact.scalar_score` for the
@@ -35,6 +35,7 @@ import math
 import numpy as np
 import statistics
 from conkit.core.contact import Contact
+from conkit.core.mappings import ContactMatchState
 
 
 class Distance(Contact):
@@ -109,6 +110,57 @@ class Distance(Contact):
 
         super(Distance, self).__init__(res1_seq, res2_seq, raw_score, distance_bound)
 
+    @classmethod
+    def _from_columns(cls, res1_seqs, res2_seqs, distance_scores, distance_bins, raw_scores):
+        """Create the distances of many residue pairs at once
+
+        The residue numbers and scores are expected to be valid already, so the validation in the constructor and
+        setters is bypassed. All residue pairs share the same distance bins.
+
+        Parameters
+        ----------
+        res1_seqs : list
+           The residue sequence number of residue 1 of each pair
+        res2_seqs : list
+           The residue sequence number of residue 2 of each pair
+        distance_scores : list
+           The tuple of distance scores of each pair
+        distance_bins : tuple
+           The distance bins of all pairs
+        raw_scores : list
+           The raw score of each pair
+
+        Returns
+        -------
+        list
+           A list of :obj:`~conkit.core.distance.Distance` instances
+
+        """
+        distances = []
+        for res1_seq, res2_seq, scores, raw_score in zip(res1_seqs, res2_seqs, distance_scores, raw_scores):
+            distance = cls.__new__(cls)
+            distance.parent = None
+            distance.child_list = []
+            distance.child_dict = {}
+            distance._id = (res1_seq, res2_seq)
+            distance.distance_bins = distance_bins
+            distance.distance_scores = scores
+            distance.raw_score = raw_score
+            distance.res1_chain = ""
+            distance.res2_chain = ""
+            distance.scalar_score = 0.0
+            distance.weight = 1.0
+            distance._distance_bound = [0.0, 8.0]
+            distance._res1 = "X"
+            distance._res2 = "X"
+            distance._res1_seq = res1_seq
+            distance._res2_seq = res2_seq
+            distance._res1_altseq = 0
+            distance._res2_altseq = 0
+            distance._status = ContactMatchState.unknown
+            distances.append(distance)
+        return distances
+
     def __repr__(self):
         text = (
             "{name}(id={id} res1={_res1} res1_chain={res1_chain} res1_seq={_res1_seq} "
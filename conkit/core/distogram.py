@@ -59,15 +59,18 @@ class Distogram(ContactMap):
        A unique identifier
     original_file_format : str
        The original file format used to create the :obj:`~conkit.core.distogram.Distogram` instance
+    canonical : bool
+       Each residue pair is present only once and indexed by its sorted residue numbers
     ndistances : int
        The number of :obj:`~conkit.core.distance.Distance` instances in the :obj:`~conkit.core.distogram.Distogram`
 
     """
 
-    __slots__ = ["_original_file_format", "_sequence"]
+    __slots__ = ["_original_file_format", "_sequence", "_canonical"]
 
     def __init__(self, id):
         self._original_file_format = None
+        self._canonical = True
         super(Distogram, self).__init__(id)
 
     def __repr__(self):
@@ -85,6 +88,20 @@ class Distogram(ContactMap):
         """
         return len(self)
 
+    @property
+    def canonical(self):
+        """Each residue pair is present only once and indexed by its sorted residue numbers
+
+        The flag is maintained as :obj:`~conkit.core.distance.Distance` instances are added, so that
+        :meth:`~conkit.core.distogram.Distogram.get_unique_distances` does not need to rebuild a canonical distogram.
+
+        Returns
+        -------
+        bool
+
+        """
+        return self._canonical
+
     @property
     def original_file_format(self):
         """The original file format used to create the :obj:`~conkit.core.distogram.Distogram` instance"""
@@ -96,6 +113,18 @@ class Distogram(ContactMap):
             raise ValueError('Must provide valid distogram format: {}'.format(list(PARSER_CACHE.distance_file_parsers)))
         self._original_file_format = value
 
+    def add(self, entity):
+        """Add a :obj:`~conkit.core.distance.Distance` to the :obj:`~conkit.core.distogram.Distogram`
+
+        Parameters
+        ----------
+        entity : :obj:`~conkit.core.distance.Distance`
+
+        """
+        super(Distogram, self).add(entity)
+        if entity.res1_seq > entity.res2_seq:
+            self._canonical = False
+
     def get_unique_distances(self, inplace=False):
         """Filter the :obj:`~conkit.core.distance.Distance` instances so that each residue pairs is present only once
 
@@ -108,11 +137,20 @@ class Distogram(ContactMap):
         -------
         :obj:`~conkit.core.contactmap.ContactMap`
             :obj:`~conkit.core.contactmap.ContactMap` instance, regardless of inplace
+
+        Note
+        ----
+        If the :obj:`~conkit.core.distogram.Distogram` is :attr:`~conkit.core.distogram.Distogram.canonical`, all
+        residue pairs are already unique and the distances are not filtered.
+
         """
         distogram = self._inplace(inplace)
+        if self.canonical:
+            return distogram
         unique_pairs = {tuple(sorted(el.id)): el for el in self}
         distogram.child_list = list(unique_pairs.values())
         distogram.child_dict = unique_pairs
+        distogram._canonical = True
         return distogram
 
     def get_absent_residues(self, seq_len=None):
@@ -139,11 +177,10 @@ class Distogram(ContactMap):
                 raise ValueError('Need to define a sequence or provide seq_len')
             seq_len = self.sequence.seq_len
 
-        absent_residues = []
-        for residue in range(1, seq_len + 1):
-            if not any([c.id for c in self if residue in c.id]):
-                absent_residues.append(residue)
-        return absent_residues
+        present_residues = set()
+        for c in self:
+            present_residues.update(c.id)
+        return [residue for residue in range(1, seq_len + 1) if residue not in present_residues]
 
     def as_array(self, seq_len=None, get_weigths=False):
         """Transform the :obj:`~conkit.core.distogram.Distogram` instance into a :obj:numpy.array instance with shape
@@ -213,6 +250,87 @@ class Distogram(ContactMap):
         for distance in self:
             distance._reshape_bins(new_bins)
 
+    def get_distance_scores(self, distance_bins=None):
+        """Get the distance scores of all :obj:`~conkit.core.distance.Distance` instances as a single array
+
+        Parameters
+        ----------
+        distance_bins : tuple, optional
+           If provided, the distance scores are reshaped to fit these bins without modifying the
+           :obj:`~conkit.core.distance.Distance` instances [default: None]
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           An array with one row of scores per :obj:`~conkit.core.distance.Distance` instance
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The distance bins are not valid or the distance scores cannot be reshaped into them
+        :exc:`ValueError`
+           The :obj:`~conkit.core.distance.Distance` instances do not have the same number of distance bins
+
+        """
+        if distance_bins is None:
+            scores = np.array([distance.distance_scores for distance in self], dtype=np.float64)
+            if scores.ndim != 2:
+                raise ValueError('Distances do not have the same number of distance bins')
+            return scores
+
+        distance_bins = tuple(tuple(dbin) for dbin in distance_bins)
+        Distance._assert_valid_bins(distance_bins)
+        groups = {}
+        for idx, distance in enumerate(self):
+            groups.setdefault(tuple(distance.distance_bins), []).append(idx)
+
+        scores = np.empty((len(self), len(distance_bins)), dtype=np.float64)
+        for current_bins, indices in groups.items():
+            current_scores = np.array([self.child_list[idx].distance_scores for idx in indices], dtype=np.float64)
+            if current_bins != distance_bins:
+                if self.original_file_format == 'pdb':
+                    raise ValueError('Cannot re-shape bins obtained from a PDB structure file')
+                current_scores = self._reshape_scores(current_scores, current_bins, distance_bins)
+            scores[indices] = current_scores
+        return scores
+
+    @staticmethod
+    def _reshape_scores(distance_scores, distance_bins, new_bins):
+        """Reshape an array of distance scores from one set of distance bins into another
+
+        This is the batched equivalent of :meth:`~conkit.core.distance.Distance.reshape_bins`, assuming the
+        probability is uniform within each finite bin and decays exponentially within the last bin.
+
+        Parameters
+        ----------
+        distance_scores : :obj:`numpy.ndarray`
+           An array with one row of scores per residue pair
+        distance_bins : tuple
+           The current distance bins
+        new_bins : tuple
+           The new distance bins
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           An array with one row of reshaped scores per residue pair
+
+        """
+        lower = np.array([dbin[0] for dbin in distance_bins], dtype=np.float64)[:, np.newaxis]
+        upper = np.array([dbin[1] for dbin in distance_bins], dtype=np.float64)[:, np.newaxis]
+
+        def cumulative_weights(distances):
+            # Fraction of each current bin (rows) below each distance (columns)
+            distances = np.asarray(distances, dtype=np.float64)[np.newaxis, :]
+            with np.errstate(invalid='ignore', over='ignore'):
+                weights = np.clip((distances - lower) / (upper - lower), 0, 1)
+                weights[-1] = np.where(distances[0] > lower[-1], -np.expm1(lower[-1] - distances[0]), 0)
+            return weights
+
+        below_upper = distance_scores @ cumulative_weights([dbin[1] for dbin in new_bins])
+        below_lower = distance_scores @ cumulative_weights([dbin[0] for dbin in new_bins])
+        return below_upper - below_lower
+
     def as_contactmap(self, distance_cutoff=8):
         """Create a :obj:`~conkit.core.contactmap.ContactMap` instance with the contacts present in this
         :obj:`~conkit.core.distogram.Distogram` instance.
@@ -3,27 +3,15 @@
 __author__ = "Felix Simkovic"
 __date__ = "12 Aug 2016"
 
+import numpy as np
 import unittest
 
-try:
-    import sklearn.neighbors
-
-    SKLEARN = True
-except ImportError:
-    SKLEARN = False
-
 from conkit.core.struct import Gap, Residue
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
 from conkit.core.mappings import ContactMatchState
 from conkit.core.sequence import Sequence
-
-
-def skipUnless(condition):
-    if condition:
-        return lambda x: x
-    else:
-        return lambda x: None
+from conkit.misc.bandwidth import AmiseBW
 
 
 TP = ContactMatchState.true_positive.value
@@ -295,7 +283,6 @@ class TestContactMap(unittest.TestCase):
         jindex = contact_map1.get_jaccard_index(contact_map2)
         self.assertEqual(1.0, jindex)
 
-    @skipUnless(SKLEARN)
     def test_get_contact_density_1(self):
         contact_map1 = ContactMap("foo")
         for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1)]:
@@ -304,7 +291,6 @@ class TestContactMap(unittest.TestCase):
         answer = [0.1194466, 0.2012433, 0.2386849, 0.2012433, 0.1194466]
         self.assertListEqual(answer, density)
 
-    @skipUnless(SKLEARN)
     def test_get_contact_density_2(self):
         contact_map1 = ContactMap("foo")
         for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(3, 4, 0.4)]:
@@ -313,7 +299,6 @@ class TestContactMap(unittest.TestCase):
         answer = [0.1001259, 0.1983717, 0.2684149, 0.2313211, 0.1217899]
         self.assertEqual(answer, density)
 
-    @skipUnless(SKLEARN)
     def test_get_contact_density_3(self):
         contact_map1 = ContactMap("foo")
         for c in [Contact(3, 5, 0.4), Contact(2, 4, 0.1), Contact(3, 4, 0.4)]:
@@ -322,6 +307,18 @@ class TestContactMap(unittest.TestCase):
         answer = [0.1442296, 0.4134216, 0.4134216, 0.1442296]
         self.assertEqual(answer, density)
 
+    def test_get_contact_density_4(self):
+        contact_map1 = ContactMap("foo")
+        for c in [Contact(1, 3, 1.0), Contact(6, 8, 0.4), Contact(2, 3, 0.1)]:
+            contact_map1.add(c)
+        x = np.array([1, 2, 3, 2, 3, 6, 7, 8])
+        bandwidth = AmiseBW(x[:, np.newaxis]).bw
+        expected = np.exp(-0.5 * ((np.arange(1, 9)[:, np.newaxis] - x) / bandwidth) ** 2).sum(axis=1)
+        expected /= x.shape[0] * bandwidth * np.sqrt(2 * np.pi)
+        density = contact_map1.get_contact_density()
+        self.assertEqual(8, len(density))
+        np.testing.assert_allclose(expected, density, rtol=1e-10)
+
     def test_find_1(self):
         contact_map1 = ContactMap("1")
         for comb in [(1, 5, 1.0), (2, 6, 1.0), (1, 4, 1.0), (3, 6, 1.0), (2, 5, 1.0)]:
@@ -48,6 +48,30 @@ class TestDistogram(unittest.TestCase):
         self.assertListEqual([[1, 25], [25, 1], [7, 19], [19, 7], [1, 7]], distogram.as_list())
         self.assertListEqual([[25, 1], [19, 7], [1, 7]], new_distogram.as_list())
 
+    def test_get_unique_distances_3(self):
+        distogram = Distogram("test")
+        distogram.add(Distance(1, 25, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        distogram.add(Distance(7, 19, (0.15, 0.15, 0.60, 0.1), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        self.assertTrue(distogram.canonical)
+        self.assertIs(distogram, distogram.get_unique_distances(inplace=True))
+        new_distogram = distogram.get_unique_distances(inplace=False)
+        self.assertIsNot(distogram, new_distogram)
+        self.assertListEqual([[1, 25], [7, 19]], new_distogram.as_list())
+
+    def test_canonical_1(self):
+        distogram = Distogram("test")
+        self.assertTrue(distogram.canonical)
+        distogram.add(Distance(1, 25, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        distogram.add(Distance(7, 7, (0.15, 0.15, 0.60, 0.1), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        self.assertTrue(distogram.canonical)
+        distogram.add(Distance(25, 1, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        self.assertFalse(distogram.canonical)
+        self.assertFalse(distogram.deepcopy().canonical)
+        distogram.get_unique_distances(inplace=True)
+        self.assertTrue(distogram.canonical)
+        with self.assertRaises(ValueError):
+            distogram.add(Distance(1, 25, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+
     def test_get_absent_residues_1(self):
         distogram = Distogram("test")
         distogram.add(Distance(1, 5, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
@@ -133,6 +157,29 @@ class TestDistogram(unittest.TestCase):
         self.assertListEqual([dist.get_probability_within_distance(8) for dist in distogram], expected_raw_scores)
         self.assertListEqual([dist.distance_scores for dist in distogram], expected_distance_scores)
 
+    def test_get_distance_scores_1(self):
+        distogram = Distogram("test")
+        distogram.add(Distance(1, 5, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        distogram.add(Distance(2, 3, (0.15, 0.15, 0.60, 0.1), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        distogram.add(Distance(1, 4, (0.05, 0.95), ((0, 6), (6, np.inf))))
+        distogram.add(Distance(3, 5, (0.5, 0.1, 0.35, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        new_bins = ((0, 2), (2, 5), (5, 8), (8, 12), (12, np.inf))
+        scores = distogram.get_distance_scores(new_bins)
+        self.assertEqual((4, 5), scores.shape)
+        self.assertEqual((0.05, 0.95), distogram.child_list[2].distance_scores)
+        distogram.reshape_bins(new_bins)
+        np.testing.assert_allclose(np.array([dist.distance_scores for dist in distogram]), scores, atol=1e-12)
+        np.testing.assert_allclose(scores, distogram.get_distance_scores(), atol=1e-12)
+
+    def test_get_distance_scores_2(self):
+        distogram = Distogram("test")
+        distogram.add(Distance(1, 5, (0.25, 0.45, 0.25, 0.05), ((0, 4), (4, 6), (6, 8), (8, np.inf))))
+        distogram.add(Distance(1, 4, (0.05, 0.95), ((0, 6), (6, np.inf))))
+        with self.assertRaises(ValueError):
+            distogram.get_distance_scores()
+        with self.assertRaises(ValueError):
+            distogram.get_distance_scores(((0, 4), (5, np.inf)))
+
     def test_as_contactmap_1(self):
         distogram = Distogram("test")
         distogram.add(Distance(1, 5, (0.25, 0.45, 0.05, 0.05, 0.2), ((0, 4), (4, 6), (6, 8), (8, 10), (10, np.inf))))
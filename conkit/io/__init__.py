@@ -33,10 +33,16 @@ __author__ = "Felix Simkovic"
 __date__ = "13 Aug 2018"
 __version__ = "0.2"
 
+import concurrent.futures
+import functools
 import importlib
+import multiprocessing
+import os
 
 from conkit.io._cache import PARSER_CACHE
-from conkit.io._iotools import open_f_handle
+from conkit.io._detect import detect_format
+from conkit.io._iotools import is_str_like, open_f_handle
+from conkit.io._readcache import DEFAULT_MAX_SIZE, ReadCache
 
 # Accessed by some modules - might be deprecated in the future
 CONTACT_FILE_PARSERS = PARSER_CACHE.contact_file_parsers
@@ -44,6 +50,9 @@ DISTANCE_FILE_PARSERS = PARSER_CACHE.distance_file_parsers
 SEQUENCE_FILE_PARSERS = PARSER_CACHE.sequence_file_parsers
 BINARY_FILE_FORMATS = PARSER_CACHE.binary_file_formats
 
+# Opt-in persistent cache for parsed files, enabled by enable_read_cache() or the CONKIT_CACHE_DIR variable
+READ_CACHE = ReadCache(os.environ.get("CONKIT_CACHE_DIR"))
+
 
 def convert(fname_in, format_in, fname_out, format_out, kwargs_in=None, kwargs_out=None):
     """Convert a file in format x to file in format y
@@ -53,7 +62,7 @@ def convert(fname_in, format_in, fname_out, format_out, kwargs_in=None, kwargs_o
     fname_in : filehandle, filename
        A file path or open file handle
     format_in : str
-       File format of f_in
+       File format of f_in, or ``auto`` to detect it with :func:`detect_format`
     fname_out : filehandle, filename
        A file path or open file handle
     format_out : str
@@ -79,6 +88,9 @@ def convert(fname_in, format_in, fname_out, format_out, kwargs_in=None, kwargs_o
     ...     io.convert(f_in, 'pconsc3', f_out, 'casprr'))
 
     """
+    if format_in == "auto":
+        format_in = _detected_format(fname_in)
+
     if format_in in CONTACT_FILE_PARSERS and format_out in SEQUENCE_FILE_PARSERS:
         raise ValueError("Cannot convert contact file to sequence file")
     elif format_in in CONTACT_FILE_PARSERS and format_out in DISTANCE_FILE_PARSERS:
@@ -94,6 +106,99 @@ def convert(fname_in, format_in, fname_out, format_out, kwargs_in=None, kwargs_o
         write(fname_out, format_out, hierarchy)
 
 
+def convert_many(jobs, workers=None, chunksize=None):
+    """Convert many files in a persistent pool of worker processes
+
+    Each output file is written as soon as its conversion finishes. A failed conversion does not abort the
+    remaining ones, but is reported in the returned results.
+
+    Parameters
+    ----------
+    jobs : list
+       The conversions, each a tuple of the arguments to :func:`convert`, i.e.
+       ``(fname_in, format_in, fname_out, format_out)`` with file paths
+    workers : int, optional
+       The number of worker processes, if 1 the files are converted in this process [default: number of CPUs]
+    chunksize : int, optional
+       The number of conversions sent to a worker process at a time [default: spread evenly across workers]
+
+    Returns
+    -------
+    list
+       A tuple of the job and `None` if the conversion succeeded, or the error message if it failed,
+       in the order of the jobs
+
+    Examples
+    --------
+    >>> from conkit import io
+    >>> jobs = [('{}.mat'.format(i), 'ccmpred', '{}.rr'.format(i), 'casprr') for i in range(1000)]
+    >>> failed = [job for job, error in io.convert_many(jobs, workers=8) if error]
+
+    """
+    jobs = [tuple(job) for job in jobs]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+    if workers == 1:
+        return [_convert_job(job) for job in jobs]
+    with multiprocessing.Pool(workers) as pool:
+        return list(pool.imap(_convert_job, jobs, chunksize))
+
+
+def _convert_job(job):
+    """Convert a single file for :func:`convert_many` and capture any error"""
+    try:
+        convert(*job)
+    except Exception as e:
+        return job, "{}: {}".format(e.__class__.__name__, e)
+    return job, None
+
+
+def _detected_format(fname):
+    """Detect the most likely format of a file for :func:`read` and :func:`convert`"""
+    candidates = detect_format(fname)
+    if not candidates:
+        raise ValueError("Unable to detect the format of {}".format(fname))
+    return candidates[0]
+
+
+def enable_read_cache(directory, max_size=DEFAULT_MAX_SIZE, hash_content=False):
+    """Enable the persistent on-disk cache for :func:`read`
+
+    Once enabled, every file read from a path is stored in its parsed form in the cache directory, and
+    subsequent reads of the same file with the same format and keyword arguments load the stored hierarchy
+    instead of parsing the file again. The cache can be shared between processes.
+
+    Parameters
+    ----------
+    directory : str
+       The directory to store the cache entries in
+    max_size : int, optional
+       The maximum total size of the cache in bytes, least recently used entries are evicted beyond it [default: 1 GiB]
+    hash_content : bool, optional
+       Identify files by a hash of their content rather than their path, modification time and size [default: False]
+
+    Examples
+    --------
+    >>> from conkit import io
+    >>> io.enable_read_cache('/tmp/conkit_cache')
+    >>> hierarchy = io.read('example.a3m', 'a3m')  # parsed and cached
+    >>> hierarchy = io.read('example.a3m', 'a3m')  # loaded from the cache
+
+    """
+    READ_CACHE.directory = directory
+    READ_CACHE.max_size = max_size
+    READ_CACHE.hash_content = hash_content
+
+
+def disable_read_cache():
+    """Disable the persistent on-disk cache for :func:`read`, existing cache entries are kept"""
+    READ_CACHE.directory = None
+
+
 def read(fname, format, f_id="conkit", **kwargs):
     """Parse a file handle to read into structure
 
@@ -102,7 +207,7 @@ def read(fname, format, f_id="conkit", **kwargs):
     fname : filehandle, filename
        A file path or open file handle
     format : str
-       File format of handle
+       File format of handle, or ``auto`` to detect it with :func:`detect_format`
     f_id : str
        Identifier for the returned file
 
@@ -111,6 +216,11 @@ def read(fname, format, f_id="conkit", **kwargs):
     hierarchy
        The hierarchy instance of the requested file
 
+    Note
+    ----
+    If the on-disk cache is enabled with :func:`enable_read_cache`, files given by their path are loaded from the
+    cache whenever they have been read before with the same format and keyword arguments.
+
     Examples
     --------
     1) Read a Multiple Sequence Alignment file into a ConKit hierarchy:
@@ -125,7 +235,15 @@ def read(fname, format, f_id="conkit", **kwargs):
     >>> with open('example.mat', 'r') as f_in:
     ...     hierarchy = io.read(f_in, 'ccmpred')
 
+    3) Read a file of unknown format:
+
+    >>> from conkit import io
+    >>> hierarchy = io.read('example.mat', 'auto')
+
     """
+    if format == "auto":
+        format = _detected_format(fname)
+
     if format in PARSER_CACHE:
         parser_in = PARSER_CACHE.import_class(format)()
     else:
@@ -140,12 +258,119 @@ def read(fname, format, f_id="conkit", **kwargs):
     else:
         mode = "r"
 
+    use_cache = READ_CACHE.enabled and is_str_like(fname) and format != "conkitnpz"
+    if use_cache:
+        cache_key = READ_CACHE.key(fname, format, kwargs)
+        hierarchy = READ_CACHE.get(cache_key)
+        if hierarchy is not None:
+            return hierarchy
+
     with open_f_handle(fname, mode) as f_in:
         hierarchy = parser_in.read(f_in, **kwargs)
 
+    if use_cache:
+        READ_CACHE.put(cache_key, hierarchy)
+
     return hierarchy
 
 
+def read_many(fnames, formats, max_workers=None, processes=False, **kwargs):
+    """Read many files concurrently
+
+    File I/O and decompression overlap in a pool of threads. Parsers implemented in pure Python hold the
+    interpreter lock while parsing, so CPU-bound reads of many text files benefit from a pool of processes instead.
+
+    Parameters
+    ----------
+    fnames : list
+       The file paths
+    formats : str, list
+       The file format of all files, or a list with the format of each file
+    max_workers : int, optional
+       The number of threads or processes [default: see :class:`concurrent.futures.ThreadPoolExecutor`
+       and :class:`concurrent.futures.ProcessPoolExecutor`]
+    processes : bool, optional
+       Parse the files in worker processes rather than threads [default: False]
+    **kwargs
+       Keyword arguments passed to :func:`read` for every file
+
+    Returns
+    -------
+    list
+       The hierarchy of each file in the order of ``fnames``
+
+    Examples
+    --------
+    >>> from conkit import io
+    >>> decoys = io.read_many(['decoy_{}.pdb'.format(i) for i in range(500)], 'pdb', max_workers=8)
+
+    """
+    fnames, formats = _read_many_jobs(fnames, formats)
+    with _read_many_executor(max_workers, processes) as executor:
+        return list(executor.map(functools.partial(read, **kwargs), fnames, formats))
+
+
+def iread_many(fnames, formats, max_workers=None, processes=False, **kwargs):
+    """Read many files concurrently and yield each hierarchy as soon as it has been read
+
+    Parameters
+    ----------
+    fnames : list
+       The file paths
+    formats : str, list
+       The file format of all files, or a list with the format of each file
+    max_workers : int, optional
+       The number of threads or processes
+    processes : bool, optional
+       Parse the files in worker processes rather than threads [default: False]
+    **kwargs
+       Keyword arguments passed to :func:`read` for every file
+
+    Yields
+    ------
+    tuple
+       The index of the file in ``fnames`` and its hierarchy, in the order in which the files complete
+
+    Examples
+    --------
+    >>> from conkit import io
+    >>> fnames = ['decoy_{}.pdb'.format(i) for i in range(500)]
+    >>> for i, hierarchy in io.iread_many(fnames, 'pdb', max_workers=8):
+    ...     print(fnames[i], len(hierarchy.top_map))
+
+    """
+    fnames, formats = _read_many_jobs(fnames, formats)
+    with _read_many_executor(max_workers, processes) as executor:
+        futures = {
+            executor.submit(read, fname, format, **kwargs): i for i, (fname, format) in enumerate(zip(fnames, formats))
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _read_many_jobs(fnames, formats):
+    """Pair each file with its format for :func:`read_many` and :func:`iread_many`"""
+    fnames = list(fnames)
+    if is_str_like(formats):
+        formats = [formats] * len(fnames)
+    else:
+        formats = list(formats)
+    if len(formats) != len(fnames):
+        raise ValueError("Number of formats does not match the number of files")
+    return fnames, formats
+
+
+def _read_many_executor(max_workers, processes):
+    """Create the pool of workers for :func:`read_many` and :func:`iread_many`"""
+    if processes:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+
 def write(fname, format, hierarchy, **kwargs):
     """Parse a file handle to read into structure
 
@@ -157,6 +382,13 @@ def write(fname, format, hierarchy, **kwargs):
        File format of handle
     hierarchy
        ConKit hierarchy to write
+    **kwargs
+       Additional keyword arguments passed to the writer of the format
+
+    Returns
+    -------
+    object
+       The value returned by the writer, e.g. the round-trip error of quantised distograms, otherwise `None`
 
     Examples
     --------
@@ -183,5 +415,10 @@ def write(fname, format, hierarchy, **kwargs):
     if format in ["flib", "pconsc", "pconsc2", "saint2"]:
         kwargs["write_header_footer"] = False
 
-    with open_f_handle(fname, "w") as f_out:
-        parser_out.write(f_out, hierarchy, **kwargs)
+    if format in BINARY_FILE_FORMATS:
+        mode = "wb"
+    else:
+        mode = "w"
+
+    with open_f_handle(fname, mode) as f_out:
+        return parser_out.write(f_out, hierarchy, **kwargs)
@@ -69,7 +69,13 @@ class ParserCache(object):
         "psicov": ["psicov", "metapsicov", "nebcon"],
     }
 
-    BLINDFOLD = {"ContactFileParser", "GenericStructureParser", "DistanceFileParser", "SequenceFileParser"}
+    BLINDFOLD = {
+        "ContactFileParser",
+        "GenericStructureParser",
+        "DistanceFileParser",
+        "ModelEnsemble",
+        "SequenceFileParser",
+    }
 
     def __init__(self):
         self._parsers = []
@@ -101,7 +107,7 @@ class ParserCache(object):
 
     @property
     def binary_file_formats(self):
-        return {c.id: c for c in self._parsers if c.group in ["BinaryDistanceFileParser"]}
+        return {c.id: c for c in self._parsers if c.group in ["BinaryDistanceFileParser", "BinaryFileParser"]}
 
     @property
     def file_parsers(self):
@@ -0,0 +1,222 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-21, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Module containing code to detect the format of a file
+
+Description
+-----------
+This module guesses the format of a file for :func:`read <conkit.io.read>` from its first few kilobytes only, so that
+detection takes the same time regardless of the file size. Binary formats are recognised by their magic bytes, and
+text formats by characteristic records, headers or the shape of the first data lines.
+
+"""
+
+import re
+import struct
+
+from conkit.io._cache import PARSER_CACHE
+from conkit.io._iotools import _open_compressed, detect_compression, is_str_like
+
+DETECTION_SIZE = 8192
+
+RE_FLOAT = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+RE_INT = re.compile(r"^[-+]?\d+$")
+RE_RESIDUE = re.compile(r"^[A-Za-z]$")
+RE_SEQUENCE = re.compile(r"^[A-Za-z\-\.\*]+$")
+RE_HELIX = re.compile(r"^H\d+-H\d+$")
+
+PDB_RECORDS = {"HEADER", "TITLE", "COMPND", "SOURCE", "CRYST1", "ATOM", "HETATM", "MODEL", "REMARK", "SEQRES"}
+ROSETTA_NPZ_ARRAYS = {"dist.npy", "omega.npy", "theta.npy", "phi.npy"}
+
+
+def detect_format(fname, nbytes=DETECTION_SIZE):
+    """Detect the format of a file
+
+    Parameters
+    ----------
+    fname : filehandle, filename
+       A file path or open, seekable file handle
+    nbytes : int, optional
+       The number of bytes inspected from the start of the file [default: 8192]
+
+    Returns
+    -------
+    list
+       The candidate formats, most likely first, or an empty list if the format is not recognised
+
+    Examples
+    --------
+    >>> from conkit import io
+    >>> io.detect_format('toxd/toxd.mat')
+    ['ccmpred']
+
+    """
+    head = _read_head(fname, nbytes)
+    if head.startswith(b"PK\x03\x04"):
+        candidates = _detect_npz(head)
+    elif head.startswith(b"\x80"):
+        candidates = ["alphafold2"]
+    elif b"\x00" in head:
+        candidates = []
+    else:
+        text = head.decode("utf-8", errors="replace")
+        lines = text.splitlines()
+        # Discard the last line if it may have been cut off
+        if len(head) == nbytes and not text.endswith("\n"):
+            lines = lines[:-1]
+        candidates = _detect_text([line.rstrip() for line in lines if line.strip()])
+    return [candidate for candidate in candidates if candidate in PARSER_CACHE]
+
+
+def _read_head(fname, nbytes):
+    """Read the first bytes of a file, decompressing it if required"""
+    if is_str_like(fname):
+        compression = detect_compression(fname)
+        if compression:
+            with _open_compressed(fname, "r", compression) as f_in:
+                return f_in.buffer.read(nbytes)
+        with open(fname, "rb") as f_in:
+            return f_in.read(nbytes)
+    position = fname.tell()
+    head = fname.read(nbytes)
+    fname.seek(position)
+    if is_str_like(head):
+        head = head.encode("utf-8")
+    return head
+
+
+def _detect_npz(head):
+    """Detect the format of a numpy archive from the name of its first array"""
+    name_length = struct.unpack("<H", head[26:28])[0]
+    name = head[30 : 30 + name_length].decode("utf-8", errors="replace")
+    if name in ROSETTA_NPZ_ARRAYS:
+        return ["rosettanpz", "conkitnpz"]
+    return ["conkitnpz", "rosettanpz"]
+
+
+def _detect_text(lines):
+    """Detect the format of a text file from its first lines"""
+    if not lines:
+        return []
+    first = lines[0]
+    records = {line.split()[0] for line in lines}
+
+    if first.startswith("# STOCKHOLM"):
+        return ["stockholm"]
+    elif first.startswith("CLUSTAL"):
+        return ["clustal"]
+    elif first.startswith("data_"):
+        return ["mmcif"]
+    elif "PFRMAT" in records:
+        if any(line.split() == ["RMODE", "2"] for line in lines):
+            return ["caspmode2"]
+        return ["casprr", "casp"]
+    elif first.startswith("#REMARK MapPred"):
+        return ["mappred"]
+    elif first.startswith("#identifier") and "viterbiscore" in first:
+        return ["bbcontacts"]
+    elif first.split()[:3] == ["Helix", "Position", "Residue"]:
+        return ["membrain"]
+    elif any("NCONT" in line for line in lines):
+        return ["ncont"]
+    elif any(line.startswith("PconsC3 result file") for line in lines):
+        return ["pconsc3", "pconsc2", "pconsc"]
+    elif first.split() == ["LEN", first.split()[-1]] and "CON" in records:
+        return ["mapalign"]
+    elif records & PDB_RECORDS and any(line[:6] in ("ATOM  ", "HETATM", "MODEL ") for line in lines):
+        return ["pdb"]
+
+    sequence_lines = [line for line in lines if not line.startswith("#")]
+    if not sequence_lines:
+        return []
+    elif sequence_lines[0].startswith(">"):
+        residues = "".join(line for line in sequence_lines if not line.startswith(">"))
+        if any(c.islower() for c in residues):
+            return ["a3m", "a3m-inserts", "fasta"]
+        return ["fasta", "a3m", "a3m-inserts"]
+    elif all(RE_SEQUENCE.match(line) for line in sequence_lines):
+        return ["a2m", "jones"]
+
+    return _detect_table(lines)
+
+
+def _detect_table(lines):
+    """Detect the format of a contact prediction file from the shape of its data lines"""
+    rows = [line.split() for line in lines if not line.startswith("#")]
+    if not rows:
+        return []
+    elif rows[0][:2] == ["i", "j"] and "i_id" in rows[0]:
+        return ["gremlin"]
+    if all(len(row) == 1 and "," in row[0] for row in rows):
+        rows = [row[0].split(",") for row in rows]
+        if all(len(row) == 3 and RE_INT.match(row[0]) and RE_INT.match(row[1]) for row in rows):
+            return ["plmdca"]
+        return []
+
+    # Skip leading free text, e.g. the header of a PconsC file
+    while rows and not RE_INT.match(rows[0][0]) and not RE_FLOAT.match(rows[0][0]):
+        rows.pop(0)
+    if not rows:
+        return []
+    shapes = {len(row) for row in rows}
+
+    if len(rows[0]) == 1 and RE_INT.match(rows[0][0]) and all(len(row) == 2 for row in rows[1:]):
+        return ["aleigen"]
+    elif len(shapes) != 1:
+        return []
+
+    ncolumns = shapes.pop()
+    columns = list(zip(*rows))
+
+    def ints(*indices):
+        return all(RE_INT.match(value) for i in indices for value in columns[i])
+
+    def floats(*indices):
+        return all(RE_FLOAT.match(value) for i in indices for value in columns[i])
+
+    def residues(*indices):
+        return all(RE_RESIDUE.match(value) for i in indices for value in columns[i])
+
+    if ncolumns == 3 and ints(0, 1) and floats(2):
+        return ["pconsc3", "pconsc2", "pconsc", "flib", "saint2"]
+    elif ncolumns == 5 and ints(0, 1, 2, 3) and floats(4):
+        return ["psicov", "metapsicov", "nebcon", "epcmap", "casprr"]
+    elif ncolumns == 5 and ints(0, 2) and residues(1, 3) and all(RE_HELIX.match(value) for value in columns[4]):
+        return ["comsat"]
+    elif ncolumns == 6 and ints(0, 2) and residues(1, 3) and floats(4, 5):
+        if ints(4):
+            return ["evfold", "freecontact"]
+        return ["freecontact", "evfold"]
+    elif ncolumns == 10 and ints(0, 2) and residues(1, 3) and floats(4, 5, 6, 7, 8, 9):
+        return ["bclcontact"]
+    elif ncolumns > 10 and ints(0, 1) and floats(*range(2, ncolumns)):
+        return ["mappred", "ccmpred"]
+    elif ncolumns > 1 and floats(*range(ncolumns)):
+        return ["ccmpred"]
+    return []
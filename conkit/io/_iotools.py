@@ -33,9 +33,153 @@ __author__ = "Felix Simkovic"
 __date__ = "20 Nov 2016"
 __version__ = "0.13.3"
 
+import bz2
+import contextlib
+import gc
+import gzip
 import io
+import lzma
+import os
+import struct
 import sys
 import tempfile
+import zipfile
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Leading bytes identifying each supported compression format
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+# File extensions used to select the compression format on write
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+# Numeric types available to store tensors of distance probabilities
+PROBABILITY_PRECISIONS = ("float64", "float32", "float16", "uint8")
+
+# Number of characters collected by a :obj:`BufferedEmitter` before they are written to the file handle
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Number of records formatted at once by :meth:`BufferedEmitter.write_records`
+WRITE_CHUNK_SIZE = 4096
+
+
+class BufferedEmitter(object):
+    """Collect formatted text and write it to a file handle in chunks
+
+    Writers should emit their output through this class rather than concatenating the entire file
+    content into a single string, so that the time and memory required scale linearly with the
+    size of the hierarchy.
+
+    Examples
+    --------
+    >>> with BufferedEmitter(f_handle) as emitter:
+    ...     emitter.write("PFRMAT RR\\n")
+    ...     emitter.write_records("{} {} {:.6f}\\n", ((c.res1_seq, c.res2_seq, c.raw_score) for c in cmap))
+
+    """
+
+    __slots__ = ("f_handle", "buffer_size", "_buffer", "_buffered")
+
+    def __init__(self, f_handle, buffer_size=WRITE_BUFFER_SIZE):
+        """Initialise a new buffered emitter
+
+        Parameters
+        ----------
+        f_handle
+           Open file handle [write permissions]
+        buffer_size : int, optional
+           The number of characters to collect before writing to the file handle [default: 65536]
+
+        """
+        self.f_handle = f_handle
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write(self, text):
+        """Add text to the buffer, and write the buffer if it is full
+
+        Parameters
+        ----------
+        text : str
+           The text to write
+
+        """
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def writelines(self, lines):
+        """Add each line to the buffer
+
+        Parameters
+        ----------
+        lines : iterable
+           The lines to write, including line terminators
+
+        """
+        for line in lines:
+            self.write(line)
+
+    def write_records(self, template, records, chunk_size=WRITE_CHUNK_SIZE):
+        """Format records with a template and add them to the buffer
+
+        Parameters
+        ----------
+        template : str
+           The :meth:`str.format` template of a single record, including the line terminator
+        records : iterable, :obj:`numpy.ndarray`
+           The fields of each record, or a two-dimensional array with one record per row
+        chunk_size : int, optional
+           The number of records formatted at once [default: 4096]
+
+        Note
+        ----
+        The rows of an array are formatted a whole chunk at a time with a single call to :meth:`str.format`,
+        so the template must use automatic field numbering, i.e. ``{}`` rather than ``{0}``.
+
+        """
+        if isinstance(records, np.ndarray):
+            chunk_template = template * chunk_size
+            for start in range(0, records.shape[0], chunk_size):
+                chunk = records[start : start + chunk_size]
+                if chunk.shape[0] != chunk_size:
+                    chunk_template = template * chunk.shape[0]
+                self.write(chunk_template.format(*chunk.ravel().tolist()))
+        else:
+            fmt = template.format
+            chunk = []
+            for record in records:
+                chunk.append(fmt(*record))
+                if len(chunk) == chunk_size:
+                    self.write("".join(chunk))
+                    chunk = []
+            if chunk:
+                self.write("".join(chunk))
+
+    def flush(self):
+        """Write the buffer to the file handle"""
+        if self._buffer:
+            self.f_handle.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
 
 
 def create_tmp_f(content=None, mode="w"):
@@ -63,6 +207,24 @@ def create_tmp_f(content=None, mode="w"):
     return f_in.name
 
 
+@contextlib.contextmanager
+def paused_gc():
+    """Pause the cyclic garbage collector while creating many objects
+
+    Each collection traverses all tracked objects, so building hierarchies with millions of residue pairs would
+    otherwise trigger collections whose cost grows with the size of the hierarchy. The reference counting used
+    to release most objects is not affected.
+
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 def is_str_like(content):
     """Check if an instance is string-like
 
@@ -88,9 +250,102 @@ def is_str_like(content):
     return True
 
 
+def detect_compression(fname):
+    """Detect the compression format of a file from its leading magic bytes
+
+    Parameters
+    ----------
+    fname : str
+       The path to the file
+
+    Returns
+    -------
+    str
+       One of gzip, bz2, xz or zstd, or None if the file is not compressed
+
+    """
+    nbytes = max(len(magic) for magic in COMPRESSION_MAGIC.values())
+    with open(fname, "rb") as f_in:
+        header = f_in.read(nbytes)
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def _open_compressed(fname, mode, compression):
+    """Open a compressed file for streaming (de-)compression
+
+    Parameters
+    ----------
+    fname : str
+       The path to the file
+    mode : str
+       r, rb, w, wb or a
+    compression : str
+       One of gzip, bz2, xz or zstd
+
+    Returns
+    -------
+    f_handle
+       The opened file handle
+
+    Raises
+    ------
+    :exc:`ImportError`
+       zstandard is required for zstd-compressed files
+
+    Note
+    ----
+    Binary handles are (de-)compressed in memory, because binary parsers and writers such as
+    :func:`numpy.load` and :func:`numpy.savez` require random access into the file, which compressed
+    streams cannot provide.
+
+    """
+    binary = mode.endswith("b")
+    cmode = mode[0] + ("b" if binary else "t")
+    encoding = None if binary else "utf-8"
+
+    if compression == "gzip":
+        f_handle = gzip.open(fname, cmode, encoding=encoding)
+    elif compression == "bz2":
+        f_handle = bz2.open(fname, cmode, encoding=encoding)
+    elif compression == "xz":
+        f_handle = lzma.open(fname, cmode, encoding=encoding)
+    elif zstandard is None:
+        raise ImportError("zstandard is required to open zstd-compressed files")
+    else:
+        f_handle = zstandard.open(fname, cmode, encoding=encoding)
+
+    if binary and mode.startswith("r"):
+        with f_handle:
+            return io.BytesIO(f_handle.read())
+    elif binary:
+        return _CompressedBytesIO(f_handle)
+    return f_handle
+
+
+class _CompressedBytesIO(io.BytesIO):
+    """In-memory binary buffer written to a compressed file handle when closed"""
+
+    def __init__(self, f_compressed):
+        super(_CompressedBytesIO, self).__init__()
+        self.f_compressed = f_compressed
+
+    def close(self):
+        if not self.closed:
+            with self.f_compressed:
+                self.f_compressed.write(self.getvalue())
+        super(_CompressedBytesIO, self).close()
+
+
 def open_f_handle(f_handle, mode):
     """Open a filehandle
 
+    Files compressed with gzip, bz2, xz or zstd are decompressed transparently on read, with the format
+    detected from the leading magic bytes. On write and append, the compression format is selected by
+    the file extension, i.e. .gz, .bz2, .xz or .zst.
+
     Parameters
     ----------
     f_handle : file_handle, file_name
@@ -116,6 +371,14 @@ def open_f_handle(f_handle, mode):
         raise ValueError("Mode needs to be one of: a, r, w, rb, wb")
 
     try:
+        if is_str_like(f_handle):
+            if mode.startswith("r"):
+                compression = detect_compression(f_handle)
+            else:
+                compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(f_handle)[1].lower())
+            if compression is not None:
+                return _open_compressed(f_handle, mode, compression)
+
         if is_str_like(f_handle) and mode not in {"rb", "wb"}:
             return io.open(f_handle, mode, encoding="utf-8")
         elif is_str_like(f_handle):
@@ -126,3 +389,328 @@ def open_f_handle(f_handle, mode):
             raise TypeError("f_handle must be str or filehandle")
     except AttributeError:
         raise TypeError("f_handle must be str or filehandle")
+
+
+def read_npz(f_handle, mmap_mode=None):
+    """Read all arrays stored in a :func:`numpy.savez` archive
+
+    Parameters
+    ----------
+    f_handle
+       Open file handle [read permissions, binary]
+    mmap_mode : str, optional
+       If not `None`, memory-map the arrays stored without compression using the given mode [default: None]
+
+    Returns
+    -------
+    dict
+       A dictionary with the name of each array as key and the array as value
+
+    Note
+    ----
+    Arrays can only be memory-mapped if the file handle is backed by a file descriptor. Compressed archive
+    members, object arrays and file handles without a file descriptor fall back to reading into memory.
+
+    """
+    try:
+        f_handle.fileno()
+        mappable = mmap_mode is not None
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        mappable = False
+
+    arrays = {}
+    with zipfile.ZipFile(f_handle) as archive:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            array = None
+            if mappable and info.compress_type == zipfile.ZIP_STORED:
+                array = _memmap_npz_member(f_handle, info, mmap_mode)
+            if array is None:
+                with archive.open(info) as f_member:
+                    array = np.lib.format.read_array(f_member, allow_pickle=False)
+            arrays[name] = array
+    return arrays
+
+
+def open_npz(f_handle, mmap_mode="r"):
+    """Open all arrays stored in a :func:`numpy.savez` archive without reading them
+
+    Parameters
+    ----------
+    f_handle
+       Open file handle [read permissions, binary]
+    mmap_mode : str, optional
+       If not `None`, memory-map the arrays stored without compression using the given mode [default: r]
+
+    Returns
+    -------
+    dict
+       A dictionary with the name of each array as key and a :obj:`NpzMember` as value
+
+    Note
+    ----
+    The arrays can only be read while the file handle is open, unless they are memory-mapped.
+
+    """
+    try:
+        f_handle.fileno()
+        mappable = mmap_mode is not None
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        mappable = False
+
+    members = {}
+    with zipfile.ZipFile(f_handle) as archive:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            members[name] = NpzMember(f_handle, info, mmap_mode if mappable else None)
+    return members
+
+
+def is_npz(f_handle):
+    """Check if an open binary file handle contains a :func:`numpy.savez` archive, i.e. a zip file"""
+    position = f_handle.tell()
+    magic = f_handle.read(4)
+    f_handle.seek(position)
+    return magic == b"PK\x03\x04"
+
+
+class NpzMember(object):
+    """A single array stored in a :func:`numpy.savez` archive, which is read lazily
+
+    Arrays stored without compression are memory-mapped if possible, so that only the parts of the array accessed
+    are read from disk. Otherwise, only the rows along the first axis required to satisfy an access are
+    decompressed, streaming through the member in blocks and discarding any preceding rows.
+
+    Examples
+    --------
+    >>> with open("prediction.npz", "rb") as f_in:
+    ...     dist = open_npz(f_in)["dist"]
+    ...     window = dist[100:200, 100:200]
+
+    """
+
+    __slots__ = ("f_handle", "info", "shape", "dtype", "fortran_order", "_memmap")
+
+    def __init__(self, f_handle, info, mmap_mode=None):
+        """Initialise a new lazily read array
+
+        Parameters
+        ----------
+        f_handle
+           Open file handle of the archive [read permissions, binary]
+        info : :obj:`zipfile.ZipInfo`
+           The archive member storing the array
+        mmap_mode : str, optional
+           If not `None`, memory-map the array if it is stored without compression [default: None]
+
+        """
+        self.f_handle = f_handle
+        self.info = info
+        self._memmap = None
+        if mmap_mode is not None and info.compress_type == zipfile.ZIP_STORED:
+            self._memmap = _memmap_npz_member(f_handle, info, mmap_mode)
+        with zipfile.ZipFile(f_handle) as archive, archive.open(info) as f_member:
+            self.shape, self.fortran_order, self.dtype = self._read_header(f_member)
+
+    def __repr__(self):
+        return "{}(name={}, shape={}, dtype={})".format(
+            self.__class__.__name__, self.info.filename, self.shape, self.dtype
+        )
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def __getitem__(self, key):
+        if self._memmap is not None:
+            return self._memmap[key]
+        if not isinstance(key, tuple):
+            key = (key,)
+        rows = key[0] if key else slice(None)
+        if self.fortran_order or not self.shape:
+            pass
+        elif isinstance(rows, slice) and rows.step in (None, 1):
+            start, stop, _ = rows.indices(self.shape[0])
+            return self._read_rows(start, max(start, stop))[(slice(None),) + key[1:]]
+        elif isinstance(rows, (int, np.integer)) and -self.shape[0] <= rows < self.shape[0]:
+            row = int(rows) % self.shape[0]
+            return self._read_rows(row, row + 1)[(0,) + key[1:]]
+        return self._read_rows(0, self.shape[0] if self.shape else 0)[key]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @staticmethod
+    def _read_header(f_member):
+        """Read the header of a .npy file"""
+        version = np.lib.format.read_magic(f_member)
+        if version == (1, 0):
+            return np.lib.format.read_array_header_1_0(f_member)
+        return np.lib.format.read_array_header_2_0(f_member)
+
+    def _read_rows(self, start, stop):
+        """Decompress the rows in [start, stop) along the first axis of the array, or the entire array if it is a
+        scalar or stored in Fortran order"""
+        if self.dtype.hasobject:
+            raise ValueError("Object arrays cannot be read lazily")
+        elif self.fortran_order or not self.shape:
+            with zipfile.ZipFile(self.f_handle) as archive, archive.open(self.info) as f_member:
+                return np.lib.format.read_array(f_member, allow_pickle=False)
+
+        row_shape = self.shape[1:]
+        row_nbytes = int(np.prod(row_shape, dtype=np.int64)) * self.dtype.itemsize
+        with zipfile.ZipFile(self.f_handle) as archive, archive.open(self.info) as f_member:
+            self._read_header(f_member)
+            # Seeking forward in a compressed member decompresses and discards the data in blocks
+            f_member.seek(start * row_nbytes, io.SEEK_CUR)
+            data = f_member.read((stop - start) * row_nbytes)
+        return np.frombuffer(data, dtype=self.dtype).reshape((stop - start,) + row_shape)
+
+
+def _memmap_npz_member(f_handle, info, mmap_mode):
+    """Memory-map a single uncompressed member of a npz archive, return `None` if not possible"""
+    # The local file header is 30 bytes followed by the file name and an extra field of variable length
+    f_handle.seek(info.header_offset)
+    local_header = f_handle.read(30)
+    fname_length, extra_length = struct.unpack("<HH", local_header[26:30])
+    f_handle.seek(info.header_offset + 30 + fname_length + extra_length)
+
+    version = np.lib.format.read_magic(f_handle)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f_handle)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f_handle)
+    if dtype.hasobject or 0 in shape or not shape:
+        return None
+
+    order = "F" if fortran_order else "C"
+    return np.memmap(f_handle, dtype=dtype, mode=mmap_mode, shape=shape, order=order, offset=f_handle.tell())
+
+
+def residue_window(window, seq_len):
+    """Convert a window of residue numbers into the bounds of a slice along the residue axes of a tensor
+
+    Parameters
+    ----------
+    window : tuple
+       The first and last residue number of the window, or `None` for all residues
+    seq_len : int
+       The sequence length
+
+    Returns
+    -------
+    tuple
+       The start and stop index of the window
+
+    Raises
+    ------
+    :exc:`ValueError`
+       The window is not within the sequence
+
+    """
+    if window is None:
+        return 0, seq_len
+    first, last = window
+    if not 1 <= first <= last <= seq_len:
+        raise ValueError("Residue window must be within 1 and {}: {}".format(seq_len, window))
+    return first - 1, last
+
+
+def distogram_to_tensor(distogram, distance_bins, seq_len=None):
+    """Arrange the distance probabilities of a distogram in a dense and symmetric tensor
+
+    Parameters
+    ----------
+    distogram : :obj:`~conkit.core.distogram.Distogram`
+       The distogram to arrange
+    distance_bins : tuple
+       The distance bins of the tensor; distances predicted with any other bins are reshaped without modifying the
+       :obj:`~conkit.core.distance.Distance` instances
+    seq_len : int, optional
+       The sequence length, if not provided the length of the sequence or the highest residue number is used
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       A tensor with shape (L, L, B) where residue pairs absent from the distogram have zero probability
+
+    """
+    if seq_len is None:
+        seq_len = distogram.highest_residue_number
+        if distogram.sequence is not None:
+            seq_len = max(seq_len, distogram.sequence.seq_len)
+
+    res1_idx = np.array([distance.res1_seq - 1 for distance in distogram], dtype=np.int64)
+    res2_idx = np.array([distance.res2_seq - 1 for distance in distogram], dtype=np.int64)
+    scores = distogram.get_distance_scores(distance_bins)
+
+    tensor = np.zeros((seq_len, seq_len, len(distance_bins)), dtype=np.float64)
+    tensor[res1_idx, res2_idx] = scores
+    tensor[res2_idx, res1_idx] = scores
+    return tensor
+
+
+def quantise_probabilities(probs, precision="float32"):
+    """Encode a tensor of distance probabilities with a compact numeric type
+
+    Parameters
+    ----------
+    probs : :obj:`numpy.ndarray`
+       The probabilities, where the last axis contains the distance bins of each residue pair
+    precision : str, optional
+       One of float64, float32, float16 or uint8 [default: float32]
+
+    Returns
+    -------
+    tuple
+       The encoded probabilities and, for uint8, the float32 scale of each residue pair, otherwise `None`
+
+    Raises
+    ------
+    :exc:`ValueError`
+       Unknown precision
+
+    Note
+    ----
+    Probabilities encoded as uint8 are divided by the highest probability of each residue pair, so that the most
+    likely bin is always stored as 255 and the error of any probability is at most 1/510 of that of the most
+    likely bin.
+
+    """
+    if precision not in PROBABILITY_PRECISIONS:
+        raise ValueError("Precision needs to be one of: {}".format(", ".join(PROBABILITY_PRECISIONS)))
+    elif precision != "uint8":
+        return probs.astype(precision), None
+    scale = probs.max(axis=-1).astype(np.float32)
+    divisor = np.where(scale > 0, scale, 1)[..., np.newaxis]
+    return np.rint(probs / divisor * 255).astype(np.uint8), scale
+
+
+def dequantise_probabilities(encoded, scale=None):
+    """Decode a tensor of distance probabilities encoded with :func:`quantise_probabilities`
+
+    Parameters
+    ----------
+    encoded : :obj:`numpy.ndarray`
+       The encoded probabilities
+    scale : :obj:`numpy.ndarray`, optional
+       The scale of each residue pair of integer encoded probabilities, if not provided the probabilities of each
+       residue pair are normalised to sum to one
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       The probabilities as float64
+
+    """
+    probs = np.asarray(encoded, dtype=np.float64)
+    if not np.issubdtype(encoded.dtype, np.integer):
+        return probs
+    elif scale is not None:
+        return probs * (np.asarray(scale, dtype=np.float64)[..., np.newaxis] / 255)
+    total = probs.sum(axis=-1, keepdims=True)
+    total[total == 0] = 1
+    return probs / total
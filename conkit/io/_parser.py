@@ -42,6 +42,8 @@ ABC = abc.ABCMeta("ABC", (object,), {})
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
 from conkit.core.contactfile import ContactFile
+from conkit.core.distance import Distance
+from conkit.core.distogram import Distogram
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
 
@@ -67,6 +69,11 @@ class Parser(ABC):
         elif isinstance(hierarchy, ContactMap):
             h = ContactFile("conkit")
             h.add(hierarchy)
+        elif isinstance(hierarchy, Distance):
+            h = ContactFile("conkit")
+            m = Distogram("1")
+            m.add(hierarchy)
+            h.add(m)
         elif isinstance(hierarchy, Contact):
             h = ContactFile("conkit")
             m = ContactMap("1")
@@ -98,6 +105,12 @@ class BinaryDistanceFileParser(Parser):
     pass
 
 
+class BinaryFileParser(Parser):
+    """General purpose class for all binary file parsers of any hierarchy type"""
+
+    pass
+
+
 class SequenceFileParser(Parser):
     """General purpose class for all sequence file parsers"""
 
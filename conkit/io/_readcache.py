@@ -0,0 +1,212 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-21, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Module containing code for caching parsed hierarchies on disk
+
+Description
+-----------
+This module is a persistent cache used by :func:`read <conkit.io.read>` to avoid parsing the same file more than once
+across separate processes or ConKit invocations.
+
+Each parsed hierarchy is stored in the native binary ``conkitnpz`` format, keyed by the file it was read from, the file
+format and all keyword arguments passed to the parser. Files are identified either by their path, modification time
+and size or, more robustly but at the cost of reading the file, by a hash of their content. The total size of the
+cache is bounded by evicting the least recently used entries.
+
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+from conkit.io._cache import PARSER_CACHE
+from conkit.version import __version__
+
+DEFAULT_MAX_SIZE = 1024 ** 3
+
+
+class ReadCache(object):
+    """Persistent on-disk cache of hierarchies parsed by :func:`read <conkit.io.read>`
+
+    Attributes
+    ----------
+    directory : str
+       The directory to store the cache entries in, the cache is disabled if `None`
+    max_size : int
+       The maximum total size of all cache entries in bytes
+    hash_content : bool
+       Identify files by a hash of their content rather than their path, modification time and size
+
+    """
+
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE, hash_content=False):
+        self.directory = directory
+        self.max_size = max_size
+        self.hash_content = hash_content
+
+    def __repr__(self):
+        return "{}(directory={} max_size={})".format(self.__class__.__name__, self.directory, self.max_size)
+
+    @property
+    def enabled(self):
+        """True if the cache is in use"""
+        return self.directory is not None
+
+    def key(self, fname, format, kwargs):
+        """Compute the cache key for a file to be read
+
+        Parameters
+        ----------
+        fname : str
+           The path to the file
+        format : str
+           File format of the file
+        kwargs : dict
+           Keyword arguments passed to the parser
+
+        Returns
+        -------
+        str
+           The cache key
+
+        """
+        if self.hash_content:
+            source = ["content", self._hash_file(fname)]
+        else:
+            stat = os.stat(fname)
+            source = ["stat", os.path.abspath(fname), stat.st_mtime_ns, stat.st_size]
+        description = json.dumps([__version__, source, format, sorted(kwargs.items())], default=str)
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Load a cached hierarchy
+
+        Parameters
+        ----------
+        key : str
+           The cache key
+
+        Returns
+        -------
+        hierarchy
+           The cached hierarchy, or `None` if there is no entry for this key
+
+        """
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as f_in:
+                hierarchy = PARSER_CACHE.import_class("conkitnpz")().read(f_in, f_id=None)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self._remove(path)
+            return None
+        # Mark as recently used for the eviction
+        os.utime(path, None)
+        return hierarchy
+
+    def put(self, key, hierarchy):
+        """Store a hierarchy in the cache
+
+        Parameters
+        ----------
+        key : str
+           The cache key
+        hierarchy
+           The hierarchy to store
+
+        Returns
+        -------
+        bool
+           True if the hierarchy was stored, False if it cannot be represented in the cache
+
+        """
+        from conkit.core.entity import Entity
+
+        if not isinstance(hierarchy, Entity):
+            return False
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        f_out = tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False)
+        try:
+            with f_out:
+                PARSER_CACHE.import_class("conkitnpz")().write(f_out, hierarchy)
+        except (AttributeError, TypeError, ValueError):
+            self._remove(f_out.name)
+            return False
+        # Atomic replacement so that concurrent readers never see a partially written entry
+        os.replace(f_out.name, self._path(key))
+        self.evict()
+        return True
+
+    def evict(self):
+        """Remove the least recently used entries until the cache is within its size limit"""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        for path in self._entries():
+            self._remove(path)
+
+    def _entries(self):
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        return [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".npz")]
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    @staticmethod
+    def _hash_file(fname, blocksize=1024 ** 2):
+        digest = hashlib.sha256()
+        with open(fname, "rb") as f_in:
+            for block in iter(lambda: f_in.read(blocksize), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
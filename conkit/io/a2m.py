@@ -36,6 +36,7 @@ __author__ = "Felix Simkovic"
 __date__ = "30 Jul 2018"
 __version__ = "0.13.3"
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import SequenceFileParser
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
@@ -91,7 +92,6 @@ class A2mParser(SequenceFileParser):
 
         """
         sequence_file = self._reconstruct(hierarchy)
-        content = ""
-        for sequence_entry in sequence_file:
-            content += sequence_entry.seq + "\n"
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            for sequence_entry in sequence_file:
+                emitter.write(sequence_entry.seq + "\n")
@@ -44,6 +44,7 @@ __version__ = "0.13.3"
 import numpy as np
 import re
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import SequenceFileParser
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
@@ -157,13 +158,11 @@ class A3mParser(SequenceFileParser):
 
         """
         sequence_file = self._reconstruct(hierarchy)
-        content = ""
-        for remark in sequence_file.remark:
-            content += "#{remark}\n".format(remark=remark)
-        for sequence_entry in sequence_file:
-            header = ">{id}".format(id=sequence_entry.id)
-            if len(sequence_entry.remark) > 0:
-                header = "|".join([header] + sequence_entry.remark)
-            content += header + "\n"
-            content += sequence_entry.seq + "\n"
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            for remark in sequence_file.remark:
+                emitter.write("#{remark}\n".format(remark=remark))
+            for sequence_entry in sequence_file:
+                header = ">{id}".format(id=sequence_entry.id)
+                if len(sequence_entry.remark) > 0:
+                    header = "|".join([header] + sequence_entry.remark)
+                emitter.write(header + "\n" + sequence_entry.seq + "\n")
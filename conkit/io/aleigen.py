@@ -31,6 +31,7 @@
 Parser module specific to al-eigen map files
 """
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -89,8 +90,6 @@ class AleigenParser(ContactFileParser):
         if len(contact_file) > 1:
             raise RuntimeError("More than one contact map provided")
         cmap = contact_file.top_map
-        content = "{}\n".format(cmap.highest_residue_number)
-        line_template = "{} {}\n"
-        for contact in cmap:
-            content += line_template.format(contact.res1_seq, contact.res2_seq)
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write("{}\n".format(cmap.highest_residue_number))
+            emitter.write_records("{} {}\n", ((contact.res1_seq, contact.res2_seq) for contact in cmap))
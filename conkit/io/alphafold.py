@@ -31,8 +31,11 @@
 Parser module specific to AF2 distance predictions
 """
 
+import pickle
+
 import numpy as np
 from scipy.special import softmax
+from conkit.io._iotools import dequantise_probabilities, distogram_to_tensor, quantise_probabilities, residue_window
 from conkit.io._parser import BinaryDistanceFileParser
 from conkit.core.distance import Distance
 from conkit.core.distogram import Distogram
@@ -40,9 +43,13 @@ from conkit.core.distancefile import DistanceFile
 
 
 class AlphaFold2Parser(BinaryDistanceFileParser):
-    """Parser class for AF2 distance prediction file"""
+    """Parser class for AF2 distance prediction file
+
+    The distogram is stored as the logits of each residue pair in a pickled dictionary. Files written with uint8
+    precision store the quantised probabilities and their scale instead, which can only be read by ConKit.
+    """
 
-    def read(self, f_handle, f_id="alphafold2"):
+    def read(self, f_handle, f_id="alphafold2", window=None, skip_absent=False):
         """Read a distance prediction file
 
         Parameters
@@ -51,6 +58,11 @@ class AlphaFold2Parser(BinaryDistanceFileParser):
            Open file handle [read permissions]
         f_id : str, optional
            Unique contact file identifier
+        window : tuple, optional
+           The first and last residue number of a window, only residue pairs within it are read [default: None]
+        skip_absent : bool, optional
+           Skip the residue pairs whose probabilities are all zero or not finite, which ConKit writes for the residue
+           pairs absent from a distogram [default: False]
 
         Returns
         -------
@@ -65,28 +77,81 @@ class AlphaFold2Parser(BinaryDistanceFileParser):
 
         prediction = np.load(f_handle, allow_pickle=True)
         predicted_distogram = prediction['distogram']
-        probs = softmax(predicted_distogram['logits'], axis=-1)
+        key = 'probs' if 'probs' in predicted_distogram else 'logits'
+        start, stop = residue_window(window, predicted_distogram[key].shape[0])
+        probs = self._decode(predicted_distogram, start, stop)
         bin_edges = predicted_distogram['bin_edges']
 
         distance_bins = [(0, bin_edges[0])]
         distance_bins += [(bin_edges[idx], bin_edges[idx + 1]) for idx in range(len(bin_edges) - 1)]
         distance_bins.append((bin_edges[-1], np.inf))
         distance_bins = tuple(distance_bins)
-        L = probs.shape[0]
-        for i in range(L):
-            for j in range(i, L):
-                _distance = Distance(i + 1, j + 1, tuple(probs[i, j, :].tolist()), distance_bins)
-                _map.add(_distance)
+
+        observed = np.ones(probs.shape[:2], dtype=bool)
+        if skip_absent:
+            # Residue pairs without a prediction have zero probability, or undefined probability if stored as logits
+            observed = np.isfinite(probs).all(axis=-1) & probs.any(axis=-1)
+        res1_idx, res2_idx = np.nonzero(np.triu(observed))
+        scores = probs[res1_idx, res2_idx].tolist()
+        for i, j, distance_scores in zip(res1_idx.tolist(), res2_idx.tolist(), scores):
+            _distance = Distance(start + i + 1, start + j + 1, tuple(distance_scores), distance_bins)
+            _map.add(_distance)
 
         return hierarchy
 
-    def write(self, f_handle, hierarchy):
+    @staticmethod
+    def _decode(predicted_distogram, start=None, stop=None):
+        """Decode the probabilities stored as logits or quantised probabilities in [start, stop) of both residues"""
+        window = (slice(start, stop), slice(start, stop))
+        if "probs" in predicted_distogram:
+            scale = predicted_distogram.get("probs_scale")
+            scale = None if scale is None else scale[window]
+            return dequantise_probabilities(predicted_distogram["probs"][window], scale)
+        with np.errstate(invalid="ignore"):
+            return softmax(np.asarray(predicted_distogram["logits"][window], dtype=np.float64), axis=-1)
+
+    def write(self, f_handle, hierarchy, precision="float32"):
         """Write a distance file instance to a file
 
+        Parameters
+        ----------
+        f_handle
+           Open file handle [write permissions, binary]
+        hierarchy : :obj:`~conkit.core.distancefile.DistanceFile`, :obj:`~conkit.core.distogram.Distogram`
+        precision : str, optional
+           The numeric type used to store the distogram, one of float64, float32, float16 or uint8. The logits are
+           stored for floating point types, and the probabilities quantised to 256 levels for uint8 [default: float32]
+
+        Returns
+        -------
+        float
+           The largest absolute difference between any probability read back from the file and its original value
+
         Raises
         ------
-        :exc:`NotImplementedError`
-           Write function not available
+        :exc:`RuntimeError`
+           More than one distogram provided
+        :exc:`ValueError`
+           The distogram is empty, its distance bins are not valid or the precision is unknown
 
         """
-        raise NotImplementedError("Write function not available yet")
+        distancefile = self._reconstruct(hierarchy)
+        if len(distancefile) > 1:
+            raise RuntimeError("More than one distogram provided")
+        distogram = distancefile.top_map
+        if distogram.empty:
+            raise ValueError("Cannot write an empty distogram")
+        distance_bins = tuple(distogram.top.distance_bins)
+        Distance._assert_valid_bins(distance_bins)
+        probs = distogram_to_tensor(distogram, distance_bins)
+
+        predicted_distogram = {"bin_edges": np.array([upper for _, upper in distance_bins[:-1]], dtype=np.float64)}
+        if precision == "uint8":
+            predicted_distogram["probs"], predicted_distogram["probs_scale"] = quantise_probabilities(probs, precision)
+        else:
+            with np.errstate(divide="ignore"):
+                predicted_distogram["logits"], _ = quantise_probabilities(np.log(probs), precision)
+        pickle.dump({"distogram": predicted_distogram}, f_handle)
+
+        observed = probs.any(axis=-1)
+        return float(np.abs(self._decode(predicted_distogram)[observed] - probs[observed]).max(initial=0))
@@ -38,6 +38,7 @@ __version__ = "0.13.3"
 import collections
 import re
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -165,45 +166,40 @@ class CaspParser(ContactFileParser):
 
         """
         contact_file = self._reconstruct(hierarchy)
-        content = "PFRMAT RR\n"
-        if contact_file.target:
-            content += "TARGET {}\n".format(contact_file.target)
-        if contact_file.author:
-            content += "AUTHOR {}\n".format(contact_file.author)
-        if contact_file.remark:
-            for remark in contact_file.remark:
-                content += "REMARK {}\n".format(remark)
-        if contact_file.method:
-            for method in contact_file.method:
-                content += "METHOD {}\n".format(method)
-        for contact_map in contact_file:
-            content += "MODEL  {}\n".format(contact_map.id)
-            if isinstance(contact_map.sequence, Sequence):
-                sequence = contact_map.sequence
-                for i in range(0, sequence.seq_len, 50):
-                    content += sequence.seq[i : i + 50] + "\n"
-            # Casp Roll format specifies raw scores to be in [0, 1]
-            if any(c.raw_score > 1.0 or c.raw_score < 0.0 for c in contact_map):
-                contact_map.rescale(inplace=True)
-            for contact in contact_map:
-                s = "{res1_chain: <}{res1_seq: <4} {res2_chain: <}{res2_seq:<4} {lb: <3} {ub: <3} {raw_score: <.6f}\n"
-                if contact.res1_chain == contact.res2_chain:
-                    res1_chain = res2_chain = ""
-                else:
-                    res1_chain = contact.res1_chain
-                    res2_chain = contact.res2_chain
-                lb = int(contact.lower_bound) if float(contact.lower_bound).is_integer() else contact.lower_bound
-                ub = int(contact.upper_bound) if float(contact.upper_bound).is_integer() else contact.upper_bound
-                s = s.format(
-                    res1_chain=res1_chain,
-                    res1_seq=contact.res1_seq,
-                    res2_chain=res2_chain,
-                    res2_seq=contact.res2_seq,
-                    lb=lb,
-                    ub=ub,
-                    raw_score=contact.raw_score,
-                )
-                content += s
-            content += "ENDMDL\n"
-        content += "END\n"
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write("PFRMAT RR\n")
+            if contact_file.target:
+                emitter.write("TARGET {}\n".format(contact_file.target))
+            if contact_file.author:
+                emitter.write("AUTHOR {}\n".format(contact_file.author))
+            if contact_file.remark:
+                for remark in contact_file.remark:
+                    emitter.write("REMARK {}\n".format(remark))
+            if contact_file.method:
+                for method in contact_file.method:
+                    emitter.write("METHOD {}\n".format(method))
+            for contact_map in contact_file:
+                emitter.write("MODEL  {}\n".format(contact_map.id))
+                if isinstance(contact_map.sequence, Sequence):
+                    sequence = contact_map.sequence
+                    for i in range(0, sequence.seq_len, 50):
+                        emitter.write(sequence.seq[i : i + 50] + "\n")
+                # Casp Roll format specifies raw scores to be in [0, 1]
+                if any(c.raw_score > 1.0 or c.raw_score < 0.0 for c in contact_map):
+                    contact_map.rescale(inplace=True)
+                template = "{: <}{: <4} {: <}{:<4} {: <3} {: <3} {: <.6f}\n"
+                emitter.write_records(template, (self._contact_record(contact) for contact in contact_map))
+                emitter.write("ENDMDL\n")
+            emitter.write("END\n")
+
+    @staticmethod
+    def _contact_record(contact):
+        """Get the fields of a contact written to a CASP RR file"""
+        if contact.res1_chain == contact.res2_chain:
+            res1_chain = res2_chain = ""
+        else:
+            res1_chain = contact.res1_chain
+            res2_chain = contact.res2_chain
+        lb = int(contact.lower_bound) if float(contact.lower_bound).is_integer() else contact.lower_bound
+        ub = int(contact.upper_bound) if float(contact.upper_bound).is_integer() else contact.upper_bound
+        return res1_chain, contact.res1_seq, res2_chain, contact.res2_seq, lb, ub, contact.raw_score
@@ -32,6 +32,7 @@ Parser module specific to CASP-RR MODE 2 distance predictions
 """
 
 import numpy as np
+from conkit.io._iotools import BufferedEmitter, paused_gc
 from conkit.io._parser import DistanceFileParser
 from conkit.core.distance import Distance
 from conkit.core.distogram import Distogram
@@ -64,17 +65,24 @@ class CaspMode2Parser(DistanceFileParser):
         _map = Distogram("distogram_1")
         hierarchy.add(_map)
 
-        for line in f_handle.readlines():
-            line = line.lstrip().rstrip().split()
-            if not line or len(line) != 13 or not line[0].isdigit() or not line[1].isdigit():
-                continue
-
-            res1_seq = int(line[0])
-            res2_seq = int(line[1])
-            raw_score = float(line[2])
-            distance_scores = tuple([float(p) for p in line[3:]])
-            _distance = Distance(res1_seq, res2_seq, distance_scores, DISTANCE_BINS, raw_score=raw_score)
-            _map.add(_distance)
+        fields = []
+        for line in f_handle:
+            line = line.split()
+            if len(line) == 13 and line[0].isdigit() and line[1].isdigit():
+                fields += line
+
+        # The raw score and distance scores of all residue pairs are converted at once into an (N, 11) array
+        scores = np.array(fields, dtype=np.float64).reshape(-1, 13)[:, 2:]
+        with paused_gc():
+            distances = Distance._from_columns(
+                [int(res_seq) for res_seq in fields[0::13]],
+                [int(res_seq) for res_seq in fields[1::13]],
+                [tuple(row) for row in scores[:, 1:].tolist()],
+                DISTANCE_BINS,
+                scores[:, 0].tolist(),
+            )
+            for _distance in distances:
+                _map.add(_distance)
 
         return hierarchy
 
@@ -99,10 +107,12 @@ class CaspMode2Parser(DistanceFileParser):
             raise RuntimeError("More than one distogram provided")
         distogram = distancefile.top_map
 
-        content = "PFRMAT RR\nRMODE 2\n"
-        line_template = "{} {} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f} {:.6f}\n"
-        for distance in distogram:
-            distance.reshape_bins(DISTANCE_BINS)
-            content += line_template.format(distance.res1_seq, distance.res2_seq,
-                                            distance.raw_score, *distance.distance_scores)
-        f_handle.write(content)
+        records = np.empty((len(distogram), 13), dtype=np.float64)
+        records[:, 0] = [distance.res1_seq for distance in distogram]
+        records[:, 1] = [distance.res2_seq for distance in distogram]
+        records[:, 2] = [distance.raw_score for distance in distogram]
+        records[:, 3:] = distogram.get_distance_scores(DISTANCE_BINS)
+
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write("PFRMAT RR\nRMODE 2\n")
+            emitter.write_records("{:.0f} {:.0f}" + " {:.6f}" * 11 + "\n", records)
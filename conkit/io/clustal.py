@@ -37,6 +37,7 @@ __version__ = "0.13.3"
 
 import collections
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import SequenceFileParser
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
@@ -105,7 +106,7 @@ class ClustalParser(SequenceFileParser):
 
         """
         hierarchy = self._reconstruct(hierarchy)
-        chunker = []
+        chunker = collections.deque()
         longest = 0
         for sequence in hierarchy:
             this = [sequence.id]
@@ -113,13 +114,13 @@ class ClustalParser(SequenceFileParser):
                 longest = len(sequence.id)
             for i in range(0, sequence.seq_len, 60):
                 this += [sequence.seq[i : i + 60]]
-            chunker += [this]
-        content = "CLUSTAL FORMAT written with ConKit\n\n"
+            chunker.append(this)
         linetemplate = "%-{}s\t%s\n".format(longest)
-        while len(chunker) > 0:
-            entry = chunker.pop(0)
-            content += linetemplate % (entry[0], entry[1])
-            entry.pop(1)
-            if len(entry) > 1:
-                chunker.append(entry)
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write("CLUSTAL FORMAT written with ConKit\n\n")
+            while len(chunker) > 0:
+                entry = chunker.popleft()
+                emitter.write(linetemplate % (entry[0], entry[1]))
+                entry.pop(1)
+                if len(entry) > 1:
+                    chunker.append(entry)
@@ -0,0 +1,322 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-21, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Parser module specific to the native binary ConKit format
+
+The format is an uncompressed :func:`numpy.savez` archive. Each attribute of the residue pairs or sequences in the
+hierarchy is stored as a typed column array, concatenated across all contact maps, distograms or sequences. All
+remaining information about the hierarchy, e.g. identifiers, remarks and the offsets of each contact map into the
+column arrays, is stored as a JSON document in the ``metadata`` array.
+"""
+
+import json
+
+import numpy as np
+
+from conkit.io._iotools import read_npz
+from conkit.io._parser import BinaryFileParser
+from conkit.core.contact import Contact
+from conkit.core.contactfile import ContactFile
+from conkit.core.contactmap import ContactMap
+from conkit.core.distance import Distance
+from conkit.core.distancefile import DistanceFile
+from conkit.core.distogram import Distogram
+from conkit.core.mappings import ContactMatchState
+from conkit.core.sequence import Sequence
+from conkit.core.sequencefile import SequenceFile
+
+FORMAT_VERSION = 1
+
+CONTACT_COLUMNS = {
+    "res1_seq": np.int64,
+    "res2_seq": np.int64,
+    "res1_altseq": np.int64,
+    "res2_altseq": np.int64,
+    "raw_score": np.float64,
+    "scalar_score": np.float64,
+    "weight": np.float64,
+    "lower_bound": np.float64,
+    "upper_bound": np.float64,
+    "status": np.int8,
+    "res1": np.str_,
+    "res2": np.str_,
+    "res1_chain": np.str_,
+    "res2_chain": np.str_,
+}
+
+
+class ConkitNpzParser(BinaryFileParser):
+    """Parser class for the native binary ConKit format
+
+    This format stores :obj:`~conkit.core.contactfile.ContactFile`, :obj:`~conkit.core.distancefile.DistanceFile`
+    and :obj:`~conkit.core.sequencefile.SequenceFile` hierarchies without loss of information, and is considerably
+    faster to read than any of the text formats.
+
+    """
+
+    def read(self, f_handle, f_id="conkitnpz", mmap_mode="r"):
+        """Read a native binary ConKit file
+
+        Parameters
+        ----------
+        f_handle
+           Open file handle [read permissions]
+        f_id : str, optional
+           Unique file identifier, use the stored identifier if `None`
+        mmap_mode : str, optional
+           Memory-map the column arrays using this mode if possible [default: r]
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactfile.ContactFile`, :obj:`~conkit.core.distancefile.DistanceFile`
+        or :obj:`~conkit.core.sequencefile.SequenceFile`
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The file is not a valid native binary ConKit file
+
+        """
+        arrays = read_npz(f_handle, mmap_mode=mmap_mode)
+        if "metadata" not in arrays:
+            raise ValueError("Not a valid native binary ConKit file")
+        metadata = json.loads(arrays["metadata"].tobytes().decode("utf-8"))
+        if metadata["version"] > FORMAT_VERSION:
+            raise ValueError("Unsupported native binary ConKit file version: {}".format(metadata["version"]))
+
+        if f_id is None:
+            f_id = metadata["id"]
+        if metadata["type"] == "SequenceFile":
+            return self._read_sequencefile(f_id, metadata, arrays)
+        return self._read_contactfile(f_id, metadata, arrays)
+
+    def _read_contactfile(self, f_id, metadata, arrays):
+        """Build a :obj:`~conkit.core.contactfile.ContactFile` or :obj:`~conkit.core.distancefile.DistanceFile`"""
+        if metadata["type"] == "DistanceFile":
+            hierarchy = DistanceFile(f_id)
+            hierarchy.original_file_format = metadata["original_file_format"]
+        else:
+            hierarchy = ContactFile(f_id)
+        hierarchy.author = metadata["author"]
+        hierarchy.target = metadata["target"]
+        hierarchy.method = metadata["method"]
+        hierarchy.remark = metadata["remark"]
+
+        columns = {name: arrays[name].tolist() for name in CONTACT_COLUMNS}
+        states = {state.value: state for state in ContactMatchState}
+        for k, map_metadata in enumerate(metadata["maps"]):
+            start, stop = map_metadata["offset"], map_metadata["offset"] + map_metadata["ncontacts"]
+            if map_metadata["type"] == "Distogram":
+                _map = Distogram(map_metadata["id"])
+                distance_scores = arrays["distance_scores_{}".format(k)].tolist()
+                if map_metadata["distance_bins"] is None:
+                    distance_bins = arrays["distance_bins_{}".format(k)].tolist()
+                    distance_bins = [tuple(tuple(dbin) for dbin in bins) for bins in distance_bins]
+                else:
+                    distance_bins = [tuple(tuple(dbin) for dbin in map_metadata["distance_bins"])] * (stop - start)
+            else:
+                _map = ContactMap(map_metadata["id"])
+            if map_metadata["sequence"] is not None:
+                _map.sequence = self._build_sequence(*map_metadata["sequence"])
+
+            # The columns were validated on write, so the residue pairs bypass the validation in the setters
+            for i in range(start, stop):
+                if map_metadata["type"] == "Distogram":
+                    contact = self._new_entity(Distance, (columns["res1_seq"][i], columns["res2_seq"][i]))
+                    contact.distance_bins = distance_bins[i - start]
+                    contact.distance_scores = tuple(distance_scores[i - start])
+                else:
+                    contact = self._new_entity(Contact, (columns["res1_seq"][i], columns["res2_seq"][i]))
+                contact.parent = _map
+                contact.raw_score = columns["raw_score"][i]
+                contact.scalar_score = columns["scalar_score"][i]
+                contact.weight = columns["weight"][i]
+                contact.res1_chain = columns["res1_chain"][i]
+                contact.res2_chain = columns["res2_chain"][i]
+                contact._distance_bound = [columns["lower_bound"][i], columns["upper_bound"][i]]
+                contact._res1 = columns["res1"][i]
+                contact._res2 = columns["res2"][i]
+                contact._res1_seq = columns["res1_seq"][i]
+                contact._res2_seq = columns["res2_seq"][i]
+                contact._res1_altseq = columns["res1_altseq"][i]
+                contact._res2_altseq = columns["res2_altseq"][i]
+                contact._status = states[columns["status"][i]]
+                _map.child_list.append(contact)
+            _map.child_dict = {contact.id: contact for contact in _map.child_list}
+            if isinstance(_map, Distogram):
+                _map._canonical = bool(np.all(arrays["res1_seq"][start:stop] <= arrays["res2_seq"][start:stop]))
+
+            hierarchy.add(_map)
+            if map_metadata["original_file_format"] is not None:
+                _map.original_file_format = map_metadata["original_file_format"]
+
+        return hierarchy
+
+    def _read_sequencefile(self, f_id, metadata, arrays):
+        """Build a :obj:`~conkit.core.sequencefile.SequenceFile`"""
+        hierarchy = SequenceFile(f_id)
+        hierarchy.remark = metadata["remark"]
+        hierarchy.status = metadata["status"]
+
+        data = arrays["seq_data"].tobytes().decode("ascii")
+        offsets = arrays["seq_offsets"].tolist()
+        for i, (seq_id, remark) in enumerate(zip(metadata["seq_ids"], metadata["seq_remarks"])):
+            sequence = self._build_sequence(seq_id, data[offsets[i] : offsets[i + 1]], remark)
+            sequence.parent = hierarchy
+            hierarchy.child_list.append(sequence)
+        hierarchy.child_dict = {sequence.id: sequence for sequence in hierarchy.child_list}
+
+        return hierarchy
+
+    @staticmethod
+    def _new_entity(cls, id):
+        """Create an empty instance of an :obj:`~conkit.core.entity.Entity` subclass without calling its constructor"""
+        entity = cls.__new__(cls)
+        entity.parent = None
+        entity._id = id
+        entity.child_list = []
+        entity.child_dict = {}
+        return entity
+
+    @classmethod
+    def _build_sequence(cls, seq_id, seq, remark):
+        """Build a :obj:`~conkit.core.sequence.Sequence` from its stored fields"""
+        sequence = cls._new_entity(Sequence, seq_id)
+        sequence._seq = seq
+        sequence._remark = list(remark)
+        return sequence
+
+    def write(self, f_handle, hierarchy, compress=False):
+        """Write a hierarchy to a native binary ConKit file
+
+        Parameters
+        ----------
+        f_handle
+           Open file handle [write permissions]
+        hierarchy : :obj:`~conkit.core.contactfile.ContactFile`, :obj:`~conkit.core.contactmap.ContactMap`,
+                    :obj:`~conkit.core.contact.Contact`, :obj:`~conkit.core.sequencefile.SequenceFile`
+                    or :obj:`~conkit.core.sequence.Sequence`
+        compress : bool, optional
+           Compress the column arrays, which prevents memory-mapping them on read [default: False]
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Residue pairs in a distogram do not have the same number of distance bins
+
+        """
+        hierarchy = self._reconstruct(hierarchy)
+        if isinstance(hierarchy, SequenceFile):
+            metadata, arrays = self._prepare_sequencefile(hierarchy)
+        else:
+            metadata, arrays = self._prepare_contactfile(hierarchy)
+
+        arrays["metadata"] = np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8)
+        if compress:
+            np.savez_compressed(f_handle, **arrays)
+        else:
+            np.savez(f_handle, **arrays)
+
+    def _prepare_contactfile(self, hierarchy):
+        """Collect the metadata and column arrays of a contact or distance file"""
+        metadata = {
+            "version": FORMAT_VERSION,
+            "id": hierarchy.id,
+            "type": hierarchy.__class__.__name__,
+            "original_file_format": getattr(hierarchy, "original_file_format", None),
+            "author": hierarchy.author,
+            "target": hierarchy.target,
+            "method": hierarchy.method,
+            "remark": hierarchy.remark,
+            "maps": [],
+        }
+        columns = {name: [] for name in CONTACT_COLUMNS}
+        arrays = {}
+
+        offset = 0
+        for k, _map in enumerate(hierarchy):
+            map_metadata = {
+                "id": _map.id,
+                "type": "Distogram" if isinstance(_map, Distogram) else "ContactMap",
+                "original_file_format": getattr(_map, "original_file_format", None),
+                "offset": offset,
+                "ncontacts": len(_map),
+                "sequence": None,
+                "distance_bins": None,
+            }
+            if _map.sequence is not None:
+                map_metadata["sequence"] = [_map.sequence.id, _map.sequence.seq, _map.sequence.remark]
+            if map_metadata["type"] == "Distogram":
+                arrays.update(self._prepare_distogram(k, _map, map_metadata))
+
+            for contact in _map:
+                for name in CONTACT_COLUMNS:
+                    columns[name].append(getattr(contact, name))
+
+            metadata["maps"].append(map_metadata)
+            offset += len(_map)
+
+        arrays.update({name: np.array(columns[name], dtype=dtype) for name, dtype in CONTACT_COLUMNS.items()})
+        return metadata, arrays
+
+    @staticmethod
+    def _prepare_distogram(k, distogram, map_metadata):
+        """Collect the distance scores and bins of the k-th map, which is a distogram
+
+        Distance bins shared by all residue pairs are stored once in the map metadata, otherwise, e.g. for
+        distograms extracted from structures, they are stored per residue pair.
+
+        """
+        if len(set(len(distance.distance_bins) for distance in distogram)) > 1:
+            raise ValueError("All residue pairs in a distogram must have the same number of distance bins")
+
+        arrays = {"distance_scores_{}".format(k): np.array([d.distance_scores for d in distogram], dtype=np.float64)}
+        distance_bins = distogram.top.distance_bins if not distogram.empty else ()
+        if all(distance.distance_bins == distance_bins for distance in distogram):
+            map_metadata["distance_bins"] = [[float(edge) for edge in dbin] for dbin in distance_bins]
+        else:
+            arrays["distance_bins_{}".format(k)] = np.array([d.distance_bins for d in distogram], dtype=np.float64)
+        return arrays
+
+    def _prepare_sequencefile(self, hierarchy):
+        """Collect the metadata and column arrays of a sequence file"""
+        metadata = {
+            "version": FORMAT_VERSION,
+            "id": hierarchy.id,
+            "type": hierarchy.__class__.__name__,
+            "remark": hierarchy.remark,
+            "status": hierarchy.status,
+            "seq_ids": [sequence.id for sequence in hierarchy],
+            "seq_remarks": [sequence.remark for sequence in hierarchy],
+        }
+        offsets = np.cumsum([0] + [sequence.seq_len for sequence in hierarchy], dtype=np.int64)
+        data = "".join(sequence.seq for sequence in hierarchy).encode("ascii")
+        arrays = {"seq_data": np.frombuffer(data, dtype=np.uint8), "seq_offsets": offsets}
+        return metadata, arrays
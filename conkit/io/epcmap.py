@@ -35,6 +35,7 @@ __author__ = "Felix Simkovic"
 __date__ = "12 Dec 2016"
 __version__ = "0.13.3"
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -100,15 +101,13 @@ class EPCMapParser(ContactFileParser):
         contact_file = self._reconstruct(hierarchy)
         if len(contact_file) > 1:
             raise RuntimeError("More than one contact map provided")
-        content = ""
-        for contact_map in contact_file:
-            for contact in contact_map:
-                line = "{res1_seq} {res2_seq} {lb} {ub} {raw_score:.6f}\n"
-                lb = int(contact.lower_bound) if float(contact.lower_bound).is_integer() else contact.lower_bound
-                ub = int(contact.upper_bound) if float(contact.upper_bound).is_integer() else contact.upper_bound
-                line = line.format(
-                    res1_seq=contact.res1_seq, res2_seq=contact.res2_seq, raw_score=contact.raw_score, lb=lb, ub=ub
-                )
-                content += line
-
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            for contact_map in contact_file:
+                emitter.write_records("{} {} {} {} {:.6f}\n", (self._contact_record(c) for c in contact_map))
+
+    @staticmethod
+    def _contact_record(contact):
+        """Get the fields of a contact written to an EPC-map file"""
+        lb = int(contact.lower_bound) if float(contact.lower_bound).is_integer() else contact.lower_bound
+        ub = int(contact.upper_bound) if float(contact.upper_bound).is_integer() else contact.upper_bound
+        return contact.res1_seq, contact.res2_seq, lb, ub, contact.raw_score
@@ -37,6 +37,7 @@ __version__ = "0.13.3"
 
 import re
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -100,16 +101,9 @@ class EVfoldParser(ContactFileParser):
         contact_file = self._reconstruct(hierarchy)
         if len(contact_file) > 1:
             raise RuntimeError("More than one contact map provided")
-        content = ""
-        for contact_map in contact_file:
-            for contact in contact_map:
-                line = "{res1_seq} {res1} {res2_seq} {res2} 0 {raw_score}\n"
-                line = line.format(
-                    res1_seq=contact.res1_seq,
-                    res2_seq=contact.res2_seq,
-                    res1=contact.res1,
-                    res2=contact.res2,
-                    raw_score=contact.raw_score,
+        with BufferedEmitter(f_handle) as emitter:
+            for contact_map in contact_file:
+                emitter.write_records(
+                    "{} {} {} {} 0 {}\n",
+                    ((c.res1_seq, c.res1, c.res2_seq, c.res2, c.raw_score) for c in contact_map),
                 )
-                content += line
-        f_handle.write(content)
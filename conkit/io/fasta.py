@@ -35,6 +35,7 @@ __author__ = "Felix Simkovic"
 __date__ = "09 Sep 2016"
 __version__ = "0.13.3"
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import SequenceFileParser
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
@@ -116,15 +117,14 @@ class FastaParser(SequenceFileParser):
 
         """
         hierarchy = self._reconstruct(hierarchy)
-        content = ""
-        for remark in hierarchy.remark:
-            content += "#{}\n".format(remark)
-        for sequence_entry in hierarchy:
-            header = ">{}".format(sequence_entry.id)
-            if len(sequence_entry.remark) > 0:
-                header = "|".join([header] + sequence_entry.remark)
-            content += header + "\n"
-            sequence_string = sequence_entry.seq.upper()  # UPPER CASE !!!
-            for i in range(0, sequence_entry.seq_len, 60):
-                content += sequence_string[i : i + 60] + "\n"
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            for remark in hierarchy.remark:
+                emitter.write("#{}\n".format(remark))
+            for sequence_entry in hierarchy:
+                header = ">{}".format(sequence_entry.id)
+                if len(sequence_entry.remark) > 0:
+                    header = "|".join([header] + sequence_entry.remark)
+                emitter.write(header + "\n")
+                sequence_string = sequence_entry.seq.upper()  # UPPER CASE !!!
+                for i in range(0, sequence_entry.seq_len, 60):
+                    emitter.write(sequence_string[i : i + 60] + "\n")
@@ -37,6 +37,7 @@ __version__ = "0.13.3"
 
 import re
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -152,51 +153,29 @@ class GremlinParser(ContactFileParser):
 
         """
         contact_file = self._reconstruct(hierarchy)
-        content = ""
-        if contact_file.top_map.top_contact.res1_chain and contact_file.top_map.top_contact.res2_chain:
-            header_args = ["i", "j", "gene", "i_id", "j_id", "r_sco", "s_sco", "prob", "I_prob"]
-            content += "\t".join(header_args) + "\n"
-            out_kwargs = [
-                "{res1_seq}",
-                "{res2_seq}",
-                "{chains}",
-                "{res1_code}",
-                "{res2_code}",
-                "{raw_score}",
-                "{scalar_score}",
-                "1.0",
-                "N/A",
-            ]
+        with BufferedEmitter(f_handle) as emitter:
+            if contact_file.top_map.top_contact.res1_chain and contact_file.top_map.top_contact.res2_chain:
+                header_args = ["i", "j", "gene", "i_id", "j_id", "r_sco", "s_sco", "prob", "I_prob"]
+                with_chains = True
+            else:
+                header_args = ["i", "j", "i_id", "j_id", "r_sco", "s_sco", "prob"]
+                with_chains = False
+            emitter.write("\t".join(header_args) + "\n")
+            template = "\t".join(["{}"] * len(header_args)) + "\n"
+            for contact_map in contact_file:
+                contact_map.set_scalar_score()
+                emitter.write_records(template, (self._contact_record(c, with_chains) for c in contact_map))
+
+    @staticmethod
+    def _contact_record(contact, with_chains):
+        """Get the fields of a contact written to a GREMLIN file"""
+        res1_code = str(contact.res1_seq) + "_" + contact.res1
+        res2_code = str(contact.res2_seq) + "_" + contact.res2
+        scores = (contact.raw_score, round(contact.scalar_score, 1), "1.0")
+        if not with_chains:
+            return (contact.res1_seq, contact.res2_seq, res1_code, res2_code) + scores
+        if contact.res1_chain == contact.res2_chain:
+            chains = contact.res1_chain
         else:
-            header_args = ["i", "j", "i_id", "j_id", "r_sco", "s_sco", "prob"]
-            content += "\t".join(header_args) + "\n"
-            out_kwargs = [
-                "{res1_seq}",
-                "{res2_seq}",
-                "{res1_code}",
-                "{res2_code}",
-                "{raw_score}",
-                "{scalar_score}",
-                "1.0",
-            ]
-        for contact_map in contact_file:
-            contact_map.set_scalar_score()
-            for c in contact_map:
-                res1_code = str(c.res1_seq) + "_" + c.res1
-                res2_code = str(c.res2_seq) + "_" + c.res2
-                if c.res1_chain == c.res2_chain:
-                    chains = c.res1_chain
-                else:
-                    chains = "{}{}".format(c.res1_chain, c.res2_chain)
-                out_line = "\t".join(out_kwargs)
-                out_line = out_line.format(
-                    res1_seq=c.res1_seq,
-                    res2_seq=c.res2_seq,
-                    res1_code=res1_code,
-                    res2_code=res2_code,
-                    chains=chains,
-                    raw_score=c.raw_score,
-                    scalar_score=round(c.scalar_score, 1),
-                )
-                content += out_line + "\n"
-        f_handle.write(content)
+            chains = "{}{}".format(contact.res1_chain, contact.res2_chain)
+        return (contact.res1_seq, contact.res2_seq, chains, res1_code, res2_code) + scores + ("N/A",)
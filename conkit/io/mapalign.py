@@ -31,6 +31,7 @@
 Parser module specific to map_align map files
 """
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -92,8 +93,8 @@ class MapAlignParser(ContactFileParser):
         if len(contact_file) > 1:
             raise RuntimeError("More than one contact map provided")
         cmap = contact_file.top_map
-        content = "LEN {}\n".format(cmap.highest_residue_number)
-        line_template = "CON {} {} {:.6f}\n"
-        for contact in cmap:
-            content += line_template.format(contact.res1_seq, contact.res2_seq, contact.raw_score)
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write("LEN {}\n".format(cmap.highest_residue_number))
+            emitter.write_records(
+                "CON {} {} {:.6f}\n", ((contact.res1_seq, contact.res2_seq, contact.raw_score) for contact in cmap)
+            )
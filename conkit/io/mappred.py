@@ -32,6 +32,7 @@ Parser module specific to MapPred distance predictions
 """
 
 import numpy as np
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import DistanceFileParser
 from conkit.core.distance import Distance
 from conkit.core.distogram import Distogram
@@ -101,12 +102,18 @@ class MapPredParser(DistanceFileParser):
             raise RuntimeError("More than one distogram provided")
         distogram = distancefile.top_map
 
-        content = "#REMARK MapPred 1.1\n#REMARK idx_i, idx_j, distance distribution of 34 bins\n#REMARK 34 bins " \
-                  "consist of 32 normal bins (4-20A with a step of 0.5A) and two boundary bins ( [0,4) and [20, inf) " \
-                  "), as follows: [0,4,4.5,5,5.5,6,6.5,7,7.5,8,8.5,9,9.5,10,10.5,11,11.5,12,12.5,13,13.5,14,14.5,15," \
-                  "15.5,16,16.5,17,17.5,18,18.5,19,19.5,20,inf]\n"
+        header = "#REMARK MapPred 1.1\n#REMARK idx_i, idx_j, distance distribution of 34 bins\n#REMARK 34 bins " \
+                 "consist of 32 normal bins (4-20A with a step of 0.5A) and two boundary bins ( [0,4) and [20, inf) " \
+                 "), as follows: [0,4,4.5,5,5.5,6,6.5,7,7.5,8,8.5,9,9.5,10,10.5,11,11.5,12,12.5,13,13.5,14,14.5,15," \
+                 "15.5,16,16.5,17,17.5,18,18.5,19,19.5,20,inf]\n"
         line_template = "{} {}" + " {:.6f}" * 34 + "\n"
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write(header)
+            emitter.write_records(line_template, self._distance_records(distogram))
+
+    @staticmethod
+    def _distance_records(distogram):
+        """Get the fields of each distance written to a MapPred file"""
         for distance in distogram:
             distance.reshape_bins(DISTANCE_BINS)
-            content += line_template.format(distance.res1_seq, distance.res2_seq, *distance.distance_scores)
-        f_handle.write(content)
+            yield (distance.res1_seq, distance.res2_seq) + tuple(distance.distance_scores)
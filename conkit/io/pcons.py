@@ -41,6 +41,7 @@ __version__ = "0.13.3"
 
 import re
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -159,26 +160,23 @@ class PconsParser(ContactFileParser):
         if len(contact_file) > 1:
             raise RuntimeError("More than one contact map provided")
         comment_line = "##############################################################################\n"
-        content = ""
-        for contact_map in contact_file:
-            if write_header_footer:
-                content += comment_line
-                content += "PconsC3 result file\n"
-                content += "Generated using ConKit\n"
-                content += comment_line
-                if contact_map.sequence is not None:
-                    content += "Sequence number: 1\n"
-                    content += "Sequence name: {}\n".format(contact_map.sequence.id)
-                    content += "Sequence length: {} aa.\n".format(contact_map.sequence.seq_len)
-                    content += "Sequence:\n"
-                    content += contact_map.sequence.seq + "\n" * 3
-                content += "Predicted contacts:\n"
-                content += "Res1 Res2 Score\n"
-            for contact in contact_map:
-                res1_seq = contact.res1_seq
-                res2_seq = contact.res2_seq
-                raw_score = contact.raw_score
-                content += "{:>4} {:>4} {:>.6f}\n".format(res1_seq, res2_seq, raw_score)
-            if write_header_footer:
-                content += "\n" + comment_line
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            for contact_map in contact_file:
+                if write_header_footer:
+                    emitter.write(comment_line)
+                    emitter.write("PconsC3 result file\n")
+                    emitter.write("Generated using ConKit\n")
+                    emitter.write(comment_line)
+                    if contact_map.sequence is not None:
+                        emitter.write("Sequence number: 1\n")
+                        emitter.write("Sequence name: {}\n".format(contact_map.sequence.id))
+                        emitter.write("Sequence length: {} aa.\n".format(contact_map.sequence.seq_len))
+                        emitter.write("Sequence:\n")
+                        emitter.write(contact_map.sequence.seq + "\n" * 3)
+                    emitter.write("Predicted contacts:\n")
+                    emitter.write("Res1 Res2 Score\n")
+                emitter.write_records(
+                    "{:>4} {:>4} {:>.6f}\n", ((c.res1_seq, c.res2_seq, c.raw_score) for c in contact_map)
+                )
+                if write_header_footer:
+                    emitter.write("\n" + comment_line)
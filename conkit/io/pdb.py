@@ -38,9 +38,14 @@ __date__ = "27 Sep 2016"
 __version__ = "0.13.3"
 
 import collections
+import concurrent.futures
+import io
 import itertools
 import warnings
 
+import numpy as np
+import scipy.spatial
+import scipy.spatial.distance
 from Bio.PDB import MMCIFParser
 from Bio.PDB import PDBParser
 
@@ -52,6 +57,176 @@ from conkit.core.sequence import Sequence
 from conkit.core.mappings import AminoAcidThreeToOne
 
 ATOM = collections.namedtuple("Atom", "resname resseq resseq_alt reschain")
+CHAIN = collections.namedtuple("Chain", "id atoms seq nresidues")
+
+CIF_UNASSIGNED = {".", "?"}
+
+
+def _split_cif_line(line):
+    """Split a line of a mmCIF data loop into tokens, respecting quotes and comments"""
+    tokens = []
+    in_token = False
+    quote = None
+    start = 0
+    for i, c in enumerate(line):
+        if c == " " or c == "\t":
+            if in_token and not quote:
+                in_token = False
+                tokens.append(line[start:i])
+        elif c == "'" or c == '"':
+            if not quote and not in_token:
+                quote = c
+                in_token = True
+                start = i + 1
+            elif c == quote and (i + 1 == len(line) or line[i + 1] in " \t"):
+                quote = None
+                in_token = False
+                tokens.append(line[start:i])
+        elif c == "#" and not in_token:
+            return tokens
+        elif not in_token:
+            in_token = True
+            start = i
+    if quote:
+        raise ValueError("Line ended with quote open: " + line)
+    if in_token:
+        tokens.append(line[start:])
+    return tokens
+
+
+class _ModelBuilder(object):
+    """Collect the residues and the atoms of interest of each model while scanning the atom records of a file
+
+    This is a minimal replacement for the Biopython structure builder. Only the atoms used to calculate
+    distances are stored, but residues are tracked in full to derive the chain sequences. Any construct
+    that would require Biopython's disorder handling at residue level raises a :exc:`ValueError`.
+
+    """
+
+    def __init__(self, atom_type, max_models=None):
+        self.atom_type = atom_type
+        self.atom_names = {atom_type, "CA"} if atom_type == "CB" else {atom_type}
+        self.max_models = max_models
+        self.models = []
+        self._chains = None
+        self._chain_id = None
+        self._residue = None
+
+    def init_model(self):
+        """Start a new model, returns `False` if the maximum number of models has been exceeded"""
+        self._chains = collections.OrderedDict()
+        self.models.append(self._chains)
+        self._chain_id = None
+        self._residue = None
+        return self.max_models is None or len(self.models) <= self.max_models
+
+    def init_residue(self, chain_id, resname, hetflag, resseq, icode):
+        """Start a new residue unless the residue is the current one"""
+        ident = (resname, hetflag, resseq, icode)
+        if chain_id == self._chain_id and self._residue is not None and self._residue[0] == ident:
+            return
+        if chain_id not in self._chains:
+            self._chains[chain_id] = (set(), [])
+        keys, residues = self._chains[chain_id]
+        key = ("H_" + resname if hetflag == "H" else hetflag, resseq, icode)
+        if key in keys:
+            raise ValueError("Residue {} redefined in chain {}".format(key, chain_id))
+        keys.add(key)
+        self._chain_id = chain_id
+        self._residue = (ident, collections.OrderedDict())
+        residues.append(self._residue)
+
+    def init_atom(self, name, fullname, altloc, x, y, z):
+        """Store an atom of the current residue if it is used to calculate distances"""
+        glycine_ca = self.atom_type == "CB" and name == "CA" and self._residue[0][0] == "GLY"
+        if name != self.atom_type and not glycine_ca:
+            return
+        atoms = self._residue[1]
+        if name not in atoms:
+            atoms[name] = [fullname, (float(x), float(y), float(z)) if altloc == " " else None]
+        elif altloc != " " and atoms[name][0] == fullname:
+            # Disordered atoms are discarded as in :meth:`GenericStructureParser._keep_atom`
+            atoms[name][1] = None
+
+    def build(self):
+        """Build the chain information and coordinates of each model"""
+        structure = []
+        for model in self.models:
+            chains = []
+            coords = []
+            for chain_id, (_, residues) in model.items():
+                residues = [
+                    (ident, atoms)
+                    for ident, atoms in residues
+                    if ident[1] == " " or ident[0] in AminoAcidThreeToOne.__members__
+                ]
+                atoms = []
+                xyz = []
+                for resseq_alt, (ident, residue_atoms) in enumerate(residues, start=1):
+                    for _, coord in residue_atoms.values():
+                        if coord is not None:
+                            atoms.append(ATOM(ident[0], ident[2], resseq_alt, chain_id))
+                            xyz.append(coord)
+                seq = "".join(AminoAcidThreeToOne[ident[0]].value for ident, _ in residues)
+                chains.append(CHAIN(chain_id, atoms, seq, len(residues)))
+                # Round through single precision to match the coordinates stored by Biopython
+                coords.append(np.array(xyz, dtype=np.float32).astype(np.float64).reshape(-1, 3))
+            structure.append((chains, coords))
+        return structure
+
+
+class ModelEnsemble(object):
+    """Lazily materialised :obj:`~conkit.core.distancefile.DistanceFile` hierarchies of several structure models
+
+    The distance matrices of all models are computed up front, but the residue pairs of each model are only
+    built into a :obj:`~conkit.core.distancefile.DistanceFile` the first time the model is accessed.
+
+    Examples
+    --------
+    >>> from conkit.io.pdb import PdbParser
+    >>> with open('ensemble.pdb', 'r') as f_in:
+    ...     ensemble = PdbParser().read(f_in, models="all")
+    >>> print(ensemble)
+    ModelEnsemble(nmodels=20)
+    >>> distancefile = ensemble[0]
+
+    Attributes
+    ----------
+    model_ids : list
+       The identifiers of the models in the ensemble
+
+    """
+
+    def __init__(self, model_ids, builder):
+        """Initialise a new ensemble
+
+        Parameters
+        ----------
+        model_ids : list
+           The identifiers of the models in the ensemble
+        builder : callable
+           A function building the :obj:`~conkit.core.distancefile.DistanceFile` given a model index
+
+        """
+        self.model_ids = list(model_ids)
+        self._builder = builder
+        self._hierarchies = {}
+
+    def __getitem__(self, index):
+        index = range(len(self))[index]
+        if index not in self._hierarchies:
+            self._hierarchies[index] = self._builder(index)
+        return self._hierarchies[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.model_ids)
+
+    def __repr__(self):
+        return "{}(nmodels={})".format(self.__class__.__name__, len(self))
 
 
 class GenericStructureParser(ContactFileParser):
@@ -61,18 +236,120 @@ class GenericStructureParser(ContactFileParser):
     """
 
     def _build_sequence(self, chain):
-        """Build a peptide using :mod:`biopython` to extract the sequence"""
-        return Sequence(chain.id + "_seq", "".join(AminoAcidThreeToOne[residue.resname].value for residue in chain))
+        """Build a peptide from the one-letter sequence of a chain"""
+        return Sequence(chain.id + "_seq", chain.seq)
+
+    def _keep_atom(self, residue, atom, atom_type):
+        """Determine whether an atom is used to calculate distances, i.e. CA for glycine if atom_type is CB"""
+        if atom.is_disordered():
+            return False
+        elif residue.resname == "GLY" and atom_type == "CB" and atom.id == "CA":
+            return True
+        return atom.id == atom_type
+
+    def _keep_residue(self, residue):
+        """Determine whether a residue is kept, i.e. it is not a HETATM entry"""
+        return not residue.id[0].strip() or residue.resname in AminoAcidThreeToOne.__members__
+
+    def _model_chains(self, model, atom_type):
+        """Collect the residue information and coordinates of the atoms of interest in each chain of a model
 
-    def _chain_contacts(self, chain1, chain2):
+        Parameters
+        ----------
+        model : :obj:`~Bio.PDB.Model`
+           A model object
+        atom_type : str
+           Atom type between which distances are calculated
+
+        Returns
+        -------
+        tuple
+           A list of chain information and a list of :obj:`numpy.ndarray` with the atom coordinates of each chain
+
+        """
+        chains = []
+        coords = []
+        for chain in model:
+            residues = [residue for residue in chain if self._keep_residue(residue)]
+            atoms = []
+            xyz = []
+            for resseq_alt, residue in enumerate(residues, start=1):
+                for atom in residue:
+                    if self._keep_atom(residue, atom, atom_type):
+                        atoms.append(ATOM(residue.resname, int(residue.id[1]), resseq_alt, chain.id))
+                        xyz.append(atom.coord)
+            seq = "".join(AminoAcidThreeToOne[residue.resname].value for residue in residues)
+            chains.append(CHAIN(chain.id, atoms, seq, len(residues)))
+            coords.append(np.array(xyz, dtype=np.float64).reshape(-1, 3))
+        return chains, coords
+
+    def _chain_distances(self, chain1, coords1, chain2, coords2, intra, distance_cutoff=0):
+        """Calculate the distances between the atoms of two chains
+
+        Parameters
+        ----------
+        chain1 : :obj:`CHAIN`
+           The residue information of the first chain
+        coords1 : :obj:`numpy.ndarray`
+           The atom coordinates of the first chain
+        chain2 : :obj:`CHAIN`
+           The residue information of the second chain
+        coords2 : :obj:`numpy.ndarray`
+           The atom coordinates of the second chain
+        intra : bool
+           Both chains are the same chain
+        distance_cutoff : int, optional
+           If larger than 0, only inter-chain atom pairs closer than the cutoff are kept [default: 0]
+
+        Returns
+        -------
+        tuple
+           The indices of the atom pairs in each chain and their distances
+
+        """
+        if intra:
+            distances = scipy.spatial.distance.cdist(coords1, coords2)
+            resseqs = np.array([atom.resseq for atom in chain1.atoms], dtype=np.int64)
+            idx1, idx2 = np.nonzero(resseqs[:, np.newaxis] < resseqs[np.newaxis, :])
+            return idx1, idx2, distances[idx1, idx2]
+        elif distance_cutoff <= 0:
+            distances = scipy.spatial.distance.cdist(coords1, coords2)
+            idx1, idx2 = np.nonzero(np.ones(distances.shape, dtype=bool))
+            return idx1, idx2, distances[idx1, idx2]
+
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64))
+        if coords1.size == 0 or coords2.size == 0:
+            return empty
+        # Skip chains whose bounding boxes are further apart than the cutoff
+        gap = np.maximum(coords1.min(axis=0) - coords2.max(axis=0), coords2.min(axis=0) - coords1.max(axis=0))
+        gap = np.clip(gap, 0.0, None)
+        if np.sqrt(np.sum(gap * gap)) >= distance_cutoff:
+            return empty
+
+        pairs = scipy.spatial.cKDTree(coords1).sparse_distance_matrix(
+            scipy.spatial.cKDTree(coords2), distance_cutoff, output_type="ndarray"
+        )
+        order = np.lexsort((pairs["j"], pairs["i"]))
+        idx1, idx2 = pairs["i"][order].astype(np.int64), pairs["j"][order].astype(np.int64)
+        # Recalculate the distances so that they are identical to those of the full distance matrix
+        diff = coords1[idx1] - coords2[idx2]
+        distances = np.sqrt(np.sum(diff * diff, axis=1))
+        mask = distances < distance_cutoff
+        return idx1[mask], idx2[mask], distances[mask]
+
+    def _chain_contacts(self, chain1, chain2, pair_distances, intra):
         """Determine the contact pairs intra- or inter-molecular
 
         Parameters
         ----------
-        chain1 : :obj:`~Bio.PDB.Chain`
-           A first chain object
-        chain2 : :obj:`~Bio.PDB.Chain`
-           A second chain object
+        chain1 : :obj:`CHAIN`
+           The residue information of the first chain
+        chain2 : :obj:`CHAIN`
+           The residue information of the second chain
+        pair_distances : tuple
+           The indices of the atom pairs in each chain and their distances
+        intra : bool
+           Both chains are the same chain
 
         Yields
         ------
@@ -80,44 +357,147 @@ class GenericStructureParser(ContactFileParser):
            A list of tuples containing the contact information
 
         """
-        if chain1 == chain2:
-            range1 = range2 = list(range(1, len(chain1) + 1))
+        atoms1 = chain1.atoms
+        if intra:
+            atoms2 = chain2.atoms
         else:
-            range1 = list(range(1, len(chain1) + 1))
-            range2 = list(range(len(chain1) + 1, len(chain1) + len(chain2) + 1))
-        assert len(range1) == len(chain1) and len(range2) == len(chain2)
-
-        iterator = itertools.product(list(zip(range1, chain1)), list(zip(range2, chain2)))
-        for (resseq1_alt, residue1), (resseq2_alt, residue2) in iterator:
-            for atom1, atom2 in itertools.product(residue1, residue2):
-                if chain1 == chain2 and int(residue1.id[1]) >= int(residue2.id[1]):
-                    continue
-                construct1 = ATOM(
-                    resname=residue1.resname, resseq=int(residue1.id[1]), resseq_alt=resseq1_alt, reschain=chain1.id
-                )
-                construct2 = ATOM(
-                    resname=residue2.resname, resseq=int(residue2.id[1]), resseq_alt=resseq2_alt, reschain=chain2.id
+            atoms2 = [atom._replace(resseq_alt=atom.resseq_alt + chain1.nresidues) for atom in chain2.atoms]
+        idx1, idx2, distances = pair_distances
+        for i, j, distance in zip(idx1.tolist(), idx2.tolist(), distances.tolist()):
+            yield (atoms1[i], atoms2[j], distance)
+
+    def _build_hierarchy(self, f_id, model_id, chains, distances, distance_cutoff):
+        """Build the :obj:`~conkit.core.distancefile.DistanceFile` of a model
+
+        Parameters
+        ----------
+        f_id : str
+           Unique contact file identifier
+        model_id : int
+           The identifier of the model
+        chains : list
+           The residue information of each chain
+        distances : dict
+           The atom pair indices and distances keyed by the indices of each unique pair of chains
+        distance_cutoff : int
+           Distance cutoff for which to determine contacts
+
+        Returns
+        -------
+        :obj:`~conkit.core.distancefile.DistanceFile`
+
+        """
+        distance_bound = (0.0, float(distance_cutoff))
+        hierarchy = DistanceFile(f_id + "_" + str(model_id))
+        hierarchy.original_file_format = "pdb"
+
+        for (i, j), pair_distances in distances.items():
+            chain1, chain2 = chains[i], chains[j]
+            if i == j:  # intra
+                distogram = Distogram(chain1.id)
+            else:  # inter
+                distogram = Distogram(chain1.id + chain2.id)
+
+            for (atom1, atom2, distance) in self._chain_contacts(chain1, chain2, pair_distances, i == j):
+                if distance < distance_cutoff:
+                    score = round(1.0 - (distance / 100), 6)
+                else:
+                    score = 0
+
+                dist = Distance(atom1.resseq, atom2.resseq, (1,), ((distance, distance),), score, distance_bound)
+                dist.res1_altseq = atom1.resseq_alt
+                dist.res2_altseq = atom2.resseq_alt
+                dist.res1 = atom1.resname
+                dist.res2 = atom2.resname
+                dist.res1_chain = atom1.reschain
+                dist.res2_chain = atom2.reschain
+
+                if distance_cutoff == 0 or distance < distance_cutoff:
+                    dist.true_positive = True
+
+                distogram.add(dist)
+
+            if distogram.empty:
+                del distogram
+            else:
+                if i == j:
+                    distogram.sequence = self._build_sequence(chain1)
+                    assert len(distogram.sequence.seq) == chain1.nresidues
+                else:
+                    distogram.sequence = self._build_sequence(chain1) + self._build_sequence(chain2)
+                    assert len(distogram.sequence.seq) == chain1.nresidues + chain2.nresidues
+                hierarchy.add(distogram)
+
+        hierarchy.method = "Distogram extracted from PDB " + str(model_id)
+        hierarchy.remark = [
+            "The model id is the chain identifier, i.e XY equates to chain X and chain Y.",
+            "Residue numbers in column 1 are chain X, and numbers in column 2 are chain Y.",
+        ]
+        return hierarchy
+
+    def _select_models(self, model_ids, models):
+        """Select the identifiers of the models to read
+
+        Raises
+        ------
+        :exc:`ValueError`
+           A requested model is not present in the structure
+
+        """
+        if models is None:
+            if len(model_ids) > 1:
+                msg = (
+                    "Super-level to contact file not yet implemented. "
+                    "Parser returns hierarchy for top model only! Use models='all' to read all models."
                 )
-                yield (construct1, construct2, atom1 - atom2)
-
-    def _remove_atom(self, chain, type):
-        """Tidy up a chain removing all HETATM entries"""
-        for residue in chain.copy():
-            for atom in residue.copy():
-                if atom.is_disordered():
-                    chain[residue.id].detach_child(atom.id)
-                elif residue.resname == "GLY" and type == "CB" and atom.id == "CA":
-                    continue
-                elif atom.id != type:
-                    chain[residue.id].detach_child(atom.id)
-
-    def _remove_hetatm(self, chain):
-        """Tidy up a chain removing all HETATM entries"""
-        for residue in chain.copy():
-            if residue.id[0].strip() and residue.resname not in AminoAcidThreeToOne.__members__:
-                chain.detach_child(residue.id)
-
-    def _read(self, structure, f_id, distance_cutoff, atom_type):
+                warnings.warn(msg, FutureWarning)
+            return model_ids[:1]
+        elif models == "all":
+            return list(model_ids)
+        missing = [model_id for model_id in models if model_id not in model_ids]
+        if missing:
+            raise ValueError("Models not found in structure: {}".format(missing))
+        return list(models)
+
+    def _read_models(self, f_id, model_ids, model_chains, distance_cutoff, models, nthreads):
+        """Build the hierarchies of the selected models from their chain information and coordinates"""
+        # Residue bookkeeping is shared between models with identical chains, e.g. NMR ensembles
+        chains, coords = [], []
+        for c, xyz in model_chains:
+            if chains and c == chains[0]:
+                c = chains[0]
+            chains.append(c)
+            coords.append(xyz)
+
+        # Each unordered pair of chains is only calculated once, i.e. AB but not BA
+        tasks = [
+            (index, i, j)
+            for index in range(len(chains))
+            for i, j in itertools.combinations_with_replacement(range(len(chains[index])), 2)
+        ]
+
+        def calculate(task):
+            index, i, j = task
+            c, xyz = chains[index], coords[index]
+            return self._chain_distances(c[i], xyz[i], c[j], xyz[j], i == j, distance_cutoff=distance_cutoff)
+
+        if nthreads > 1 and len(tasks) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+                results = list(executor.map(calculate, tasks))
+        else:
+            results = [calculate(task) for task in tasks]
+        distances = [{} for _ in chains]
+        for (index, i, j), pair_distances in zip(tasks, results):
+            distances[index][(i, j)] = pair_distances
+
+        def builder(index):
+            return self._build_hierarchy(f_id, model_ids[index], chains[index], distances[index], distance_cutoff)
+
+        if models is None:
+            return builder(0)
+        return ModelEnsemble(model_ids, builder)
+
+    def _read(self, structure, f_id, distance_cutoff, atom_type, models=None, nthreads=1):
         """Read a contact file
 
         Parameters
@@ -130,70 +510,119 @@ class GenericStructureParser(ContactFileParser):
            Distance cutoff for which to determine contacts
         atom_type : str
            Atom type between which distances are calculated
+        models : str, list, optional
+           The identifiers of the models to read, or ``all`` for all models. If `None`, only the first model is
+           read [default: None]
+        nthreads : int, optional
+           The number of threads used to calculate the distances between the chains of all models [default: 1]
 
         Returns
         -------
-        :obj:`~conkit.core.distancefile.DistanceFile~`
+        :obj:`~conkit.core.distancefile.DistanceFile`, :obj:`ModelEnsemble`
+           The hierarchy of the first model, or an ensemble of hierarchies if models is not `None`
+
+        Raises
+        ------
+        :exc:`ValueError`
+           A requested model is not present in the structure
 
         """
-        hierarchies = []
-        distance_bound = (0.0, float(distance_cutoff))
-        for model in structure:
-            hierarchy = DistanceFile(f_id + "_" + str(model.id))
-            hierarchy.original_file_format = "pdb"
-            chains = list(chain for chain in model)
-
-            for chain in chains:
-                self._remove_hetatm(chain)
-                self._remove_atom(chain, atom_type)
-
-            for chain1, chain2 in itertools.product(chains, chains):
-                if chain1.id == chain2.id:  # intra
-                    distogram = Distogram(chain1.id)
-                else:  # inter
-                    distogram = Distogram(chain1.id + chain2.id)
-
-                for (atom1, atom2, distance) in self._chain_contacts(chain1, chain2):
-                    if distance < distance_cutoff:
-                        score = round(1.0 - (distance / 100), 6)
-                    else:
-                        score = 0
+        model_ids = self._select_models([model.id for model in structure], models)
+        model_chains = [self._model_chains(structure[model_id], atom_type) for model_id in model_ids]
+        return self._read_models(f_id, model_ids, model_chains, distance_cutoff, models, nthreads)
 
-                    dist = Distance(atom1.resseq, atom2.resseq, (1,), ((distance, distance),), score, distance_bound)
-                    dist.res1_altseq = atom1.resseq_alt
-                    dist.res2_altseq = atom2.resseq_alt
-                    dist.res1 = atom1.resname
-                    dist.res2 = atom2.resname
-                    dist.res1_chain = atom1.reschain
-                    dist.res2_chain = atom2.reschain
+    def read_structure(self, structure, f_id=None, distance_cutoff=8, atom_type="CB", models=None, nthreads=1):
+        """Read the distances of a structure already parsed with Biopython
 
-                    if distance_cutoff == 0 or distance < distance_cutoff:
-                        dist.true_positive = True
+        This avoids parsing the same file twice when the :obj:`~Bio.PDB.Structure.Structure` is also needed
+        elsewhere, e.g. to annotate its secondary structure with DSSP.
 
-                    distogram.add(dist)
+        Parameters
+        ----------
+        structure
+           A :obj:`~Bio.PDB.Structure.Structure` instance
+        f_id : str, optional
+           Unique contact file identifier [default: the structure identifier]
+        distance_cutoff : int, optional
+           Distance cutoff for which to determine contacts [default: 8]
+        atom_type : str, optional
+           Atom type between which distances are calculated [default: CB]
+        models : str, list, optional
+           The identifiers of the models to read, or ``all`` for all models. If `None`, only the first model is
+           read [default: None]
+        nthreads : int, optional
+           The number of threads used to calculate the distances between the chains of all models [default: 1]
 
-                if distogram.empty:
-                    del distogram
-                else:
-                    if len(distogram.id) == 1:
-                        distogram.sequence = self._build_sequence(chain1)
-                        assert len(distogram.sequence.seq) == len(chain1)
-                    else:
-                        distogram.sequence = self._build_sequence(chain1) + self._build_sequence(chain2)
-                        assert len(distogram.sequence.seq) == len(chain1) + len(chain2)
-                    hierarchy.add(distogram)
-
-            hierarchy.method = "Distogram extracted from PDB " + str(model.id)
-            hierarchy.remark = [
-                "The model id is the chain identifier, i.e XY equates to chain X and chain Y.",
-                "Residue numbers in column 1 are chain X, and numbers in column 2 are chain Y.",
-            ]
-            hierarchies.append(hierarchy)
-
-        if len(hierarchies) > 1:
-            msg = "Super-level to contact file not yet implemented. " "Parser returns hierarchy for top model only!"
-            warnings.warn(msg, FutureWarning)
-        return hierarchies[0]
+        Returns
+        -------
+        :obj:`~conkit.core.distancefile.DistanceFile`, :obj:`~conkit.io.pdb.ModelEnsemble`
+           The hierarchy of the first model, or an ensemble of hierarchies if models is not `None`
+
+        """
+        if f_id is None:
+            f_id = structure.id
+        return self._read(structure, f_id, distance_cutoff, atom_type, models=models, nthreads=nthreads)
+
+    def _read_structure(self, f_handle, f_id, distance_cutoff, atom_type, models, nthreads, fast):
+        """Read a structure file using the fast atom record scanner, or Biopython if it cannot be used"""
+        model_ids, model_chains = self._structure_chains(f_handle, atom_type, models, fast)
+        return self._read_models(f_id, model_ids, model_chains, distance_cutoff, models, nthreads)
+
+    def _structure_chains(self, f_handle, atom_type, models, fast):
+        """Collect the chain information and coordinates of the selected models of a structure file
+
+        The scanner only keeps the atoms of interest and falls back to a full Biopython structure
+        for files it cannot interpret identically, e.g. with residues redefined by point mutations.
+
+        Returns
+        -------
+        tuple
+           The identifiers of the selected models and the chain information and coordinates of each model
+
+        """
+        if fast:
+            content = f_handle.read()
+            builder = _ModelBuilder(atom_type, max_models=1 if models is None else None)
+            try:
+                self._scan(content.split("\n"), builder)
+                structure = builder.build()
+            except (ValueError, IndexError, KeyError):
+                f_handle = io.StringIO(content)
+            else:
+                model_ids = self._select_models(list(range(len(structure))), models)
+                return model_ids, [structure[model_id] for model_id in model_ids]
+        structure = self._get_structure(f_handle)
+        model_ids = self._select_models([model.id for model in structure], models)
+        return model_ids, [self._model_chains(structure[model_id], atom_type) for model_id in model_ids]
+
+    def read_coordinates(self, f_handle, atom_type="CB", fast=True):
+        """Read the coordinates of the atoms used to calculate distances in the first model
+
+        This avoids building a contact hierarchy when only the coordinates are of interest, e.g. to score
+        many structures against the same contact prediction.
+
+        Parameters
+        ----------
+        f_handle
+           Open file handle [read permissions]
+        atom_type : str, optional
+           Atom type between which distances are calculated [default: CB]
+        fast : bool, optional
+           Scan the atom records directly instead of building a Biopython structure [default: True]
+
+        Returns
+        -------
+        list
+           A tuple of the chain identifier, an array of residue sequence numbers and an array with the
+           coordinates of each atom for each chain
+
+        """
+        _, model_chains = self._structure_chains(f_handle, atom_type, None, fast)
+        chains, coords = model_chains[0]
+        return [
+            (chain.id, np.array([atom.resseq for atom in chain.atoms], dtype=np.int64), xyz)
+            for chain, xyz in zip(chains, coords)
+        ]
 
     def _write(self, f_handle, hierarchy):
         """Write a contact file instance to a file
@@ -216,7 +645,96 @@ class MmCifParser(GenericStructureParser):
     def __init__(self):
         super(MmCifParser, self).__init__()
 
-    def read(self, f_handle, f_id="mmcif", distance_cutoff=8, atom_type="CB"):
+    def _get_structure(self, f_handle):
+        """Parse the structure with Biopython"""
+        return MMCIFParser(QUIET=True).get_structure("mmcif", f_handle)
+
+    def _scan(self, lines, builder):
+        """Scan the ``_atom_site`` loop of a mmCIF file and pass the atoms to a :obj:`_ModelBuilder`"""
+        lines = iter(lines)
+        keys = None
+        for line in lines:
+            stripped = line.strip()
+            if stripped.lower() == "loop_":
+                keys = []
+            elif keys is not None and stripped.startswith("_"):
+                if len(stripped.split()) != 1:
+                    raise ValueError("Unexpected loop header: " + stripped)
+                keys.append(stripped)
+            elif keys and keys[0].startswith("_atom_site."):
+                break
+            elif stripped.startswith("_atom_site."):
+                raise ValueError("The _atom_site category is not a loop")
+            else:
+                keys = None
+        else:
+            raise ValueError("No _atom_site loop found")
+
+        columns = {key: i for i, key in enumerate(keys)}
+        ncolumns = len(keys)
+        seq_key = "_atom_site.auth_seq_id" if "_atom_site.auth_seq_id" in columns else "_atom_site.label_seq_id"
+        c_group, c_name, c_alt, c_resname, c_chain, c_seq, c_icode, c_x, c_y, c_z, c_model = [
+            columns[key]
+            for key in (
+                "_atom_site.group_PDB",
+                "_atom_site.label_atom_id",
+                "_atom_site.label_alt_id",
+                "_atom_site.label_comp_id",
+                "_atom_site.auth_asym_id",
+                seq_key,
+                "_atom_site.pdbx_PDB_ins_code",
+                "_atom_site.Cartn_x",
+                "_atom_site.Cartn_y",
+                "_atom_site.Cartn_z",
+                "_atom_site.pdbx_PDB_model_num",
+            )
+        ]
+        atom_names = builder.atom_names
+        current_model = None
+        tokens = []
+        for line in itertools.chain([line], lines):
+            stripped = line.strip()
+            if not stripped or stripped[0] == "#":
+                continue
+            elif stripped[0] == "_" or stripped.startswith(("loop_", "data_", "save_", "global_", "stop_")):
+                break
+            elif stripped[0] == ";":
+                raise ValueError("Text fields are not supported in the _atom_site loop")
+            elif "'" in stripped or '"' in stripped or "#" in stripped:
+                tokens.extend(_split_cif_line(stripped))
+            else:
+                tokens.extend(stripped.split())
+            if len(tokens) < ncolumns:
+                continue
+            if len(tokens) > ncolumns:
+                raise ValueError("Atom records span several lines")
+            row, tokens = tokens, []
+
+            if row[c_seq] == ".":
+                continue
+            model = int(row[c_model])
+            if model != current_model:
+                current_model = model
+                if not builder.init_model():
+                    return
+            resname = row[c_resname]
+            if row[c_group] != "HETATM":
+                hetflag = " "
+            elif resname == "HOH" or resname == "WAT":
+                hetflag = "W"
+            else:
+                hetflag = "H"
+            icode = " " if row[c_icode] in CIF_UNASSIGNED else row[c_icode]
+            builder.init_residue(row[c_chain], resname, hetflag, int(row[c_seq]), icode)
+            name = row[c_name]
+            if name in atom_names:
+                altloc = row[c_alt]
+                altloc = " " if altloc in CIF_UNASSIGNED else altloc
+                builder.init_atom(name, name, altloc, row[c_x], row[c_y], row[c_z])
+        if tokens:
+            raise ValueError("Incomplete atom record in the _atom_site loop")
+
+    def read(self, f_handle, f_id="mmcif", distance_cutoff=8, atom_type="CB", models=None, nthreads=1, fast=True):
         """Read a contact file
 
         Parameters
@@ -229,14 +747,21 @@ class MmCifParser(GenericStructureParser):
            Distance cutoff for which to determine contacts [default: 8]
         atom_type : str, optional
            Atom type between which distances are calculated [default: CB]
+        models : str, list, optional
+           The identifiers of the models to read, or ``all`` for all models. If `None`, only the first model is
+           read [default: None]
+        nthreads : int, optional
+           The number of threads used to calculate the distances between the chains of all models [default: 1]
+        fast : bool, optional
+           Scan the atom records directly instead of building a Biopython structure [default: True]
 
         Returns
         -------
-        :obj:`~conkit.core.contactfile.ContactFile`
+        :obj:`~conkit.core.distancefile.DistanceFile`, :obj:`~conkit.io.pdb.ModelEnsemble`
+           The hierarchy of the first model, or an ensemble of hierarchies if models is not `None`
 
         """
-        structure = MMCIFParser(QUIET=True).get_structure("mmcif", f_handle)
-        return self._read(structure, f_id, distance_cutoff, atom_type)
+        return self._read_structure(f_handle, f_id, distance_cutoff, atom_type, models, nthreads, fast)
 
     def write(self, f_handle, hierarchy):
         """Write a contact file instance to to file
@@ -266,7 +791,53 @@ class PdbParser(GenericStructureParser):
     def __init__(self):
         super(PdbParser, self).__init__()
 
-    def read(self, f_handle, f_id="pdb", distance_cutoff=8, atom_type="CB"):
+    def _get_structure(self, f_handle):
+        """Parse the structure with Biopython"""
+        return PDBParser(QUIET=True).get_structure("pdb", f_handle)
+
+    def _scan(self, lines, builder):
+        """Scan the coordinate records of a PDB file and pass the atoms to a :obj:`_ModelBuilder`"""
+        atom_names = builder.atom_names
+        started = False
+        model_open = False
+        previous = None
+        for line in lines:
+            record = line[0:6]
+            if record == "ATOM  " or record == "HETATM":
+                if not model_open:
+                    if not builder.init_model():
+                        return
+                    model_open = True
+                    previous = None
+                started = True
+                # Columns 18-27 hold the residue name, chain, sequence number and insertion code
+                residue = record + line[17:27]
+                if residue != previous:
+                    previous = residue
+                    resname = line[17:20].strip()
+                    if record == "ATOM  ":
+                        hetflag = " "
+                    elif resname == "HOH" or resname == "WAT":
+                        hetflag = "W"
+                    else:
+                        hetflag = "H"
+                    builder.init_residue(line[21], resname, hetflag, int(line[22:26].split()[0]), line[26])
+                name = line[12:16].strip()
+                if name in atom_names:
+                    builder.init_atom(name, line[12:16], line[16], line[30:38], line[38:46], line[46:54])
+            elif record == "MODEL ":
+                started = True
+                if not builder.init_model():
+                    return
+                model_open = True
+                previous = None
+            elif record == "ENDMDL":
+                model_open = False
+                previous = None
+            elif started and (record == "END   " or record == "CONECT"):
+                break
+
+    def read(self, f_handle, f_id="pdb", distance_cutoff=8, atom_type="CB", models=None, nthreads=1, fast=True):
         """Read a contact file
 
         Parameters
@@ -279,14 +850,21 @@ class PdbParser(GenericStructureParser):
            Distance cutoff for which to determine contacts [default: 8]
         atom_type : str, optional
            Atom type between which distances are calculated [default: CB]
+        models : str, list, optional
+           The identifiers of the models to read, or ``all`` for all models. If `None`, only the first model is
+           read [default: None]
+        nthreads : int, optional
+           The number of threads used to calculate the distances between the chains of all models [default: 1]
+        fast : bool, optional
+           Scan the atom records directly instead of building a Biopython structure [default: True]
 
         Returns
         -------
-        :obj:`~conkit.core.contactfile.ContactFile`
+        :obj:`~conkit.core.distancefile.DistanceFile`, :obj:`~conkit.io.pdb.ModelEnsemble`
+           The hierarchy of the first model, or an ensemble of hierarchies if models is not `None`
 
         """
-        structure = PDBParser(QUIET=True).get_structure("pdb", f_handle)
-        return self._read(structure, f_id, distance_cutoff, atom_type)
+        return self._read_structure(f_handle, f_id, distance_cutoff, atom_type, models, nthreads, fast)
 
     def write(self, f_handle, hierarchy):
         """Write a contact file instance to to file
@@ -35,6 +35,7 @@ __author__ = "Felix Simkovic"
 __date__ = "03 Aug 2016"
 __version__ = "0.13.3"
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import ContactFileParser
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -102,8 +103,6 @@ class PlmDCAParser(ContactFileParser):
         contact_file = self._reconstruct(hierarchy)
         if len(contact_file) > 1:
             raise RuntimeError("More than one contact map provided")
-        content = ""
-        for contact_map in contact_file:
-            for contact in contact_map:
-                content += "{},{},{:.6f}\n".format(contact.res1_seq, contact.res2_seq, contact.raw_score)
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            for contact_map in contact_file:
+                emitter.write_records("{},{},{:.6f}\n", ((c.res1_seq, c.res2_seq, c.raw_score) for c in contact_map))
@@ -32,6 +32,8 @@ Parser module specific to rosetta NPZ distance predictions
 """
 
 import numpy as np
+from conkit.io._iotools import dequantise_probabilities, distogram_to_tensor, is_npz, open_npz, quantise_probabilities
+from conkit.io._iotools import residue_window
 from conkit.io._parser import BinaryDistanceFileParser
 from conkit.core.distance import Distance
 from conkit.core.distogram import Distogram
@@ -47,7 +49,7 @@ DISTANCE_BINS = ((0, 2), (2, 2.5), (2.5, 3), (3, 4), (4, 4.5), (4.5, 5), (5, 5.5
 class RosettaNpzParser(BinaryDistanceFileParser):
     """Parser class for rosetta NPZ distance prediction file"""
 
-    def read(self, f_handle, f_id="rosettanpz"):
+    def read(self, f_handle, f_id="rosettanpz", window=None, skip_absent=False):
         """Read a distance prediction file
 
         Parameters
@@ -56,11 +58,22 @@ class RosettaNpzParser(BinaryDistanceFileParser):
            Open file handle [read permissions]
         f_id : str, optional
            Unique contact file identifier
+        window : tuple, optional
+           The first and last residue number of a window, only residue pairs within it are read [default: None]
+        skip_absent : bool, optional
+           Skip the residue pairs whose probabilities are all zero, which ConKit writes for the residue pairs
+           absent from a distogram [default: False]
 
         Returns
         -------
         :obj:`~conkit.core.distancefile.DistanceFile`
 
+        Note
+        ----
+        The probabilities of archives stored without compression are memory-mapped, and those of compressed archives
+        are decompressed up to the last residue of the window, so that only the residue pairs within the window are
+        loaded into memory.
+
         """
 
         hierarchy = DistanceFile(f_id)
@@ -68,26 +81,73 @@ class RosettaNpzParser(BinaryDistanceFileParser):
         _map = Distogram("distogram_1")
         hierarchy.add(_map)
 
-        prediction = np.load(f_handle, allow_pickle=True)
-        probs = prediction['dist']
+        if is_npz(f_handle):
+            prediction = open_npz(f_handle)
+        else:
+            prediction = np.load(f_handle, allow_pickle=True)
+        start, stop = residue_window(window, prediction['dist'].shape[0])
+        scale = prediction['dist_scale'][start:stop, start:stop] if 'dist_scale' in prediction else None
+        probs = dequantise_probabilities(np.asarray(prediction['dist'][start:stop, start:stop]), scale)
         # Bin #0 corresponds with d>20A & bins #1 ~ #36 correspond with 2A<d<20A in increments of 0.5A
         probs = probs[:, :, [x for x in range(1, 37)] + [0]]
 
-        L = probs.shape[0]
-        for i in range(L):
-            for j in range(i, L):
-                _distance = Distance(i + 1, j + 1, tuple(probs[i, j, :].tolist()), DISTANCE_BINS)
-                _map.add(_distance)
+        observed = np.ones(probs.shape[:2], dtype=bool)
+        if skip_absent:
+            # Residue pairs without a prediction have zero probability
+            observed = probs.any(axis=-1)
+        res1_idx, res2_idx = np.nonzero(np.triu(observed))
+        scores = probs[res1_idx, res2_idx].tolist()
+        for i, j, distance_scores in zip(res1_idx.tolist(), res2_idx.tolist(), scores):
+            _distance = Distance(start + i + 1, start + j + 1, tuple(distance_scores), DISTANCE_BINS)
+            _map.add(_distance)
 
         return hierarchy
 
-    def write(self, f_handle, hierarchy):
+    def write(self, f_handle, hierarchy, precision="float32", compress=False):
         """Write a distance file instance to a file
 
+        The distance probabilities are reshaped into the 37 bins of the trRosetta format if necessary. Only the
+        ``dist`` array is written, since the hierarchy does not contain the inter-residue orientations.
+
+        Parameters
+        ----------
+        f_handle
+           Open file handle [write permissions, binary]
+        hierarchy : :obj:`~conkit.core.distancefile.DistanceFile`, :obj:`~conkit.core.distogram.Distogram`
+        precision : str, optional
+           The numeric type used to store the probabilities, one of float64, float32, float16 or uint8, where uint8
+           quantises the probabilities to 256 levels and stores the scale of each residue pair in ``dist_scale``
+           [default: float32]
+        compress : bool, optional
+           Compress the archive [default: False]
+
+        Returns
+        -------
+        float
+           The largest absolute difference between any probability read back from the file and its original value
+
         Raises
         ------
-        :exc:`NotImplementedError`
-           Write function not available
+        :exc:`RuntimeError`
+           More than one distogram provided
+        :exc:`ValueError`
+           Unknown precision
 
         """
-        raise NotImplementedError("Write function not available yet")
+        distancefile = self._reconstruct(hierarchy)
+        if len(distancefile) > 1:
+            raise RuntimeError("More than one distogram provided")
+        probs = distogram_to_tensor(distancefile.top_map, DISTANCE_BINS)
+        dist = probs[:, :, [36] + [x for x in range(0, 36)]]
+        arrays = {}
+        arrays["dist"], scale = quantise_probabilities(dist, precision)
+        if scale is not None:
+            arrays["dist_scale"] = scale
+        if compress:
+            np.savez_compressed(f_handle, **arrays)
+        else:
+            np.savez(f_handle, **arrays)
+
+        observed = dist.any(axis=-1)
+        decoded = dequantise_probabilities(arrays["dist"], scale)
+        return float(np.abs(decoded[observed] - dist[observed]).max(initial=0))
@@ -37,6 +37,7 @@ __version__ = "0.13.3"
 
 import re
 
+from conkit.io._iotools import BufferedEmitter
 from conkit.io._parser import SequenceFileParser
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
@@ -112,21 +113,21 @@ class StockholmParser(SequenceFileParser):
 
         """
         sequence_file = self._reconstruct(hierarchy)
-        content = "# STOCKHOLM 1.0\n"
-        content += "#=GF ID {}\n\n".format(sequence_file.top_sequence.id)
-        chunks = []
-        for i, sequence_entry in enumerate(sequence_file):
-            if i != 0:
-                content += "#=GS {:33} DE {}\n".format(sequence_entry.id, " ".join(sequence_entry.remark))
-            chunk = []
-            sequence_string = sequence_entry.seq
-            sequence_string = sequence_string.upper()  # UPPER CASE !!!
-            for j in range(0, sequence_entry.seq_len, 200):
-                chunk.append(sequence_string[j : j + 200])
-            chunks.append(tuple([sequence_entry.id, chunk]))
-        for j in range(len(chunks[0][1])):
-            content += "\n"
-            for i in range(len(chunks)):
-                content += "{:41} {}\n".format(chunks[i][0], chunks[i][1][j])
-        content += "//\n"
-        f_handle.write(content)
+        with BufferedEmitter(f_handle) as emitter:
+            emitter.write("# STOCKHOLM 1.0\n")
+            emitter.write("#=GF ID {}\n\n".format(sequence_file.top_sequence.id))
+            chunks = []
+            for i, sequence_entry in enumerate(sequence_file):
+                if i != 0:
+                    emitter.write("#=GS {:33} DE {}\n".format(sequence_entry.id, " ".join(sequence_entry.remark)))
+                chunk = []
+                sequence_string = sequence_entry.seq
+                sequence_string = sequence_string.upper()  # UPPER CASE !!!
+                for j in range(0, sequence_entry.seq_len, 200):
+                    chunk.append(sequence_string[j : j + 200])
+                chunks.append(tuple([sequence_entry.id, chunk]))
+            for j in range(len(chunks[0][1])):
+                emitter.write("\n")
+                for i in range(len(chunks)):
+                    emitter.write("{:41} {}\n".format(chunks[i][0], chunks[i][1][j]))
+            emitter.write("//\n")
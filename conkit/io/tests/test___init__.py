@@ -0,0 +1,78 @@
+"""Testing facility for conkit.io"""
+
+import os
+import shutil
+import tempfile
+
+from conkit import io
+from conkit.io.tests.helpers import ParserTestCase
+
+
+class TestIO(ParserTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _fasta(self, nfiles):
+        fnames = []
+        for i in range(nfiles):
+            content = ">seq_{0}\nGSMFTPKPPQDSAVIRGGAG\n>seq_{0}b\nGSMFTPKPPQDSAVIRGGAA\n".format(i)
+            fnames.append(self.tempfile(content=content))
+        return fnames
+
+    def test_convert_many_1(self):
+        fnames = self._fasta(3)
+        jobs = [(f, "fasta", os.path.join(self.directory, "{}.a3m".format(i)), "a3m") for i, f in enumerate(fnames)]
+        jobs.append((fnames[0], "unknown", os.path.join(self.directory, "x.a3m"), "a3m"))
+        results = io.convert_many(jobs, workers=1)
+        self.assertEqual(jobs, [job for job, _ in results])
+        self.assertEqual([None, None, None], [error for _, error in results[:3]])
+        self.assertEqual("ValueError: Unrecognised format: unknown", results[3][1])
+        self.assertEqual(["0.a3m", "1.a3m", "2.a3m"], sorted(os.listdir(self.directory)))
+        hierarchy = io.read(os.path.join(self.directory, "1.a3m"), "a3m")
+        self.assertEqual(["seq_1", "seq_1b"], [s.id for s in hierarchy])
+
+    def test_convert_many_2(self):
+        fnames = self._fasta(5)
+        jobs = [(f, "fasta", os.path.join(self.directory, "{}.a3m".format(i)), "a3m") for i, f in enumerate(fnames)]
+        results = io.convert_many(jobs, workers=2, chunksize=2)
+        self.assertEqual([None] * 5, [error for _, error in results])
+        for i in range(5):
+            hierarchy = io.read(os.path.join(self.directory, "{}.a3m".format(i)), "a3m")
+            self.assertEqual(["seq_{}".format(i), "seq_{}b".format(i)], [s.id for s in hierarchy])
+
+    def test_convert_many_3(self):
+        self.assertEqual([], io.convert_many([]))
+
+    def test_read_many_1(self):
+        fnames = self._fasta(4)
+        hierarchies = io.read_many(fnames, "fasta", max_workers=2)
+        self.assertEqual(4, len(hierarchies))
+        expected = [["seq_{}".format(i), "seq_{}b".format(i)] for i in range(4)]
+        self.assertEqual(expected, [[s.id for s in h] for h in hierarchies])
+
+    def test_read_many_2(self):
+        fnames = self._fasta(2)
+        hierarchies = io.read_many(fnames, ["fasta", "a3m"], max_workers=2, processes=True, f_id="test")
+        self.assertEqual(["test", "test"], [h.id for h in hierarchies])
+        self.assertEqual(["seq_1", "seq_1b"], [s.id for s in hierarchies[1]])
+        with self.assertRaises(ValueError):
+            io.read_many(fnames, ["fasta"])
+
+    def test_iread_many_1(self):
+        fnames = self._fasta(5)
+        results = list(io.iread_many(fnames, "fasta", max_workers=3))
+        self.assertEqual(list(range(5)), sorted(i for i, _ in results))
+        for i, hierarchy in results:
+            self.assertEqual("seq_{}".format(i), hierarchy.top.id)
+
+    def test_read_auto_1(self):
+        fname = self._fasta(1)[0]
+        hierarchy = io.read(fname, "auto")
+        self.assertEqual(["seq_0", "seq_0b"], [s.id for s in hierarchy])
+        outfile = os.path.join(self.directory, "out.a3m")
+        io.convert(fname, "auto", outfile, "a3m")
+        self.assertEqual(["seq_0", "seq_0b"], [s.id for s in io.read(outfile, "a3m")])
+        with self.assertRaises(ValueError):
+            io.read(self.tempfile(content="Hello World\n"), "auto")
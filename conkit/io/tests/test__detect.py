@@ -0,0 +1,67 @@
+"""Testing facility for conkit.io._detect"""
+
+import gzip
+import io
+import pickle
+
+import numpy as np
+
+from conkit.io._detect import detect_format
+from conkit.io.tests.helpers import ParserTestCase
+
+
+class TestDetectFormat(ParserTestCase):
+
+    def _detect(self, content, mode="w"):
+        return detect_format(self.tempfile(content=content, mode=mode))
+
+    def test_detect_format_1(self):
+        self.assertEqual(["fasta", "a3m", "a3m-inserts"], self._detect("#comment\n>seq_1\nGSMFTPK\n>seq_2\nGSM-TPK\n"))
+        self.assertEqual(["a3m", "a3m-inserts", "fasta"], self._detect(">seq_1\nGSMFTPK\n>seq_2\nGSMaaFTPK\n"))
+        self.assertEqual(["a2m", "jones"], self._detect("GSMFTPK\nGSM-TPK\n"))
+        self.assertEqual(["stockholm"], self._detect("# STOCKHOLM 1.0\n#=GF ID 1EAZ\nseq_1 GSMFTPK\n//\n"))
+        self.assertEqual(["clustal"], self._detect("CLUSTAL W\n\nseq_0   AAAAAA\nseq_1   BBBBBB\n"))
+
+    def test_detect_format_2(self):
+        self.assertEqual(["casprr", "casp"], self._detect("PFRMAT RR\nTARGET R9999\nMODEL 1\n1 9 0 8 0.70\nEND\n"))
+        self.assertEqual(["caspmode2"], self._detect("PFRMAT RR\nRMODE 2\n1 8 .72 .345 .225\nEND\n"))
+        psicov = "46 78 0 8 9.301869\n80 105 0 8 8.856009\n"
+        self.assertEqual(["psicov", "metapsicov", "nebcon", "epcmap", "casprr"], self._detect(psicov))
+        self.assertEqual(["plmdca"], self._detect("1,2,0.12212\n1,3,0.14004\n"))
+        self.assertEqual(["aleigen"], self._detect("77\n10 14\n1 7\n"))
+        self.assertEqual(["evfold", "freecontact"], self._detect("1 M 2 V 0 0.0338619\n1 M 3 G 0 0.0307956\n"))
+        self.assertEqual(["freecontact", "evfold"], self._detect("1 M 2 V 0.0338619 0\n1 M 3 G 0.0307956 0\n"))
+        self.assertEqual(["comsat"], self._detect("19   A   41   A   H1-H2\n19   A   42   C   H1-H2\n"))
+        self.assertEqual(["gremlin"], self._detect("# comment\ni\tj\ti_id\tj_id\tr_sco\n179\t246\t179_C\t246_L\t0.2\n"))
+        self.assertEqual(["mapalign"], self._detect("LEN     77\nCON     10      14      1\n"))
+        matrix = "\n".join(" ".join("{:.6e}".format(v) for v in row) for row in np.random.rand(12, 12)) + "\n"
+        self.assertEqual(["ccmpred"], self._detect(matrix))
+
+    def test_detect_format_3(self):
+        pdb = "HEADER    TEST\nATOM      1  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C\nEND\n"
+        self.assertEqual(["pdb"], self._detect(pdb))
+        self.assertEqual(["mmcif"], self._detect("data_1ABC\n#\nloop_\n_atom_site.group_PDB\n"))
+        self.assertEqual([], self._detect("Hello World\n"))
+        self.assertEqual([], self._detect(""))
+
+    def test_detect_format_4(self):
+        f_name = self.tempfile()
+        with open(f_name, "wb") as f_out:
+            np.savez(f_out, dist=np.zeros((2, 2, 37)), omega=np.zeros((2, 2, 25)))
+        self.assertEqual(["rosettanpz", "conkitnpz"], detect_format(f_name))
+        with open(f_name, "wb") as f_out:
+            pickle.dump({"distogram": {}}, f_out, protocol=4)
+        self.assertEqual(["alphafold2"], detect_format(f_name))
+
+    def test_detect_format_5(self):
+        f_name = self.tempfile()
+        with gzip.open(f_name, "wt") as f_out:
+            f_out.write(">seq_1\nGSMFTPK\n" * 10000)
+        self.assertEqual(["fasta", "a3m", "a3m-inserts"], detect_format(f_name))
+        f_handle = io.StringIO("1,2,0.12212\n1,3,0.14004\n")
+        f_handle.seek(2)
+        self.assertEqual([], detect_format(f_handle))
+        self.assertEqual(2, f_handle.tell())
+        f_handle.seek(0)
+        self.assertEqual(["plmdca"], detect_format(f_handle))
+        self.assertEqual(0, f_handle.tell())
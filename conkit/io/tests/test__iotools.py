@@ -3,9 +3,17 @@
 __author__ = "Felix Simkovic"
 __date__ = "21 Nov 2016"
 
+import bz2
+import gzip
+import io
+import lzma
 import os
 import unittest
 
+import numpy as np
+
+from conkit.core.distance import Distance
+from conkit.core.distogram import Distogram
 from conkit.io import _iotools
 from conkit.io.tests.helpers import ParserTestCase
 
@@ -90,6 +98,148 @@ class Test(ParserTestCase):
         with self.assertRaises(ValueError):
             _iotools.open_f_handle(fname, "bar")
 
+    def test_detect_compression_1(self):
+        fname = self.tempfile(content="hello world!")
+        self.assertIsNone(_iotools.detect_compression(fname))
+
+    def test_detect_compression_2(self):
+        for compression, compress in [("gzip", gzip.compress), ("bz2", bz2.compress), ("xz", lzma.compress)]:
+            fname = self.tempfile(content=compress(b"hello world!"), mode="wb")
+            self.assertEqual(compression, _iotools.detect_compression(fname))
+
+    def test_open_f_handle_7(self):
+        for compress in [gzip.compress, bz2.compress, lzma.compress]:
+            fname = self.tempfile(content=compress(b"hello\nworld!\n"), mode="wb")
+            with _iotools.open_f_handle(fname, "r") as fhandle:
+                self.assertEqual(["hello\n", "world!\n"], fhandle.readlines())
+            with _iotools.open_f_handle(fname, "rb") as fhandle:
+                self.assertEqual(b"hello\nworld!\n", fhandle.read())
+                fhandle.seek(0)
+                self.assertEqual(b"hello", fhandle.read(5))
+
+    def test_open_f_handle_8(self):
+        for ext, decompress in [(".gz", gzip.decompress), (".bz2", bz2.decompress), (".xz", lzma.decompress)]:
+            fname = self.tempfile() + ext
+            self.addCleanup(os.remove, fname)
+            with _iotools.open_f_handle(fname, "w") as fhandle:
+                fhandle.write("hello world!")
+            with open(fname, "rb") as f_in:
+                self.assertEqual(b"hello world!", decompress(f_in.read()))
+            with _iotools.open_f_handle(fname, "r") as fhandle:
+                self.assertEqual("hello world!", fhandle.read())
+
+    def test_open_f_handle_9(self):
+        for ext, decompress in [(".gz", gzip.decompress), (".bz2", bz2.decompress), (".xz", lzma.decompress)]:
+            fname = self.tempfile() + ext
+            self.addCleanup(os.remove, fname)
+            with _iotools.open_f_handle(fname, "wb") as fhandle:
+                fhandle.write(b"hello world!")
+                fhandle.seek(0)
+                fhandle.write(b"H")
+            with open(fname, "rb") as f_in:
+                self.assertEqual(b"Hello world!", decompress(f_in.read()))
+
+    def test_BufferedEmitter_1(self):
+        f_handle = io.StringIO()
+        with _iotools.BufferedEmitter(f_handle, buffer_size=10) as emitter:
+            emitter.write("hello\n")
+            self.assertEqual("", f_handle.getvalue())
+            emitter.write("world!\n")
+            self.assertEqual("hello\nworld!\n", f_handle.getvalue())
+            emitter.writelines(["foo\n", "bar\n"])
+            self.assertEqual("hello\nworld!\n", f_handle.getvalue())
+        self.assertEqual("hello\nworld!\nfoo\nbar\n", f_handle.getvalue())
+
+    def test_BufferedEmitter_2(self):
+        f_handle = io.StringIO()
+        records = [(i, i + 5, i / 10.0) for i in range(7)]
+        with _iotools.BufferedEmitter(f_handle) as emitter:
+            emitter.write_records("{} {} {:.6f}\n", iter(records), chunk_size=3)
+        self.assertEqual("".join("{} {} {:.6f}\n".format(*r) for r in records), f_handle.getvalue())
+
+    def test_BufferedEmitter_3(self):
+        f_handle = io.StringIO()
+        records = np.arange(14, dtype=np.float64).reshape(7, 2) / 4
+        with _iotools.BufferedEmitter(f_handle) as emitter:
+            emitter.write_records("{:.2f}\t{:.2f}\n", records, chunk_size=3)
+        self.assertEqual("".join("{:.2f}\t{:.2f}\n".format(*r) for r in records), f_handle.getvalue())
+
+    def test_BufferedEmitter_4(self):
+        f_handle = io.StringIO()
+        with _iotools.BufferedEmitter(f_handle) as emitter:
+            emitter.write_records("{}\n", [])
+            emitter.write_records("{}\n", np.zeros((0, 1)))
+        self.assertEqual("", f_handle.getvalue())
+
+    def test_quantise_probabilities_1(self):
+        probs = np.array([[[0.5, 0.3, 0.2], [0.0, 0.0, 0.0]], [[0.01, 0.01, 0.98], [0.25, 0.25, 0.5]]])
+        encoded, scale = _iotools.quantise_probabilities(probs, "float16")
+        self.assertEqual(np.float16, encoded.dtype)
+        self.assertIsNone(scale)
+        np.testing.assert_allclose(probs, _iotools.dequantise_probabilities(encoded), atol=1e-3)
+        encoded, scale = _iotools.quantise_probabilities(probs, "uint8")
+        self.assertEqual(np.uint8, encoded.dtype)
+        self.assertEqual([[255, 0], [255, 255]], encoded.max(axis=-1).tolist())
+        decoded = _iotools.dequantise_probabilities(encoded, scale)
+        self.assertLessEqual(np.abs(decoded - probs).max(), probs.max(axis=-1).max() / 510)
+        np.testing.assert_allclose([[1, 0], [1, 1]], _iotools.dequantise_probabilities(encoded).sum(axis=-1))
+        with self.assertRaises(ValueError):
+            _iotools.quantise_probabilities(probs, "int32")
+
+    def test_distogram_to_tensor_1(self):
+        distance_bins = ((0, 4), (4, 6), (6, np.inf))
+        distogram = Distogram("1")
+        distogram.add(Distance(1, 3, (0.25, 0.45, 0.3), distance_bins))
+        distogram.add(Distance(2, 2, (0.1, 0.2, 0.7), distance_bins))
+        tensor = _iotools.distogram_to_tensor(distogram, distance_bins, seq_len=4)
+        self.assertEqual((4, 4, 3), tensor.shape)
+        self.assertEqual([0.25, 0.45, 0.3], tensor[0, 2].tolist())
+        self.assertEqual([0.25, 0.45, 0.3], tensor[2, 0].tolist())
+        self.assertEqual([0.1, 0.2, 0.7], tensor[1, 1].tolist())
+        self.assertEqual(3, np.count_nonzero(tensor.any(axis=-1)))
+
+    def test_open_npz_1(self):
+        array = np.arange(60, dtype=np.float32).reshape(5, 4, 3)
+        fortran = np.asfortranarray(np.arange(12).reshape(3, 4))
+        for savez in [np.savez, np.savez_compressed]:
+            f_name = self.tempfile(content=None)
+            with open(f_name, "wb") as f_out:
+                savez(f_out, array=array, fortran=fortran)
+            with open(f_name, "rb") as f_in:
+                self.assertTrue(_iotools.is_npz(f_in))
+                self.assertEqual(0, f_in.tell())
+                members = _iotools.open_npz(f_in)
+                self.assertEqual(["array", "fortran"], sorted(members))
+                self.assertEqual((5, 4, 3), members["array"].shape)
+                self.assertEqual(np.float32, members["array"].dtype)
+                np.testing.assert_array_equal(array[1:3, 2:], members["array"][1:3, 2:])
+                np.testing.assert_array_equal(array[-1], members["array"][-1])
+                np.testing.assert_array_equal(array[::2, 0], members["array"][::2, 0])
+                np.testing.assert_array_equal(fortran[1:], members["fortran"][1:])
+                np.testing.assert_array_equal(fortran, np.asarray(members["fortran"]))
+
+    def test_open_npz_2(self):
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            np.savez(f_out, array=np.arange(10))
+        with open(f_name, "rb") as f_in:
+            member = _iotools.open_npz(f_in, mmap_mode="r")["array"]
+        self.assertEqual([2, 3, 4], member[2:5].tolist())
+        with open(f_name, "rb") as f_in:
+            member = _iotools.open_npz(io.BytesIO(f_in.read()), mmap_mode="r")["array"]
+            self.assertEqual([2, 3, 4], member[2:5].tolist())
+
+    def test_is_npz_1(self):
+        self.assertFalse(_iotools.is_npz(io.BytesIO(b"\x80\x04hello")))
+
+    def test_residue_window_1(self):
+        self.assertEqual((0, 10), _iotools.residue_window(None, 10))
+        self.assertEqual((2, 5), _iotools.residue_window((3, 5), 10))
+        self.assertEqual((9, 10), _iotools.residue_window((10, 10), 10))
+        for window in [(0, 5), (5, 3), (3, 11)]:
+            with self.assertRaises(ValueError):
+                _iotools.residue_window(window, 10)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
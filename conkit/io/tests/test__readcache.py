@@ -0,0 +1,92 @@
+"""Testing facility for conkit.io._readcache"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from conkit import io
+from conkit.core.sequence import Sequence
+from conkit.core.sequencefile import SequenceFile
+from conkit.io._readcache import ReadCache
+from conkit.io.tests.helpers import ParserTestCase
+
+
+class TestReadCache(ParserTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _sequencefile(self, nseq=1):
+        sequencefile = SequenceFile("test")
+        for i in range(nseq):
+            sequencefile.add(Sequence("seq_{}".format(i), "GSMFTPKPPQDSAVIRGGAG"))
+        return sequencefile
+
+    def test_enabled_1(self):
+        self.assertFalse(ReadCache().enabled)
+        self.assertTrue(ReadCache(self.directory).enabled)
+
+    def test_key_1(self):
+        fname = self.tempfile(content=">seq_1\nGSMFTPKPPQDSAVIRGGAG\n")
+        cache = ReadCache(self.directory)
+        key = cache.key(fname, "fasta", {"f_id": "conkit"})
+        self.assertEqual(key, cache.key(fname, "fasta", {"f_id": "conkit"}))
+        self.assertNotEqual(key, cache.key(fname, "a3m", {"f_id": "conkit"}))
+        self.assertNotEqual(key, cache.key(fname, "fasta", {"f_id": "foo"}))
+
+    def test_key_2(self):
+        content = ">seq_1\nGSMFTPKPPQDSAVIRGGAG\n"
+        fname_1 = self.tempfile(content=content)
+        fname_2 = self.tempfile(content=content)
+        cache = ReadCache(self.directory)
+        self.assertNotEqual(cache.key(fname_1, "fasta", {}), cache.key(fname_2, "fasta", {}))
+        cache.hash_content = True
+        self.assertEqual(cache.key(fname_1, "fasta", {}), cache.key(fname_2, "fasta", {}))
+
+    def test_get_put_1(self):
+        cache = ReadCache(self.directory)
+        self.assertIsNone(cache.get("foo"))
+        self.assertTrue(cache.put("foo", self._sequencefile()))
+        hierarchy = cache.get("foo")
+        self.assertIsInstance(hierarchy, SequenceFile)
+        self.assertEqual("test", hierarchy.id)
+        self.assertEqual(["GSMFTPKPPQDSAVIRGGAG"], [s.seq for s in hierarchy])
+
+    def test_get_put_2(self):
+        cache = ReadCache(self.directory)
+        with open(os.path.join(self.directory, "foo.npz"), "w") as f_out:
+            f_out.write("corrupted")
+        self.assertIsNone(cache.get("foo"))
+        self.assertFalse(os.path.isfile(os.path.join(self.directory, "foo.npz")))
+
+    def test_evict_1(self):
+        cache = ReadCache(self.directory)
+        cache.put("foo", self._sequencefile(nseq=10))
+        cache.put("bar", self._sequencefile(nseq=10))
+        past = time.time() - 100
+        os.utime(os.path.join(self.directory, "foo.npz"), (past, past))
+        cache.max_size = os.path.getsize(os.path.join(self.directory, "bar.npz"))
+        cache.evict()
+        self.assertIsNone(cache.get("foo"))
+        self.assertIsNotNone(cache.get("bar"))
+
+    def test_clear_1(self):
+        cache = ReadCache(self.directory)
+        cache.put("foo", self._sequencefile())
+        cache.clear()
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_read_1(self):
+        fname = self.tempfile(content=">seq_1\nGSMFTPKPPQDSAVIRGGAG\n")
+        io.enable_read_cache(self.directory)
+        self.addCleanup(io.disable_read_cache)
+        hierarchy_1 = io.read(fname, "fasta", f_id="test")
+        self.assertEqual(1, len(os.listdir(self.directory)))
+        hierarchy_2 = io.read(fname, "fasta", f_id="test")
+        self.assertIsNot(hierarchy_1, hierarchy_2)
+        self.assertEqual("test", hierarchy_2.id)
+        self.assertEqual([s.seq for s in hierarchy_1], [s.seq for s in hierarchy_2])
+        io.read(fname, "fasta", f_id="foo")
+        self.assertEqual(2, len(os.listdir(self.directory)))
@@ -2,6 +2,7 @@
 
 import numpy as np
 import pickle
+from conkit.core.distance import Distance
 from conkit.core.distancefile import DistanceFile
 from conkit.core.distogram import Distogram
 from conkit.io.alphafold import AlphaFold2Parser
@@ -10,6 +11,23 @@ from conkit.io.tests.helpers import ParserTestCase
 
 class TestAlphaFold2Parser(ParserTestCase):
 
+    def _distogram(self, nbins, distance_bins=None, seq_len=5):
+        np.random.seed(41)
+        if distance_bins is None:
+            distance_bins = ((0, 4),) + tuple((4 + i, 5 + i) for i in range(nbins - 2)) + ((nbins + 2, np.inf),)
+        distogram = Distogram("1")
+        for i in range(1, seq_len + 1):
+            for j in range(i, seq_len + 1):
+                distogram.add(Distance(i, j, tuple(np.random.dirichlet(np.ones(nbins)).tolist()), distance_bins))
+        return distogram
+
+    def _round_trip(self, hierarchy, skip_absent=False, **kwargs):
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            error = AlphaFold2Parser().write(f_out, hierarchy, **kwargs)
+        with open(f_name, "rb") as f_in:
+            return AlphaFold2Parser().read(f_in, skip_absent=skip_absent), error
+
     def test_read_1(self):
         np.random.seed(41)
         prediction = {'distogram': {
@@ -50,3 +68,84 @@ class TestAlphaFold2Parser(ParserTestCase):
         self.assertListEqual(expected_raw_score, [round(contact.raw_score, 2) for contact in distogram])
         self.assertListEqual(expected_bin_score, [round(distance.max_score, 2) for distance in distogram])
         self.assertListEqual(expected_bin_distance, [distance.predicted_distance_bin for distance in distogram])
+
+    def test_write_1(self):
+        distogram = self._distogram(10)
+        distancefile, error = self._round_trip(distogram)
+        self.assertLess(error, 1e-6)
+        self.assertEqual([d.id for d in distogram], [d.id for d in distancefile.top])
+        self.assertEqual([d.distance_bins for d in distogram], [d.distance_bins for d in distancefile.top])
+        for expected, distance in zip(distogram, distancefile.top):
+            np.testing.assert_allclose(expected.distance_scores, distance.distance_scores, atol=1e-6)
+
+    def test_write_2(self):
+        distogram = self._distogram(10)
+        distogram.remove((2, 4))
+        for precision, tolerance in [("float16", 1e-3), ("uint8", 2e-3)]:
+            distancefile, error = self._round_trip(distogram, skip_absent=True, precision=precision)
+            self.assertLess(error, tolerance)
+            self.assertEqual([d.id for d in distogram], [d.id for d in distancefile.top])
+            for expected, distance in zip(distogram, distancefile.top):
+                np.testing.assert_allclose(expected.distance_scores, distance.distance_scores, atol=error + 1e-9)
+            distancefile, _ = self._round_trip(distogram, precision=precision)
+            self.assertEqual(15, len(distancefile.top))
+            self.assertFalse(np.any(np.nan_to_num(distancefile.top[(2, 4)].distance_scores)))
+
+    def test_write_3(self):
+        distancefile = DistanceFile("test")
+        distancefile.original_file_format = "alphafold2"
+        distancefile.add(self._distogram(10))
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            with self.assertRaises(ValueError):
+                AlphaFold2Parser().write(f_out, distancefile, precision="int32")
+            with self.assertRaises(ValueError):
+                AlphaFold2Parser().write(f_out, Distogram("2"))
+        distancefile.add(Distogram("2"))
+        with open(f_name, "wb") as f_out:
+            with self.assertRaises(RuntimeError):
+                AlphaFold2Parser().write(f_out, distancefile)
+
+    def test_read_2(self):
+        distogram = self._distogram(10, seq_len=8)
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            AlphaFold2Parser().write(f_out, distogram, precision="uint8")
+        with open(f_name, "rb") as f_in:
+            distancefile = AlphaFold2Parser().read(f_in, window=(6, 8))
+        self.assertEqual([(6, 6), (6, 7), (6, 8), (7, 7), (7, 8), (8, 8)], [d.id for d in distancefile.top])
+        for distance in distancefile.top:
+            expected = distogram[distance.id]
+            np.testing.assert_allclose(expected.distance_scores, distance.distance_scores, atol=2e-3)
+
+    def test_write_4(self):
+        distogram = self._distogram(10)
+        distance_bins = distogram.top.distance_bins
+        distogram.remove((2, 4))
+        distogram.add(Distance(2, 4, (0.2, 0.3, 0.5), ((0, 6), (6, 10), (10, np.inf))))
+        original = [(d.id, d.distance_bins, d.distance_scores) for d in distogram]
+        expected = distogram.get_distance_scores(distance_bins)
+        distancefile, error = self._round_trip(distogram)
+        self.assertLess(error, 1e-6)
+        self.assertEqual(original, [(d.id, d.distance_bins, d.distance_scores) for d in distogram])
+        expected = dict(zip([d.id for d in distogram], expected))
+        for distance in distancefile.top:
+            self.assertEqual(distance_bins, distance.distance_bins)
+            np.testing.assert_allclose(expected[distance.id], distance.distance_scores, atol=1e-6)
+
+    def test_read_3(self):
+        np.random.seed(41)
+        logits = np.log(np.random.dirichlet(np.ones(10), size=(4, 4)))
+        logits[1, 3] = -np.inf
+        prediction = {"distogram": {"bin_edges": np.arange(4.0, 13.0), "logits": logits}}
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            pickle.dump(prediction, f_out)
+        with open(f_name, "rb") as f_in:
+            distogram = AlphaFold2Parser().read(f_in).top
+        self.assertEqual(10, len(distogram))
+        self.assertTrue(np.isnan(distogram[(2, 4)].distance_scores).all())
+        with open(f_name, "rb") as f_in:
+            distogram = AlphaFold2Parser().read(f_in, skip_absent=True).top
+        self.assertEqual(9, len(distogram))
+        self.assertNotIn((2, 4), [d.id for d in distogram])
@@ -152,3 +152,52 @@ END"""
         self.assertListEqual(expected_raw_score, [contact.raw_score for contact in distogram])
         self.assertListEqual(expected_bin_score, [round(distance.max_score, 3) for distance in distogram])
         self.assertListEqual(expected_bin_distance, [distance.predicted_distance_bin for distance in distogram])
+
+    def test_read_2(self):
+        content = """PFRMAT RR
+RMODE 2
+MODEL 1
+1 8 .72 .345 .225 .15 .15 .1 .03 0 0 0 0
+REMARK 1 8 .72 .345 .225 .15 .15 .1 .03 0 0 0 0
+A 8 .72 .345 .225 .15 .15 .1 .03 0 0 0 0
+1 10 .715 .34 .225 .15 .15 .1 .035 0 0
+31 38 .71 0 .56 .15 .12 .13 .04 0 0 0 0
+END"""
+        f_name = self.tempfile(content=content)
+        with open(f_name, "r") as f_in:
+            distogram = CaspMode2Parser().read(f_in).top
+
+        self.assertEqual([(1, 8), (31, 38)], [(d.res1_seq, d.res2_seq) for d in distogram])
+        self.assertEqual([0.72, 0.71], [d.raw_score for d in distogram])
+        self.assertEqual((0, 0.56, 0.15, 0.12, 0.13, 0.04, 0, 0, 0, 0), distogram.child_list[1].distance_scores)
+        self.assertEqual(distogram.child_list[1], distogram[(31, 38)])
+        self.assertEqual(distogram, distogram.child_list[0].parent)
+        self.assertEqual('X', distogram.child_list[0].res1)
+
+    def test_write_2(self):
+        distancefile = DistanceFile("test")
+        distancefile.original_file_format = 'alphafold2'
+        distogram = Distogram("1")
+        distancefile.add(distogram)
+        distance_bins = ((0, 2), (2, 5), (5, 10), (10, 20), (20, np.inf))
+        distogram.add(Distance(1, 6, (0.1, 0.2, 0.3, 0.2, 0.2), distance_bins))
+        distogram.add(Distance(2, 9, (0.0, 0.1, 0.1, 0.4, 0.4), distance_bins))
+
+        f_name = self.tempfile()
+        with open(f_name, "w") as f_out:
+            CaspMode2Parser().write(f_out, distogram)
+
+        self.assertEqual([distance_bins, distance_bins], [d.distance_bins for d in distogram])
+        self.assertEqual((0.1, 0.2, 0.3, 0.2, 0.2), distogram.child_list[0].distance_scores)
+        with open(f_name, "r") as f_in:
+            output = CaspMode2Parser().read(f_in).top
+        self.assertEqual([(1, 6), (2, 9)], [(d.res1_seq, d.res2_seq) for d in output])
+        self.assertEqual(10, len(output.child_list[0].distance_scores))
+        np.testing.assert_allclose(
+            [
+                (0.1 + 0.2 * 2 / 3, 0.2 / 3 + 0.3 / 5, 0.12, 0.12, 0.04, 0.04, 0.04, 0.04, 0.04, 0.2),
+                (0.1 * 2 / 3, 0.1 / 3 + 0.1 / 5, 0.04, 0.04, 0.08, 0.08, 0.08, 0.08, 0.08, 0.4),
+            ],
+            [d.distance_scores for d in output],
+            atol=1e-6,
+        )
@@ -0,0 +1,153 @@
+"""Testing facility for conkit.io.ConkitNpzParser"""
+
+import os
+
+import numpy as np
+from conkit import io
+from conkit.core.contact import Contact
+from conkit.core.contactfile import ContactFile
+from conkit.core.contactmap import ContactMap
+from conkit.core.distance import Distance
+from conkit.core.distancefile import DistanceFile
+from conkit.core.distogram import Distogram
+from conkit.core.sequence import Sequence
+from conkit.core.sequencefile import SequenceFile
+from conkit.io.conkit_npz import ConkitNpzParser
+from conkit.io.tests.helpers import ParserTestCase
+
+
+class TestConkitNpzParser(ParserTestCase):
+
+    def _round_trip(self, hierarchy, **kwargs):
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            ConkitNpzParser().write(f_out, hierarchy, **kwargs)
+        with open(f_name, "rb") as f_in:
+            return ConkitNpzParser().read(f_in)
+
+    def test_read_write_1(self):
+        contactfile = ContactFile("test")
+        contactfile.author = "1234-5678-9000"
+        contactfile.target = "T0999"
+        contactfile.method = ["Description of methods used"]
+        contactfile.remark = ["Predictor remarks"]
+        contactmap = ContactMap("1")
+        contactmap.sequence = Sequence("seq", "ABCDEFGHIJKLMN")
+        contactfile.add(contactmap)
+        for res1_seq, res2_seq, raw_score in [(1, 9, 0.7), (1, 10, 0.6), (2, 8, 0.5), (3, 12, 0.2)]:
+            contact = Contact(res1_seq, res2_seq, raw_score, distance_bound=(0, 7))
+            contact.res1 = "A"
+            contact.res2_chain = "B"
+            contact.true_positive = True
+            contactmap.add(contact)
+        contactmap.add(Contact(4, 14, 0.1))
+        contactfile.add(ContactMap("2"))
+
+        hierarchy = self._round_trip(contactfile)
+        self.assertIsInstance(hierarchy, ContactFile)
+        self.assertEqual("1234-5678-9000", hierarchy.author)
+        self.assertEqual("T0999", hierarchy.target)
+        self.assertEqual(["Description of methods used"], hierarchy.method)
+        self.assertEqual(["Predictor remarks"], hierarchy.remark)
+        self.assertEqual(["1", "2"], [m.id for m in hierarchy])
+        self.assertTrue(hierarchy["2"].empty)
+        self.assertEqual("ABCDEFGHIJKLMN", hierarchy.top_map.sequence.seq)
+        self.assertEqual([(1, 9), (1, 10), (2, 8), (3, 12), (4, 14)], [c.id for c in hierarchy.top_map])
+        self.assertEqual([0.7, 0.6, 0.5, 0.2, 0.1], [c.raw_score for c in hierarchy.top_map])
+        self.assertEqual([(0.0, 7.0)] * 4 + [(0.0, 8.0)], [c.distance_bound for c in hierarchy.top_map])
+        self.assertEqual(["A", "A", "A", "A", "X"], [c.res1 for c in hierarchy.top_map])
+        self.assertEqual(["B", "B", "B", "B", ""], [c.res2_chain for c in hierarchy.top_map])
+        self.assertEqual([1, 1, 1, 1, 0], [c.status for c in hierarchy.top_map])
+        self.assertIs(hierarchy.top_map, hierarchy.top_map[(1, 9)].parent)
+
+    def test_read_write_2(self):
+        distance_bins = ((0, 4), (4, 6), (6, 8), (8, np.inf))
+        distancefile = DistanceFile("test")
+        distancefile.original_file_format = "caspmode2"
+        distogram = Distogram("1")
+        distancefile.add(distogram)
+        distogram.add(Distance(1, 25, (0.25, 0.45, 0.25, 0.05), distance_bins))
+        distogram.add(Distance(7, 19, (0.15, 0.15, 0.60, 0.1), distance_bins, raw_score=0.9))
+
+        hierarchy = self._round_trip(distancefile, compress=True)
+        self.assertIsInstance(hierarchy, DistanceFile)
+        self.assertEqual("caspmode2", hierarchy.original_file_format)
+        self.assertIsInstance(hierarchy.top, Distogram)
+        self.assertEqual("caspmode2", hierarchy.top.original_file_format)
+        self.assertEqual([(1, 25), (7, 19)], [d.id for d in hierarchy.top])
+        self.assertEqual([0.95, 0.9], [d.raw_score for d in hierarchy.top])
+        self.assertEqual([(0.25, 0.45, 0.25, 0.05), (0.15, 0.15, 0.60, 0.1)],
+                         [d.distance_scores for d in hierarchy.top])
+        self.assertEqual([distance_bins, distance_bins], [d.distance_bins for d in hierarchy.top])
+        self.assertEqual([(4, 6), (6, 8)], [d.predicted_distance_bin for d in hierarchy.top])
+        self.assertTrue(hierarchy.top.canonical)
+
+        distogram.add(Distance(19, 2, (0.15, 0.15, 0.60, 0.1), distance_bins))
+        hierarchy = self._round_trip(distancefile)
+        self.assertFalse(hierarchy.top.canonical)
+
+    def test_read_write_3(self):
+        sequencefile = SequenceFile("test")
+        sequencefile.remark = "Alignment remark"
+        sequence = Sequence("seq_1", "GSMFTPKPPQDSAVI--AG")
+        sequence.remark = "Sequence remark"
+        sequencefile.add(sequence)
+        sequencefile.add(Sequence("seq_2", "GSMFTPKPPQDSAVIGGGAG"))
+
+        hierarchy = self._round_trip(sequencefile)
+        self.assertIsInstance(hierarchy, SequenceFile)
+        self.assertEqual(["Alignment remark"], hierarchy.remark)
+        self.assertEqual(["seq_1", "seq_2"], [s.id for s in hierarchy])
+        self.assertEqual(["GSMFTPKPPQDSAVI--AG", "GSMFTPKPPQDSAVIGGGAG"], [s.seq for s in hierarchy])
+        self.assertEqual([["Sequence remark"], []], [s.remark for s in hierarchy])
+        self.assertEqual(20, hierarchy["seq_2"].seq_len)
+
+    def test_read_write_4(self):
+        distancefile = DistanceFile("pdb_0")
+        distancefile.original_file_format = "pdb"
+        distogram = Distogram("AB")
+        distancefile.add(distogram)
+        distogram.add(Distance(1, 5, (1,), ((4.5, 4.5),), 0.955, (0, 8)))
+        distogram.add(Distance(1, 6, (1,), ((9.25, 9.25),), 0, (0, 8)))
+        distancefile.add(Distogram("A"))
+
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            ConkitNpzParser().write(f_out, distancefile)
+        with open(f_name, "rb") as f_in:
+            hierarchy = ConkitNpzParser().read(f_in, f_id=None)
+        self.assertEqual("pdb_0", hierarchy.id)
+        self.assertEqual(["AB", "A"], [m.id for m in hierarchy])
+        self.assertEqual("pdb", hierarchy.top.original_file_format)
+        self.assertEqual([((4.5, 4.5),), ((9.25, 9.25),)], [d.distance_bins for d in hierarchy.top])
+        self.assertEqual([4.5, 9.25], [d.predicted_distance for d in hierarchy.top])
+
+    def test_read_write_5(self):
+        contactmap = ContactMap("1")
+        for res1_seq, res2_seq, raw_score in [(1, 9, 0.7), (1, 10, 0.6), (2, 8, 0.5)]:
+            contactmap.add(Contact(res1_seq, res2_seq, raw_score))
+        f_name = self.tempfile(content=None) + ".gz"
+        self.addCleanup(os.remove, f_name)
+        io.write(f_name, "conkitnpz", contactmap)
+        hierarchy = io.read(f_name, "conkitnpz")
+        self.assertEqual([(1, 9), (1, 10), (2, 8)], [c.id for c in hierarchy.top_map])
+        self.assertEqual([0.7, 0.6, 0.5], [c.raw_score for c in hierarchy.top_map])
+
+    def test_write_1(self):
+        distance_bins_1 = ((0, 4), (4, 6), (6, np.inf))
+        distance_bins_2 = ((0, 4), (4, np.inf))
+        distogram = Distogram("1")
+        distogram.add(Distance(1, 25, (0.25, 0.45, 0.3), distance_bins_1))
+        distogram.add(Distance(7, 19, (0.15, 0.85), distance_bins_2))
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            with self.assertRaises(ValueError):
+                ConkitNpzParser().write(f_out, distogram)
+
+    def test_read_1(self):
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            np.savez(f_out, dist=np.zeros((2, 2)))
+        with open(f_name, "rb") as f_in:
+            with self.assertRaises(ValueError):
+                ConkitNpzParser().read(f_in)
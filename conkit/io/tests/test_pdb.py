@@ -3,10 +3,13 @@
 __author__ = "Felix Simkovic"
 __date__ = "26 Oct 2016"
 
+import numpy as np
 import os
 import unittest
+from Bio.PDB import PDBParser
 
-from conkit.io.pdb import PdbParser
+from conkit.core.distancefile import DistanceFile
+from conkit.io.pdb import MmCifParser, ModelEnsemble, PdbParser
 from conkit.io.tests.helpers import ParserTestCase
 
 
@@ -126,20 +129,19 @@ END
         contact_map1 = contact_file["A"]  # chain A
         contact_map2 = contact_file["B"]  # chain B
         contact_map3 = contact_file["AB"]  # chain AB
-        contact_map4 = contact_file["BA"]  # chain BA
-        self.assertEqual(4, len(contact_file))
+        self.assertEqual(3, len(contact_file))
+        self.assertEqual(["A", "AB", "B"], [m.id for m in contact_file])
         self.assertEqual(1, len(contact_map1))
         self.assertEqual(["A", "A"], [contact_map1.top_contact.res1_chain, contact_map1.top_contact.res2_chain])
         self.assertEqual([36, 86], [contact_map1.top_contact.res1_seq, contact_map1.top_contact.res2_seq])
         self.assertEqual(1, len(contact_map2))
         self.assertEqual(["B", "B"], [contact_map2.top_contact.res1_chain, contact_map2.top_contact.res2_chain])
         self.assertEqual([171, 208], [contact_map2.top_contact.res1_seq, contact_map2.top_contact.res2_seq])
-        self.assertEqual(4, len(contact_map3))
+        self.assertEqual(1, len(contact_map3))
         self.assertEqual(["A", "B"], [contact_map3.top_contact.res1_chain, contact_map3.top_contact.res2_chain])
-        self.assertEqual([36, 171], [contact_map3.top_contact.res1_seq, contact_map3.top_contact.res2_seq])
-        self.assertEqual(4, len(contact_map4))
-        self.assertEqual(["B", "A"], [contact_map4.top_contact.res1_chain, contact_map4.top_contact.res2_chain])
-        self.assertEqual([171, 36], [contact_map4.top_contact.res1_seq, contact_map4.top_contact.res2_seq])
+        self.assertEqual([86, 208], [contact_map3.top_contact.res1_seq, contact_map3.top_contact.res2_seq])
+        self.assertTrue(contact_map3.top_contact.true_positive)
+        self.assertNotIn("BA", contact_file)
 
     def test_read_5(self):
         content = """ATOM      1  N   TYR A  36      39.107  51.628   3.103  0.50 43.13           N
@@ -169,6 +171,235 @@ END
         self.assertEqual([36, 36, 36, 86, 86, 171], [c.res1_seq for c in contact_map1 if c.true_positive])
         self.assertEqual([86, 171, 208, 171, 208, 208], [c.res2_seq for c in contact_map1 if c.true_positive])
 
+    def test_read_6(self):
+        content = """MODEL        1
+ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  PHE A  86      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  PHE A  86      32.977  47.392   3.090  1.00 25.35           C
+ATOM      5  CA  TRP A 171      23.458  36.846   0.143  1.00 20.46           C
+ATOM      6  CB  TRP A 171      23.647  37.866   1.275  1.00 18.83           C
+ENDMDL
+MODEL        2
+ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  PHE A  86      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  PHE A  86      30.977  49.392   2.090  1.00 25.35           C
+ATOM      5  CA  TRP A 171      23.458  36.846   0.143  1.00 20.46           C
+ATOM      6  CB  TRP A 171      31.647  46.866   2.275  1.00 18.83           C
+ENDMDL
+MODEL        3
+ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  PHE A  86      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  PHE A  86      52.977  67.392  23.090  1.00 25.35           C
+ENDMDL
+END
+"""
+        f_name = self.tempfile(content=content)
+        with open(f_name, "r") as f_in:
+            ensemble = PdbParser().read(f_in, distance_cutoff=8, atom_type="CB", models="all", nthreads=2)
+        self.assertIsInstance(ensemble, ModelEnsemble)
+        self.assertEqual([0, 1, 2], ensemble.model_ids)
+        self.assertEqual(3, len(ensemble))
+        self.assertIsInstance(ensemble[0], DistanceFile)
+        self.assertIs(ensemble[0], ensemble[0])
+        self.assertEqual(["pdb_0", "pdb_1", "pdb_2"], [h.id for h in ensemble])
+        self.assertEqual([3, 3, 1], [len(h.top_map) for h in ensemble])
+        self.assertEqual([(36, 86)], [c.id for c in ensemble[0].top_map if c.true_positive])
+        self.assertEqual([(36, 86), (36, 171), (86, 171)], [c.id for c in ensemble[1].top_map if c.true_positive])
+        self.assertEqual([], [c.id for c in ensemble[2].top_map if c.true_positive])
+        self.assertEqual(["YFW", "YFW", "YF"], [h.top_map.sequence.seq for h in ensemble])
+
+    def test_read_7(self):
+        content = """MODEL        1
+ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  PHE A  86      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  PHE A  86      32.977  47.392   3.090  1.00 25.35           C
+ATOM      5  CA  TRP A 171      23.458  36.846   0.143  1.00 20.46           C
+ATOM      6  CB  TRP A 171      23.647  37.866   1.275  1.00 18.83           C
+ENDMDL
+MODEL        2
+ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  PHE A  86      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  PHE A  86      30.977  49.392   2.090  1.00 25.35           C
+ATOM      5  CA  TRP A 171      23.458  36.846   0.143  1.00 20.46           C
+ATOM      6  CB  TRP A 171      31.647  46.866   2.275  1.00 18.83           C
+ENDMDL
+MODEL        3
+ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  PHE A  86      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  PHE A  86      52.977  67.392  23.090  1.00 25.35           C
+ENDMDL
+END
+"""
+        f_name = self.tempfile(content=content)
+        with open(f_name, "r") as f_in:
+            ensemble = PdbParser().read(f_in, models=[1])
+        self.assertEqual([1], ensemble.model_ids)
+        self.assertEqual("pdb_1", ensemble[-1].id)
+        with open(f_name, "r") as f_in:
+            with self.assertRaises(ValueError):
+                PdbParser().read(f_in, models=[1, 5])
+        with open(f_name, "r") as f_in:
+            with self.assertWarns(FutureWarning):
+                distancefile = PdbParser().read(f_in)
+        self.assertEqual("pdb_0", distancefile.id)
+
+    def test_read_8(self):
+        content = """HEADER    TEST
+ATOM      1  N   ALA A   1      39.107  51.628   3.103  1.00 43.13           N
+ATOM      2  CB  ALA A   1      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  GLY A   2      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB ASER A   3      33.977  47.392   3.090  0.50 25.35           C
+ATOM      5  CB BSER A   3      32.977  47.392   3.090  0.50 25.35           C
+ATOM      6  CB  LEU A   4      31.647  43.866   1.275  1.00 18.83           C
+ATOM      7  CB  LEU A   4      11.647  13.866   1.275  1.00 18.83           C
+ATOM      8  CA  TRP A   5      29.458  40.846   0.143  1.00 20.46           C
+HETATM    9  CB  MSE A   6      28.726  43.102  -3.518  1.00 19.90           C
+HETATM   10  O   HOH A 101      30.726  44.102  -3.518  1.00 19.90           O
+ATOM     11  CB  PHE B   1      33.221  42.624  -5.829  1.00 19.96           C
+ATOM     12  CB  PHE A   7      30.905  43.710  -4.909  1.00 20.31           C
+END
+"""
+        f_name = self.tempfile(content=content)
+        hierarchies = []
+        for fast in (True, False):
+            with open(f_name, "r") as f_in:
+                hierarchies.append(PdbParser().read(f_in, distance_cutoff=8, atom_type="CB", fast=fast))
+        for distancefile in hierarchies:
+            self.assertEqual(["A", "AB"], [m.id for m in distancefile])
+            self.assertEqual("AGSLWMF", distancefile["A"].sequence.seq)
+            self.assertEqual(
+                [(1, 2), (1, 4), (1, 6), (1, 7), (2, 4), (2, 6), (2, 7), (4, 6), (4, 7), (6, 7)],
+                [c.id for c in distancefile["A"]],
+            )
+            self.assertEqual([(4, 7), (6, 7)], [(c.res1_altseq, c.res2_altseq) for c in distancefile["A"]][-2:])
+        self.assertEqual(
+            [[(c.id, c.raw_score, c.res1_altseq, c.res2_altseq) for c in m] for m in hierarchies[0]],
+            [[(c.id, c.raw_score, c.res1_altseq, c.res2_altseq) for c in m] for m in hierarchies[1]],
+        )
+
+    def test_read_9(self):
+        content = """ATOM      1  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      2  CB  PHE A  86      32.977  47.392   3.090  0.50 25.35           C
+ATOM      3  CB  LEU A  86      32.977  47.392   3.090  0.50 25.35           C
+ATOM      4  CB  TRP A 171      23.647  37.866   1.275  1.00 18.83           C
+END
+"""
+        f_name = self.tempfile(content=content)
+        with open(f_name, "r") as f_in:
+            distancefile = PdbParser().read(f_in, distance_cutoff=8, atom_type="CB")
+        self.assertEqual([(36, 86), (36, 171), (86, 171)], [c.id for c in distancefile.top_map])
+        self.assertEqual("YFW", distancefile.top_map.sequence.seq)
+
+    def test_read_10(self):
+        content = """data_test
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_alt_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.label_entity_id
+_atom_site.label_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+_atom_site.occupancy
+_atom_site.B_iso_or_equiv
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+_atom_site.pdbx_PDB_model_num
+ATOM   1 C "CA" . TYR A 1 36  ? 38.300 50.814 2.204 1.00 41.80 36  A 1
+ATOM   2 C CB   . TYR A 1 36  ? 37.586 51.694 1.175 1.00 41.61 36  A 1
+ATOM   3 C CB   A PHE A 1 86  ? 33.977 47.392 3.090 0.50 25.35 86  A 1
+ATOM   4 C CB   B PHE A 1 86  ? 32.977 47.392 3.090 0.50 25.35 86  A 1
+ATOM   5 C CA   . GLY A 1 171 ? 23.458 36.846 0.143 1.00 20.46 171 A 1
+ATOM   6 C CB   . PHE A 1 208 ? 31.726 43.102 -3.518 1.00 19.90 208 A 1
+HETATM 7 O O    . HOH B 2 .   ? 30.726 44.102 -3.518 1.00 19.90 301 A 1
+#
+"""
+        f_name = self.tempfile(content=content)
+        hierarchies = []
+        for fast in (True, False):
+            with open(f_name, "r") as f_in:
+                hierarchies.append(MmCifParser().read(f_in, distance_cutoff=8, atom_type="CB", fast=fast))
+        for distancefile in hierarchies:
+            self.assertEqual("mmcif_0", distancefile.id)
+            self.assertEqual("YFGF", distancefile.top_map.sequence.seq)
+            self.assertEqual([(36, 171), (36, 208), (171, 208)], [c.id for c in distancefile.top_map])
+        self.assertEqual(
+            [c.raw_score for c in hierarchies[0].top_map], [c.raw_score for c in hierarchies[1].top_map]
+        )
+
+    def test_read_11(self):
+        content = """ATOM      1  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      2  CB  PHE A  86      32.977  47.392   3.090  1.00 25.35           C
+TER
+ATOM      3  CB  TRP B 171      83.647  97.866   1.275  1.00 18.83           C
+ATOM      4  CB  PHE B 208      81.726  93.102  -3.518  1.00 19.90           C
+TER
+ATOM      5  CB  TRP C 171      33.647  47.866   1.275  1.00 18.83           C
+ATOM      6  CB  PHE C 208      81.726  93.102   3.518  1.00 19.90           C
+END
+"""
+        f_name = self.tempfile(content=content)
+        with open(f_name, "r") as f_in:
+            distancefile = PdbParser().read(f_in, distance_cutoff=8, atom_type="CB", nthreads=2)
+        self.assertEqual(["A", "AC", "B", "BC", "C"], [m.id for m in distancefile])
+        self.assertTrue(all(distancefile[chain].canonical for chain in ["A", "B", "C"]))
+        self.assertEqual([(36, 171), (86, 171)], [c.id for c in distancefile["AC"]])
+        self.assertEqual([(171, 208), (208, 208)], [c.id for c in distancefile["BC"]])
+        with open(f_name, "r") as f_in:
+            distancefile = PdbParser().read(f_in, distance_cutoff=0, atom_type="CB")
+        self.assertEqual(["A", "AB", "AC", "B", "BC", "C"], [m.id for m in distancefile])
+        self.assertEqual(4, len(distancefile["AB"]))
+
+    def test_read_coordinates_1(self):
+        content = """ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  GLY A  37      32.670  48.303   4.288  1.00 26.45           C
+TER
+ATOM      4  CB  TRP B 171      83.647  97.866   1.275  1.00 18.83           C
+END
+"""
+        f_name = self.tempfile(content=content)
+        for fast in (True, False):
+            with open(f_name, "r") as f_in:
+                chains = PdbParser().read_coordinates(f_in, atom_type="CB", fast=fast)
+            self.assertEqual(["A", "B"], [chain_id for chain_id, _, _ in chains])
+            self.assertEqual([36, 37], chains[0][1].tolist())
+            np.testing.assert_allclose([[37.586, 51.694, 1.175], [32.670, 48.303, 4.288]], chains[0][2], atol=1e-5)
+            self.assertEqual([171], chains[1][1].tolist())
+
+    def test_read_structure_1(self):
+        content = """ATOM      1  CA  TYR A  36      38.300  50.814   2.204  1.00 41.80           C
+ATOM      2  CB  TYR A  36      37.586  51.694   1.175  1.00 41.61           C
+ATOM      3  CA  GLY A  37      32.670  48.303   4.288  1.00 26.45           C
+ATOM      4  CB  TRP A  38      33.647  47.866   1.275  1.00 18.83           C
+ATOM      5  CB  LEU A  39      53.647  37.866   1.275  1.00 18.83           C
+END
+"""
+        f_name = self.tempfile(content=content)
+        with open(f_name, "r") as f_in:
+            expected = PdbParser().read(f_in, distance_cutoff=8)
+        structure = PDBParser(QUIET=True).get_structure("test", f_name)
+        distancefile = PdbParser().read_structure(structure, distance_cutoff=8)
+        self.assertEqual("test_0", distancefile.id)
+        self.assertEqual("pdb", distancefile.top.original_file_format)
+        self.assertEqual(
+            [(d.id, d.distance_scores, d.distance_bins, d.raw_score) for d in expected.top],
+            [(d.id, d.distance_scores, d.distance_bins, d.raw_score) for d in distancefile.top],
+        )
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -2,14 +2,32 @@
 
 import numpy as np
 import pickle
+from conkit.core.distance import Distance
 from conkit.core.distancefile import DistanceFile
 from conkit.core.distogram import Distogram
-from conkit.io.rosetta_npz import RosettaNpzParser
+from conkit.io.rosetta_npz import DISTANCE_BINS, RosettaNpzParser
 from conkit.io.tests.helpers import ParserTestCase
 
 
 class TestRosettaNpzParser(ParserTestCase):
 
+    def _distogram(self, nbins, distance_bins=None, seq_len=5):
+        np.random.seed(41)
+        if distance_bins is None:
+            distance_bins = ((0, 4),) + tuple((4 + i, 5 + i) for i in range(nbins - 2)) + ((nbins + 2, np.inf),)
+        distogram = Distogram("1")
+        for i in range(1, seq_len + 1):
+            for j in range(i, seq_len + 1):
+                distogram.add(Distance(i, j, tuple(np.random.dirichlet(np.ones(nbins)).tolist()), distance_bins))
+        return distogram
+
+    def _round_trip(self, hierarchy, skip_absent=False, **kwargs):
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            error = RosettaNpzParser().write(f_out, hierarchy, **kwargs)
+        with open(f_name, "rb") as f_in:
+            return RosettaNpzParser().read(f_in, skip_absent=skip_absent), error
+
     def test_read_1(self):
         np.random.seed(41)
         prediction = {
@@ -50,3 +68,72 @@ class TestRosettaNpzParser(ParserTestCase):
         self.assertListEqual(expected_raw_score, [contact.raw_score for contact in distogram])
         self.assertListEqual(expected_bin_score, [distance.max_score for distance in distogram])
         self.assertListEqual(expected_bin_distance, [distance.predicted_distance_bin for distance in distogram])
+
+    def test_write_1(self):
+        distogram = self._distogram(37, distance_bins=DISTANCE_BINS)
+        distancefile, error = self._round_trip(distogram)
+        self.assertLess(error, 1e-6)
+        self.assertEqual([d.id for d in distogram], [d.id for d in distancefile.top])
+        for expected, distance in zip(distogram, distancefile.top):
+            self.assertEqual(DISTANCE_BINS, distance.distance_bins)
+            np.testing.assert_allclose(expected.distance_scores, distance.distance_scores, atol=1e-6)
+
+    def test_write_2(self):
+        distogram = self._distogram(10)
+        distogram.remove((2, 4))
+        distance_bins = [d.distance_bins for d in distogram]
+        distance_scores = [d.distance_scores for d in distogram]
+        expected = distogram.get_distance_scores(DISTANCE_BINS)
+        for precision, compress in [("float16", False), ("uint8", True)]:
+            distancefile, error = self._round_trip(distogram, skip_absent=True, precision=precision, compress=compress)
+            self.assertLess(error, 2e-3)
+            self.assertEqual([d.id for d in distogram], [d.id for d in distancefile.top])
+            self.assertEqual(distance_bins, [d.distance_bins for d in distogram])
+            self.assertEqual(distance_scores, [d.distance_scores for d in distogram])
+            for scores, distance in zip(expected, distancefile.top):
+                self.assertEqual(DISTANCE_BINS, distance.distance_bins)
+                np.testing.assert_allclose(scores, distance.distance_scores, atol=error + 1e-9)
+
+    def test_write_3(self):
+        distancefile = DistanceFile("test")
+        distancefile.original_file_format = "rosettanpz"
+        distancefile.add(self._distogram(37))
+        distancefile.add(Distogram("2"))
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            with self.assertRaises(RuntimeError):
+                RosettaNpzParser().write(f_out, distancefile)
+
+    def test_read_2(self):
+        np.random.seed(41)
+        dist = np.random.dirichlet(np.ones(37), size=(8, 8))
+        for savez in [np.savez, np.savez_compressed]:
+            f_name = self.tempfile(content=None)
+            with open(f_name, "wb") as f_out:
+                savez(f_out, dist=dist)
+            with open(f_name, "rb") as f_in:
+                distancefile = RosettaNpzParser().read(f_in, window=(3, 5))
+            distogram = distancefile.top
+            self.assertEqual([(3, 3), (3, 4), (3, 5), (4, 4), (4, 5), (5, 5)], [d.id for d in distogram])
+            for distance in distogram:
+                expected = dist[distance.res1_seq - 1, distance.res2_seq - 1]
+                self.assertEqual(expected[[x for x in range(1, 37)] + [0]].tolist(), list(distance.distance_scores))
+            with open(f_name, "rb") as f_in:
+                with self.assertRaises(ValueError):
+                    RosettaNpzParser().read(f_in, window=(3, 9))
+
+    def test_read_3(self):
+        np.random.seed(41)
+        dist = np.random.dirichlet(np.ones(37), size=(4, 4))
+        dist[1, 3] = 0
+        f_name = self.tempfile(content=None)
+        with open(f_name, "wb") as f_out:
+            np.savez(f_out, dist=dist)
+        with open(f_name, "rb") as f_in:
+            distogram = RosettaNpzParser().read(f_in).top
+        self.assertEqual(10, len(distogram))
+        self.assertEqual((0.0,) * 37, distogram[(2, 4)].distance_scores)
+        with open(f_name, "rb") as f_in:
+            distogram = RosettaNpzParser().read(f_in, skip_absent=True).top
+        self.assertEqual(9, len(distogram))
+        self.assertNotIn((2, 4), [d.id for d in distogram])
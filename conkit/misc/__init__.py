@@ -32,6 +32,7 @@ __author__ = "Felix Simkovic"
 __date__ = "18 May 2018"
 __version__ = "2.0"
 
+import functools
 import os
 import joblib
 import numpy as np
@@ -47,7 +48,24 @@ ALL_VALIDATION_FEATURES = ['RESNUM', 'WRMSD_SMOOTH', 'ACCURACY', 'FN', 'FNR', 'F
                            'ZSCORE_FNR', 'ZSCORE_FP', 'ZSCORE_FPR', 'ZSCORE_SENSITIVITY', 'ZSCORE_SPECIFICITY']
 
 
+@functools.lru_cache(maxsize=None)
 def load_validation_model():
+    """Load the trained classifier and feature scaler used for model validation
+
+    The pickle files are only read on the first call, subsequent calls in the same process return the same
+    instances.
+
+    Returns
+    -------
+    tuple
+       The :obj:`sklearn.svm.SVC` classifier and the :obj:`sklearn.preprocessing.StandardScaler` scaler
+
+    Raises
+    ------
+    :exc:`FileNotFoundError`
+       The classifier or scaler pickle file cannot be found
+
+    """
     if not os.path.isfile(TRAINED_CLASSIFIER_PICKLE):
         raise FileNotFoundError('Cannot find classifier pickle file {}'.format(TRAINED_CLASSIFIER_PICKLE))
     if not os.path.isfile(STANDARD_SCALER_PICKLE):
@@ -27,7 +27,13 @@
 # CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-"""A collection of bandwidth estimators for Kernel Density Estimation"""
+"""A collection of bandwidth estimators for Kernel Density Estimation
+
+All estimators accept the data points either in full or binned, i.e. the distinct values of one-dimensional
+data together with the number of data points for each value as ``weights``. Binned data give the same bandwidth
+at a cost depending on the number of bins rather than the number of data points.
+
+"""
 
 from __future__ import division
 from __future__ import print_function
@@ -38,6 +44,7 @@ __version__ = "1.0.1"
 
 import abc
 import numpy as np
+import scipy.signal
 
 ABC = abc.ABCMeta("ABC", (object,), {})
 
@@ -64,24 +71,38 @@ class AmiseBW(BandwidthBase):
 
     """
 
-    def __init__(self, data, niterations=25, eps=1e-3):
+    def __init__(self, data, niterations=25, eps=1e-3, weights=None):
         """Instantiate a new bandwith calculator"""
         self._data = np.asarray(data)
         self._niterations = niterations
         self._eps = eps
+        self._weights = weights
 
     @property
     def bandwidth(self):
-        from conkit.misc.ext.c_bandwidth import c_optimize_bandwidth
+        if self._weights is None:
+            from conkit.misc.ext.c_bandwidth import c_optimize_bandwidth
+
+            data = self._data
+
+            def optimize(v):
+                return c_optimize_bandwidth(data, v)
+        else:
+            from conkit.misc.ext.c_bandwidth import c_optimize_bandwidth_binned
+
+            values, weights = _binned(self._data, self._weights)
+            values = values.astype(np.float64)
+
+            def optimize(v):
+                return c_optimize_bandwidth_binned(values, weights, v)
 
-        data = self._data
-        x0 = BowmanBW(data).bandwidth
-        y0 = c_optimize_bandwidth(data, x0)
+        x0 = BowmanBW(self._data, weights=self._weights).bandwidth
+        y0 = optimize(x0)
         x = 0.8 * x0
-        y = c_optimize_bandwidth(data, x)
+        y = optimize(x)
         for _ in range(self._niterations):
             x -= y * (x0 - x) / (y0 - y)
-            y = c_optimize_bandwidth(data, x)
+            y = optimize(x)
             if abs(y) < (self._eps * y0):
                 break
         return x
@@ -98,15 +119,21 @@ class BowmanBW(BandwidthBase):
 
     """
 
-    def __init__(self, data):
+    def __init__(self, data, weights=None):
         """Instantiate a new bandwith calculator"""
         self._data = np.asarray(data)
+        self._weights = weights
 
     @property
     def bandwidth(self):
-        data = self._data
-        M, N = data.shape
-        return np.sqrt((data ** 2).sum() / M - (data.sum() / M) ** 2) * ((((N + 2) * M) / 4.0) ** (-1.0 / (N + 4)))
+        if self._weights is None:
+            data = self._data
+            M, N = data.shape
+            return np.sqrt((data ** 2).sum() / M - (data.sum() / M) ** 2) * ((((N + 2) * M) / 4.0) ** (-1.0 / (N + 4)))
+        values, weights = _binned(self._data, self._weights)
+        M, N = weights.sum(), 1
+        return np.sqrt((weights * values ** 2).sum() / M - ((weights * values).sum() / M) ** 2) * (
+            (((N + 2) * M) / 4.0) ** (-1.0 / (N + 4)))
 
 
 class LinearBW(BandwidthBase):
@@ -120,13 +147,17 @@ class LinearBW(BandwidthBase):
 
     """
 
-    def __init__(self, data, threshold=15):
+    def __init__(self, data, threshold=15, weights=None):
         self._data = np.asarray(data)
         self._threshold = threshold
+        self._weights = weights
 
     @property
     def bandwidth(self):
-        return float(self._data.max() / self._threshold)
+        if self._weights is None:
+            return float(self._data.max() / self._threshold)
+        values, _ = _binned(self._data, self._weights)
+        return float(values.max() / self._threshold)
 
 
 class ScottBW(BandwidthBase):
@@ -140,15 +171,14 @@ class ScottBW(BandwidthBase):
 
     """
 
-    def __init__(self, data):
+    def __init__(self, data, weights=None):
         """Instantiate a new bandwith calculator"""
         self._data = np.asarray(data)
+        self._weights = weights
 
     @property
     def bandwidth(self):
-        data = self._data
-        M, N = data.shape
-        sigma = np.minimum(np.std(data, axis=0, ddof=1), (np.percentile(data, 75) - np.percentile(data, 25)) / 1.349)[0]
+        M, N, sigma = _sigma(self._data, self._weights)
         return 1.059 * sigma * M ** (-1.0 / (N + 4))
 
 
@@ -163,16 +193,76 @@ class SilvermanBW(BandwidthBase):
 
     """
 
-    def __init__(self, data):
+    def __init__(self, data, weights=None):
         """Instantiate a new bandwith calculator"""
         self._data = np.asarray(data)
+        self._weights = weights
 
     @property
     def bandwidth(self):
-        data = self._data
+        M, N, sigma = _sigma(self._data, self._weights)
+        return 0.9 * sigma * (M * (N + 2) / 4.0) ** (-1.0 / (N + 4))
+
+
+def _binned(data, weights):
+    """Flatten binned one-dimensional data and keep the bins with at least one data point"""
+    values = np.asarray(data).ravel()
+    weights = np.asarray(weights, dtype=np.float64).ravel()
+    if values.shape != weights.shape:
+        raise ValueError("Binned data require one weight per value")
+    keep = weights > 0
+    return values[keep], weights[keep]
+
+
+def _weighted_percentile(values, weights, q):
+    """Percentile of binned data, identical to :func:`numpy.percentile` of the data points with linear interpolation"""
+    order = np.argsort(values, kind="stable")
+    values, cumulative = values[order], np.cumsum(weights[order])
+    position = q / 100.0 * (cumulative[-1] - 1)
+    lower = np.floor(position)
+    value_lower = values[np.searchsorted(cumulative, lower, side="right")]
+    value_upper = values[np.searchsorted(cumulative, min(lower + 1, cumulative[-1] - 1), side="right")]
+    return value_lower + (position - lower) * (value_upper - value_lower)
+
+
+def _sigma(data, weights):
+    """The number of data points and dimensions, and the smaller of the standard deviation or normalized IQR"""
+    if weights is None:
         M, N = data.shape
         sigma = np.minimum(np.std(data, axis=0, ddof=1), (np.percentile(data, 75) - np.percentile(data, 25)) / 1.349)[0]
-        return 0.9 * sigma * (M * (N + 2) / 4.0) ** (-1.0 / (N + 4))
+        return M, N, sigma
+    values, weights = _binned(data, weights)
+    M = weights.sum()
+    mean = (weights * values).sum() / M
+    std = np.sqrt((weights * (values - mean) ** 2).sum() / (M - 1))
+    iqr = _weighted_percentile(values, weights, 75) - _weighted_percentile(values, weights, 25)
+    return M, 1, min(std, iqr / 1.349)
+
+
+def binned_kde(counts, bandwidth):
+    """Gaussian kernel density estimate of binned data evaluated at the bins
+
+    The bins are of unit width, so that the estimate at each bin equals that of a Gaussian kernel density estimate
+    fitted on all data points. The kernel is applied to all bins at once with an FFT convolution.
+
+    Parameters
+    ----------
+    counts : :obj:`numpy.ndarray`
+       The number of data points in each bin
+    bandwidth : float
+       The bandwidth of the Gaussian kernel
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       The density estimate at each bin
+
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    offsets = np.arange(-(counts.shape[0] - 1), counts.shape[0], dtype=np.float64)
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = scipy.signal.fftconvolve(counts, kernel, mode="same") / counts.sum()
+    return np.clip(density, 0.0, None)
 
 
 def bandwidth_factory(method):
@@ -0,0 +1,250 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-21, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Cached secondary structure annotation with DSSP
+
+Running DSSP is an external call for every structure. The :obj:`DsspCache` memoises the DSSP output keyed by a hash
+of the coordinate records of the structure file and the DSSP version, so that validating the same model again, or a
+copy that only differs in its header or remarks, does not call DSSP again.
+
+"""
+
+import functools
+import hashlib
+import os
+import re
+import subprocess
+import tempfile
+
+from Bio.PDB.DSSP import DSSP
+
+_COORDINATE_RECORDS = (b"ATOM  ", b"HETATM", b"MODEL ", b"ENDMDL", b"TER   ")
+
+
+@functools.lru_cache(maxsize=None)
+def get_dssp_version(dssp_exe):
+    """Get the version of a DSSP executable, only calling it once per process
+
+    Parameters
+    ----------
+    dssp_exe: str
+       The DSSP executable
+
+    Returns
+    -------
+    tuple
+       The version of the executable as a tuple of integers
+
+    """
+    version_string = subprocess.check_output([dssp_exe, "--version"], universal_newlines=True)
+    return tuple(int(i) for i in re.search(r"\s*(\d+(?:\.\d+)*)", version_string).group(1).split("."))
+
+
+def run_dssp(fname, dssp_exe="mkdssp"):
+    """Run DSSP on a structure file
+
+    Parameters
+    ----------
+    fname: str
+       The path to the structure file
+    dssp_exe: str
+       The DSSP executable [default: mkdssp]
+
+    Returns
+    -------
+    str
+       The output of DSSP in the classic DSSP format
+
+    Raises
+    ------
+    :exc:`RuntimeError`
+       DSSP did not produce any output
+
+    """
+    if get_dssp_version(dssp_exe) < (4, 0, 0):
+        cmd = [dssp_exe, fname]
+    else:
+        cmd = [dssp_exe, "--output-format=dssp", fname]
+    process = subprocess.Popen(cmd, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+    if not stdout.strip():
+        raise RuntimeError("DSSP failed to produce an output: {}".format(stderr.strip()))
+    return stdout
+
+
+class DsspCache(object):
+    """Cache of DSSP outputs keyed by the content of the structure files
+
+    Outputs are always kept in memory for the lifetime of the cache, and also stored in a directory if one is given,
+    so that they are shared between processes and ConKit invocations.
+
+    Attributes
+    ----------
+    directory: str
+       The directory to store the DSSP outputs in, outputs are only kept in memory if `None`
+
+    Examples
+    --------
+    >>> from Bio.PDB import PDBParser
+    >>> from conkit.misc.dssp import DsspCache
+    >>> cache = DsspCache()
+    >>> structure = PDBParser(QUIET=True).get_structure('TOXD', 'toxd/toxd.pdb')
+    >>> dssp = cache.get_dssp(structure[0], 'toxd/toxd.pdb', dssp_exe='mkdssp')
+
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._outputs = {}
+
+    def __repr__(self):
+        return "{}(directory={} nentries={})".format(self.__class__.__name__, self.directory, len(self._outputs))
+
+    def key(self, fname, dssp_exe="mkdssp", pdbformat="pdb"):
+        """Compute the cache key for a structure file
+
+        Only the coordinate records of PDB files are hashed, mmCIF files are hashed in full.
+
+        Parameters
+        ----------
+        fname: str
+           The path to the structure file
+        dssp_exe: str
+           The DSSP executable [default: mkdssp]
+        pdbformat: str
+           Format of the structure file, either pdb or mmcif [default: pdb]
+
+        Returns
+        -------
+        str
+           The cache key
+
+        """
+        digest = hashlib.sha256()
+        digest.update(".".join(str(i) for i in get_dssp_version(dssp_exe)).encode("utf-8"))
+        with open(fname, "rb") as f_in:
+            content = f_in.read()
+        if pdbformat != "mmcif":
+            content = b"\n".join(line for line in content.splitlines() if line[:6] in _COORDINATE_RECORDS)
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Get a cached DSSP output
+
+        Parameters
+        ----------
+        key: str
+           The cache key
+
+        Returns
+        -------
+        str
+           The DSSP output, or `None` if there is no entry for this key
+
+        """
+        if key in self._outputs:
+            return self._outputs[key]
+        if self.directory is not None and os.path.isfile(self._path(key)):
+            with open(self._path(key), "r") as f_in:
+                self._outputs[key] = f_in.read()
+            return self._outputs[key]
+        return None
+
+    def put(self, key, output):
+        """Store a DSSP output in the cache
+
+        Parameters
+        ----------
+        key: str
+           The cache key
+        output: str
+           The DSSP output
+
+        """
+        self._outputs[key] = output
+        if self.directory is not None:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            f_out = tempfile.NamedTemporaryFile(mode="w", dir=self.directory, suffix=".tmp", delete=False)
+            with f_out:
+                f_out.write(output)
+            # Atomic replacement so that concurrent readers never see a partially written entry
+            os.replace(f_out.name, self._path(key))
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        self._outputs.clear()
+        if self.directory is not None and os.path.isdir(self.directory):
+            for fname in os.listdir(self.directory):
+                if fname.endswith(".dssp"):
+                    os.remove(os.path.join(self.directory, fname))
+
+    def get_dssp(self, model, fname, dssp_exe="mkdssp", acc_array="Wilke", pdbformat="pdb"):
+        """Annotate a structure with DSSP, only calling DSSP if the structure is not in the cache
+
+        Parameters
+        ----------
+        model: :obj:`Bio.PDB.Model.Model`
+           The first model of the structure parsed from ``fname``
+        fname: str
+           The path to the structure file
+        dssp_exe: str
+           The DSSP executable [default: mkdssp]
+        acc_array: str
+           The maximum accessible surface area table used for the relative accessibility [default: Wilke]
+        pdbformat: str
+           Format of the structure file, either pdb or mmcif [default: pdb]
+
+        Returns
+        -------
+        :obj:`Bio.PDB.DSSP.DSSP`
+           The DSSP annotation of the model
+
+        """
+        # DSSP before version 4 labels mmCIF chains differently, which only Biopython can map from the input file
+        if pdbformat == "mmcif" and get_dssp_version(dssp_exe) < (4, 0, 0):
+            return DSSP(model, fname, dssp=dssp_exe, acc_array=acc_array, file_type="MMCIF")
+
+        key = self.key(fname, dssp_exe, pdbformat)
+        output = self.get(key)
+        if output is None:
+            output = run_dssp(fname, dssp_exe)
+            self.put(key, output)
+
+        if self.directory is not None:
+            return DSSP(model, self._path(key), acc_array=acc_array, file_type="DSSP")
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            dssp_file = os.path.join(tmpdirname, "output.dssp")
+            with open(dssp_file, "w") as f_out:
+                f_out.write(output)
+            return DSSP(model, dssp_file, acc_array=acc_array, file_type="DSSP")
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".dssp")
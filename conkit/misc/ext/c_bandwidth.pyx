@@ -60,3 +60,57 @@ def c_get_gauss_curvature(np.ndarray[np.int64_t, ndim=2] A, double x, double w):
             z *= z
             curvature += (A.shape[1] * (z - 1.0) * (exp(-0.5 * z) / w_sqrt_2pi) / w_sq)
     return curvature / A.shape[0]
+
+
+def c_optimize_bandwidth_binned(np.ndarray[np.float64_t, ndim=1] X, np.ndarray[np.float64_t, ndim=1] W, double v):
+    cdef double alpha, sigma, integral, n
+    alpha = 1.0 / (2.0 * SQRT_PI)
+    sigma = 1.0
+    n = W.sum()
+    integral = c_get_stiffness_integral_binned(X, W, v, 0.0001)
+    return v - ((n * integral * sigma**4) / alpha)**(-1.0 / 5.0)
+
+
+def c_get_stiffness_integral_binned(np.ndarray[np.float64_t, ndim=1] X, np.ndarray[np.float64_t, ndim=1] W, double v,
+                                    double eps):
+    cdef Py_ssize_t i, n
+    cdef double min_, max_, dx, maxn, yy, y1, y2, y3, y
+    min_ = X.min() - v * 3
+    max_ = X.max() + v * 3
+    dx = 1.0 * (max_ - min_)
+    maxn = dx / sqrt(eps)
+    if maxn > 2048:
+        maxn = 2048
+    y1 = c_get_gauss_curvature_binned(X, W, min_, v)
+    y2 = c_get_gauss_curvature_binned(X, W, max_, v)
+    yy = 0.5 * dx * (y1 * y1 + y2 * y2)
+    n = 2
+
+    while n <= maxn:
+        dx /= 2.0
+        y = 0.0
+        for i in xrange(1, n, 2):
+            y3 = c_get_gauss_curvature_binned(X, W, min_ + i * dx, v)
+            y += (y3 * y3)
+        yy = 0.5 * yy + y * dx
+        if n > 8 and fabs(y * dx - 0.5 * yy) < eps * yy:
+            break
+        n *= 2
+
+    return yy
+
+
+def c_get_gauss_curvature_binned(np.ndarray[np.float64_t, ndim=1] X, np.ndarray[np.float64_t, ndim=1] W, double x,
+                                 double w):
+    cdef Py_ssize_t i
+    cdef double w_sq, w_sqrt_2pi, curvature, z, n
+    w_sq = w*w
+    w_sqrt_2pi = w * SQRT_2PI
+    curvature = 0.0
+    n = 0.0
+    for i in xrange(X.shape[0]):
+        z = (x - X[i]) / w
+        z *= z
+        curvature += W[i] * ((z - 1.0) * (exp(-0.5 * z) / w_sqrt_2pi) / w_sq)
+        n += W[i]
+    return curvature / n
@@ -0,0 +1,57 @@
+#cython: boundscheck=False, cdivision=True, wraparound=False
+
+cimport cython
+import numpy as np
+cimport numpy as np
+
+np.import_array()
+
+
+def c_align(np.ndarray[np.float64_t, ndim=2] sco_mtx, double gap_open, double gap_ext):
+    """Smith-Waterman local alignment with the map_align affine gap scheme
+
+    A gap opened right after a match is penalised with ``gap_open``, any other gap with ``gap_ext``.
+    Returns the index in the second map aligned to each position of the first one, or -1 if unaligned.
+    """
+    cdef Py_ssize_t rows = sco_mtx.shape[0]
+    cdef Py_ssize_t cols = sco_mtx.shape[1]
+    cdef np.ndarray[np.float64_t, ndim=2] H = np.zeros((rows + 1, cols + 1), dtype=np.float64)
+    cdef np.ndarray[np.int8_t, ndim=2] L = np.zeros((rows + 1, cols + 1), dtype=np.int8)
+    cdef np.ndarray[np.int64_t, ndim=1] a2b = np.full(rows, -1, dtype=np.int64)
+    cdef Py_ssize_t i, j, max_i = 0, max_j = 0
+    cdef double A, D, R, max_sco = 0.0
+
+    for i in range(1, rows + 1):
+        for j in range(1, cols + 1):
+            A = H[i - 1, j - 1] + sco_mtx[i - 1, j - 1]
+            D = H[i - 1, j] + (gap_open if L[i - 1, j] == 1 else gap_ext)
+            R = H[i, j - 1] + (gap_open if L[i, j - 1] == 1 else gap_ext)
+            if A <= 0 and D <= 0 and R <= 0:
+                H[i, j] = 0
+                L[i, j] = 0
+            elif A >= R and A >= D:
+                H[i, j] = A
+                L[i, j] = 1
+            elif R >= D:
+                H[i, j] = R
+                L[i, j] = 3
+            else:
+                H[i, j] = D
+                L[i, j] = 2
+            if H[i, j] > max_sco:
+                max_sco = H[i, j]
+                max_i = i
+                max_j = j
+
+    i, j = max_i, max_j
+    while i > 0 and j > 0 and L[i, j] != 0:
+        if L[i, j] == 1:
+            a2b[i - 1] = j - 1
+            i -= 1
+            j -= 1
+        elif L[i, j] == 2:
+            i -= 1
+        else:
+            j -= 1
+
+    return a2b
@@ -0,0 +1,228 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-21, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""In-process contact map alignment
+
+This is a NumPy/Cython re-implementation of the iterative double dynamic programming used by map_align [#]_,
+operating directly on in-memory contact maps instead of an external executable and temporary files.
+
+.. [#] Ovchinnikov S. et al. (2017). Protein structure determination using metagenome sequence data.
+   Science 355(6322), 294-298.
+
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from conkit.core.contactmap import ContactMap
+
+SEPARATION_EXPONENTS = (0, 1, 2)
+SEPARATION_SCALES = (1, 2, 4, 8, 16, 32)
+
+
+class ContactMapAligner(object):
+    """Align two contact maps in the style of map_align
+
+    The initial similarity between two residues is the overlap of their contact profiles, with each pair of contacts
+    weighted by a Gaussian of the difference in sequence separation. The alignment is then refined iteratively by
+    rescoring the similarity with the contacts shared under the current alignment. This is repeated over a grid of
+    Gaussian widths and the alignment with the highest contact overlap is kept.
+
+    Examples
+    --------
+    >>> import conkit
+    >>> from conkit.misc.mapalign import ContactMapAligner
+    >>> aligner = ContactMapAligner(n_iterations=20)
+    >>> prediction = conkit.io.read('toxd/toxd.npz', 'rosettanpz').top
+    >>> model = conkit.io.read('toxd/toxd.pdb', 'pdb').top
+    >>> misaligned = aligner.align(prediction, model)
+
+    """
+
+    def __init__(self, gap_opening_penalty=-1, gap_extension_penalty=-0.01, seq_separation_cutoff=3,
+                 n_iterations=20):
+        """Instantiate a new contact map aligner
+
+        Parameters
+        ----------
+        gap_opening_penalty: float
+           The penalty of opening a gap after an aligned pair [default: -1]
+        gap_extension_penalty: float
+           The penalty of extending a gap [default: -0.01]
+        seq_separation_cutoff: int
+           The minimum sequence separation of contacts used in the alignment [default: 3]
+        n_iterations: int
+           The number of refinement iterations for each Gaussian width [default: 20]
+
+        """
+        self.gap_opening_penalty = float(gap_opening_penalty)
+        self.gap_extension_penalty = float(gap_extension_penalty)
+        self.seq_separation_cutoff = int(seq_separation_cutoff)
+        self.n_iterations = int(n_iterations)
+
+    def __repr__(self):
+        return "{}(gap_opening_penalty={}, gap_extension_penalty={}, seq_separation_cutoff={}, n_iterations={})".format(
+            self.__class__.__name__, self.gap_opening_penalty, self.gap_extension_penalty, self.seq_separation_cutoff,
+            self.n_iterations)
+
+    def get_contact_matrix(self, cmap):
+        """Create the weighted and symmetric contact matrix used for the alignment
+
+        Row and column ``i`` correspond to residue number ``i + 1``, as in the map_align input format.
+
+        Parameters
+        ----------
+        cmap: :obj:`~conkit.core.contactmap.ContactMap`
+           The contact map to be converted
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           A square matrix with the raw scores of the contacts weighted by their sequence separation
+
+        Raises
+        ------
+        :exc:`TypeError`
+           The contact map is not a :obj:`~conkit.core.contactmap.ContactMap`
+
+        """
+        if not isinstance(cmap, ContactMap):
+            raise TypeError("Invalid hierarchy type for contact map: %s" % cmap.__class__.__name__)
+
+        contacts = np.array([(c.res1_seq, c.res2_seq, c.raw_score) for c in cmap], dtype=np.float64).reshape(-1, 3)
+        res1 = contacts[:, 0].astype(np.int64)
+        res2 = contacts[:, 1].astype(np.int64)
+        raw_score = contacts[:, 2]
+        size = int(max(res1.max(initial=0), res2.max(initial=0)))
+
+        separation = np.abs(res1 - res2)
+        keep = (separation >= self.seq_separation_cutoff) & (raw_score > 0) & (res1 > 0) & (res2 > 0)
+        weights = raw_score[keep] * self._separation_weights(separation[keep])
+
+        matrix = np.zeros((size, size), dtype=np.float64)
+        matrix[res1[keep] - 1, res2[keep] - 1] = weights
+        matrix[res2[keep] - 1, res1[keep] - 1] = weights
+        return matrix
+
+    def align(self, map_a, map_b):
+        """Align two contact maps and get the misaligned residues
+
+        Parameters
+        ----------
+        map_a: :obj:`~conkit.core.contactmap.ContactMap`, :obj:`numpy.ndarray`
+           The reference contact map, e.g. the prediction, or its contact matrix
+        map_b: :obj:`~conkit.core.contactmap.ContactMap`, :obj:`numpy.ndarray`
+           The contact map to be aligned, e.g. the model, or its contact matrix
+
+        Returns
+        -------
+        dict
+           A dictionary where aligned residue numbers in ``map_b`` are the keys and residue numbers in ``map_a``
+           values. Only misaligned residues are included, as in :func:`~conkit.plot.tools.parse_map_align_stdout`.
+
+        """
+        if isinstance(map_a, ContactMap):
+            map_a = self.get_contact_matrix(map_a)
+        if isinstance(map_b, ContactMap):
+            map_b = self.get_contact_matrix(map_b)
+
+        a2b, _ = self.align_matrices(map_a, map_b)
+        residues_a = np.flatnonzero((a2b >= 0) & (a2b != np.arange(a2b.shape[0])))
+        return {int(a2b[i]) + 1: int(i) + 1 for i in residues_a}
+
+    def align_matrices(self, matrix_a, matrix_b):
+        """Align two contact matrices created with :meth:`get_contact_matrix`
+
+        Parameters
+        ----------
+        matrix_a: :obj:`numpy.ndarray`
+           The reference contact matrix
+        matrix_b: :obj:`numpy.ndarray`
+           The contact matrix to be aligned
+
+        Returns
+        -------
+        tuple
+           The index in ``matrix_b`` aligned to each row of ``matrix_a`` (-1 if unaligned) and the contact overlap
+           score of the alignment
+
+        """
+        from conkit.misc.ext.c_mapalign import c_align
+
+        matrix_a = np.ascontiguousarray(matrix_a, dtype=np.float64)
+        matrix_b = np.ascontiguousarray(matrix_b, dtype=np.float64)
+        best_a2b = np.full(matrix_a.shape[0], -1, dtype=np.int64)
+        best_score = 0.0
+        if matrix_a.size == 0 or matrix_b.size == 0:
+            return best_a2b, best_score
+
+        right_a, left_a = self._get_profiles(matrix_a)
+        right_b, left_b = self._get_profiles(matrix_b)
+        for sep_x in SEPARATION_EXPONENTS:
+            for sep_y in SEPARATION_SCALES:
+                gaussian = self._get_separation_gaussian(matrix_a.shape[0], matrix_b.shape[0], sep_x, sep_y)
+                sco_mtx = right_a @ gaussian @ right_b.T + left_a @ gaussian @ left_b.T
+                for iteration in range(self.n_iterations):
+                    a2b = c_align(sco_mtx, self.gap_opening_penalty, self.gap_extension_penalty)
+                    aligned = np.flatnonzero(a2b >= 0)
+                    shared = matrix_a[:, aligned] @ matrix_b[:, a2b[aligned]].T
+                    score = shared[aligned, a2b[aligned]].sum() / 2
+                    if score > best_score:
+                        best_a2b, best_score = a2b, score
+                    sco_mtx = (iteration * sco_mtx + shared) / (iteration + 1)
+
+        return best_a2b, best_score
+
+    def _get_separation_gaussian(self, size_a, size_b, sep_x, sep_y):
+        """Weight contacts by the difference in sequence separation, with a width growing with the separation"""
+        sep_a, sep_b = np.ogrid[:size_a, :size_b]
+        sep_diff = np.abs(sep_a - sep_b).astype(np.float64)
+        sep_std = sep_y * (1 + (np.minimum(sep_a, sep_b) - 2.0) ** sep_x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = sep_diff / sep_std
+            gaussian = np.where((sep_std > 0) & (ratio < 6), np.exp(-0.5 * ratio ** 2), 0.0)
+        gaussian[:self.seq_separation_cutoff, :] = 0
+        gaussian[:, :self.seq_separation_cutoff] = 0
+        return gaussian
+
+    @staticmethod
+    def _get_profiles(matrix):
+        """Contact profiles towards the C- and N-terminus indexed by sequence separation"""
+        size = matrix.shape[0]
+        residues, separation = np.ogrid[:size, :size]
+        right, left = residues + separation, residues - separation
+        right_profile = np.where(right < size, matrix[residues, np.minimum(right, size - 1)], 0.0)
+        left_profile = np.where(left >= 0, matrix[residues, np.maximum(left, 0)], 0.0)
+        return right_profile, left_profile
+
+    @staticmethod
+    def _separation_weights(separation):
+        """Down-weight contacts between residues close in sequence"""
+        return np.where(separation <= 4, 0.5, np.where(separation == 5, 0.75, 1.0))
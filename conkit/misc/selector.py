@@ -33,17 +33,37 @@ __author__ = "Felix Simkovic"
 __date__ = "13 Aug 2018"
 __version__ = "0.13.3"
 
-from multiprocessing import Pool
+import multiprocessing
+import numpy as np
+import sys
 
 from conkit.io import read
+from conkit.io._cache import PARSER_CACHE
+from conkit.io._iotools import open_f_handle
 from conkit.misc.selectalg import SUBSELECTION_ALGORITHMS
 from conkit.misc.selectalg import SubselectionAlgorithm
 
+# The sequence separation of short-, medium- and long-range contacts as in ContactMap.short_range etc.
+SEQUENCE_SEPARATION_RANGES = ((6, 11), (12, 23), (24, sys.maxsize))
+
 
 class StructureSelector(object):
-    """Structure selection class for assessment by short-, medium- and long-range contact satisfaction"""
+    """Structure selection class for assessment by short-, medium- and long-range contact satisfaction
+
+    With more than one process, the decoys are scored in a pool of worker processes that is kept alive across
+    calls and receives the reference :obj:`~conkit.core.contactmap.ContactMap` only once, when each worker starts.
+    The pool is shut down by :meth:`close` or when leaving a ``with`` block.
+
+    Examples
+    --------
+    >>> from conkit.misc.selector import StructureSelector
+    >>> with StructureSelector(contactmap, nprocesses=8) as selector:
+    ...     for decoys in batches:
+    ...         scores = selector.compute_precision_by_range(decoys, "pdb")
+
+    """
 
-    def __init__(self, contactmap, nprocesses=1):
+    def __init__(self, contactmap, nprocesses=1, chunksize=None):
         """Instantiate a new :obj:`~conkit.misc.selector.StructureSelector` object
 
         Parameters
@@ -52,10 +72,41 @@ class StructureSelector(object):
            An instance of a :obj:`~conkit.core.contactmap.ContactMap`
         nprocesses : int, optional
            The number of processes
+        chunksize : int, optional
+           The number of decoys sent to a worker process at a time [default: spread evenly across processes]
 
         """
+        self._contactmap = None
+        self._reference_arrays = None
+        self._pool = None
         self.contactmap = contactmap
         self.nprocesses = nprocesses
+        self.chunksize = chunksize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def contactmap(self):
+        """The reference :obj:`~conkit.core.contactmap.ContactMap`"""
+        return self._contactmap
+
+    @contactmap.setter
+    def contactmap(self, contactmap):
+        """Define the reference :obj:`~conkit.core.contactmap.ContactMap`, the worker pool is restarted if needed"""
+        self.close()
+        self._contactmap = contactmap
+        self._reference_arrays = None
+
+    def close(self):
+        """Shut down the pool of worker processes, if any"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
 
     def assess(self, decoys, decoy_format, mode="linear"):
         """Subselect decoys excluding those not satisfying long-distance restraints
@@ -92,6 +143,27 @@ class StructureSelector(object):
     def compute_precision_by_range(self, decoys, decoy_format):
         """Compute restraint precision score by sequence separation range
 
+        The precision in a range is the fraction of the reference contacts in that range whose residues are in
+        contact in a decoy. Reference contacts with residues missing from a decoy are counted as not in contact.
+
+        Parameters
+        ----------
+        decoys : list, tuple
+           A list containing paths to decoy files
+        decoy_format : str
+           The file format of ``decoys``
+
+        Returns
+        -------
+        list
+           A list of tuples containing short-range, medium-range and long-range scores for all decoys
+
+        """
+        return list(self.iter_precision_by_range(decoys, decoy_format))
+
+    def iter_precision_by_range(self, decoys, decoy_format):
+        """Iterate over the restraint precision scores by sequence separation range as decoys are scored
+
         Parameters
         ----------
         decoys : list, tuple
@@ -101,29 +173,171 @@ class StructureSelector(object):
 
         Returns
         -------
-        tuple
-           A 2-D tuple containing short-range, medium-range and long-range scores for all decoys
+        generator
+           A tuple containing short-range, medium-range and long-range scores per decoy, in the order of ``decoys``
 
         """
-        formats = [decoy_format for _ in range(len(decoys))]
-        cmap_copies = [self.contactmap.deepcopy() for _ in range(len(decoys))]
-        args = zip(decoys, formats, cmap_copies)
-        return Pool(self.nprocesses).map(_compute_single, args)
+        decoys = list(decoys)
+        if self.nprocesses <= 1 or len(decoys) < 2:
+            for decoy in decoys:
+                yield _compute_single(decoy, decoy_format, self.contactmap)
+            return
 
+        chunksize = self.chunksize
+        if chunksize is None:
+            chunksize = max(1, len(decoys) // (self.nprocesses * 4))
+        args = ((decoy, decoy_format) for decoy in decoys)
+        for scores in self._get_pool().imap(_compute_pooled, args, chunksize):
+            yield scores
 
-# This needs to be outside for the function to be pickleable by Pool
-def _compute_single(args):
-    decoy, decoy_format, cmap = args
+    def compute_precision_array(self, decoys, decoy_format="pdb", distance_cutoff=8, atom_type="CB"):
+        """Compute restraint precision scores by sequence separation range for many decoys at once
+
+        Unlike :meth:`compute_precision_by_range`, no contact hierarchy is built and the decoys are not
+        aligned to the reference :obj:`~conkit.core.contactmap.ContactMap`. The residue pairs of the reference
+        are converted to index arrays once, and only the distances of these pairs are calculated from the atom
+        coordinates of each decoy. Residue pairs are identified by the residue sequence numbers of the first
+        chain in each decoy, so the decoys must be numbered like the reference. As in
+        :meth:`compute_precision_by_range`, reference contacts with residues missing from a decoy are counted as
+        not in contact.
+
+        Parameters
+        ----------
+        decoys : list, tuple
+           A list containing paths to decoy files
+        decoy_format : str, optional
+           The structure file format of ``decoys``, i.e. ``pdb`` or ``mmcif`` [default: pdb]
+        distance_cutoff : float, optional
+           The distance cutoff below which a residue pair is in contact in a decoy [default: 8]
+        atom_type : str, optional
+           Atom type between which distances are calculated [default: CB]
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           An array with the short-range, medium-range and long-range precision of each decoy, which is
+           `NaN` if the reference has no contacts in a range
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The decoy format is not a structure file format
+
+        """
+        parser = PARSER_CACHE.import_class(decoy_format) if decoy_format in PARSER_CACHE else None
+        if not hasattr(parser, "read_coordinates"):
+            raise ValueError("Decoy format is not a structure file format: {}".format(decoy_format))
+
+        decoys = list(decoys)
+        scores = np.empty((len(decoys), len(SEQUENCE_SEPARATION_RANGES)), dtype=np.float64)
+        if self.nprocesses <= 1 or len(decoys) < 2:
+            if self._reference_arrays is None:
+                self._reference_arrays = _create_reference_arrays(self.contactmap)
+            for i, decoy in enumerate(decoys):
+                scores[i] = _score_single(decoy, decoy_format, self._reference_arrays, distance_cutoff, atom_type)
+            return scores
+
+        chunksize = self.chunksize
+        if chunksize is None:
+            chunksize = max(1, len(decoys) // (self.nprocesses * 4))
+        args = ((decoy, decoy_format, distance_cutoff, atom_type) for decoy in decoys)
+        for i, decoy_scores in enumerate(self._get_pool().imap(_score_pooled, args, chunksize)):
+            scores[i] = decoy_scores
+        return scores
+
+    def _get_pool(self):
+        """Start the pool of worker processes and send the reference map to each worker"""
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.nprocesses, _init_worker, (self.contactmap,))
+        return self._pool
+
+
+# The reference map of each worker process in the pool of a StructureSelector and its index arrays
+_REFERENCE_MAP = None
+_REFERENCE_ARRAYS = None
+
+
+# These need to be outside for the functions to be pickleable by Pool
+def _init_worker(contactmap):
+    global _REFERENCE_MAP, _REFERENCE_ARRAYS
+    _REFERENCE_MAP = contactmap
+    _REFERENCE_ARRAYS = None
+
+
+def _compute_pooled(args):
+    decoy, decoy_format = args
+    return _compute_single(decoy, decoy_format, _REFERENCE_MAP)
+
+
+def _compute_single(decoy, decoy_format, cmap):
     dmap = read(decoy, decoy_format).top_map
-    matched = cmap.match(dmap)
-    shortrange = matched.short_range
-    mediumrange = matched.medium_range
-    longrange = matched.long_range
-    sprec, mprec, lprec = float("NaN"), float("NaN"), float("NaN")
-    if shortrange.ncontacts > 0:
-        sprec = shortrange.precision
-    if mediumrange.ncontacts > 0:
-        mprec = mediumrange.precision
-    if longrange.ncontacts > 0:
-        lprec = longrange.precision
-    return sprec, mprec, lprec
+    # The decoy holds all residue pairs, only those within the distance cutoff are marked as true positives
+    within_cutoff = {distance.id for distance in dmap if distance.true_positive}
+    matched = cmap.match(dmap, renumber=True)
+    pairs = np.array([contact.id for contact in matched], dtype=np.int64).reshape(-1, 2)
+    within = np.array(
+        [contact.true_positive and (contact.res1_seq, contact.res2_seq) in within_cutoff for contact in matched],
+        dtype=bool,
+    )
+    ranges = _get_separation_ranges(pairs)
+    selected = ranges >= 0
+    ncontacts = np.bincount(ranges[selected], minlength=len(SEQUENCE_SEPARATION_RANGES))
+    return tuple(_get_precision(ranges[selected], within[selected], ncontacts).tolist())
+
+
+def _score_pooled(args):
+    global _REFERENCE_ARRAYS
+    if _REFERENCE_ARRAYS is None:
+        _REFERENCE_ARRAYS = _create_reference_arrays(_REFERENCE_MAP)
+    decoy, decoy_format, distance_cutoff, atom_type = args
+    return _score_single(decoy, decoy_format, _REFERENCE_ARRAYS, distance_cutoff, atom_type)
+
+
+def _get_separation_ranges(pairs):
+    """Get the index of the sequence separation range of each residue pair, or -1 if it is in none"""
+    separation = np.abs(pairs[:, 1] - pairs[:, 0])
+    ranges = np.full(separation.shape, -1, dtype=np.int64)
+    for i, (min_distance, max_distance) in enumerate(SEQUENCE_SEPARATION_RANGES):
+        ranges[(min_distance <= separation) & (separation <= max_distance)] = i
+    return ranges
+
+
+def _get_precision(ranges, within, ncontacts):
+    """Get the fraction of the reference contacts in each range that are within the distance cutoff in a decoy"""
+    true_positives = np.bincount(ranges, weights=within, minlength=len(SEQUENCE_SEPARATION_RANGES))
+    scores = np.full(len(SEQUENCE_SEPARATION_RANGES), np.nan)
+    evaluated = ncontacts > 0
+    scores[evaluated] = true_positives[evaluated] / ncontacts[evaluated]
+    return scores
+
+
+def _create_reference_arrays(cmap):
+    """Convert the contacts of a map to residue index arrays and the sequence separation range of each pair"""
+    pairs = np.array(cmap.as_list(), dtype=np.int64).reshape(-1, 2)
+    ranges = _get_separation_ranges(pairs)
+    selected = ranges >= 0
+    ncontacts = np.bincount(ranges[selected], minlength=len(SEQUENCE_SEPARATION_RANGES))
+    return pairs[selected, 0], pairs[selected, 1], ranges[selected], ncontacts
+
+
+def _score_single(decoy, decoy_format, reference_arrays, distance_cutoff, atom_type):
+    res1_seqs, res2_seqs, ranges, ncontacts = reference_arrays
+    with open_f_handle(decoy, "r") as f_in:
+        chains = PARSER_CACHE.import_class(decoy_format)().read_coordinates(f_in, atom_type=atom_type)
+
+    # Residue pairs missing from the decoy are not within the distance cutoff
+    within = np.zeros(len(ranges), dtype=bool)
+    if not chains or len(chains[0][1]) == 0:
+        return _get_precision(ranges, within, ncontacts)
+    _, resseqs, coords = chains[0]
+
+    order = np.argsort(resseqs, kind="stable")
+    sorted_resseqs = resseqs[order]
+    index1 = np.minimum(np.searchsorted(sorted_resseqs, res1_seqs), len(order) - 1)
+    index2 = np.minimum(np.searchsorted(sorted_resseqs, res2_seqs), len(order) - 1)
+    present = (sorted_resseqs[index1] == res1_seqs) & (sorted_resseqs[index2] == res2_seqs)
+    index1 = order[index1[present]]
+    index2 = order[index2[present]]
+
+    within[present] = np.linalg.norm(coords[index1] - coords[index2], axis=1) < distance_cutoff
+    return _get_precision(ranges, within, ncontacts)
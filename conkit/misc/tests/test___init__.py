@@ -26,6 +26,11 @@ class TestMiscInit(unittest.TestCase):
         self.assertTrue(hasattr(classifier, 'predict_proba'))
         self.assertTrue(hasattr(scaler, 'transform'))
 
+    def test_load_validation_model_4(self):
+        classifier, scaler = load_validation_model()
+        self.assertIs(classifier, load_validation_model()[0])
+        self.assertIs(scaler, load_validation_model()[1])
+
     def test_normalize_1(self):
         self.assertListEqual([0.0, 0.5, 1.0], normalize([1, 2, 3]))
 
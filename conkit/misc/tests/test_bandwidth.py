@@ -133,6 +133,32 @@ class Test(unittest.TestCase):
             bandwidth.bandwidth_factory("garbage")
 
 
+class TestBinned(unittest.TestCase):
+    def _data(self):
+        xy = np.array([(1, 5), (3, 3), (2, 4), (1, 10), (4, 9), (12, 14)], dtype=np.int64)
+        x = np.asarray([i for (x, y) in xy for i in np.arange(x, y + 1)])[:, np.newaxis]
+        values = np.arange(0, 16)
+        return x, values[:, np.newaxis], np.bincount(x.ravel(), minlength=16)
+
+    def test_bandwidth_1(self):
+        x, values, counts = self._data()
+        for method in ("amise", "bowman", "linear", "scott", "silverman"):
+            estimator = bandwidth.bandwidth_factory(method)
+            self.assertAlmostEqual(estimator(x).bw, estimator(values, weights=counts).bw)
+
+    def test_bandwidth_2(self):
+        _, values, counts = self._data()
+        with self.assertRaises(ValueError):
+            bandwidth.BowmanBW(values, weights=counts[:-1]).bw
+
+    def test_binned_kde_1(self):
+        x, _, counts = self._data()
+        bins = np.arange(counts.shape[0])
+        expected = np.exp(-0.5 * ((bins[:, np.newaxis] - x.ravel()) / 1.5) ** 2).sum(axis=1)
+        expected /= x.shape[0] * 1.5 * np.sqrt(2 * np.pi)
+        np.testing.assert_allclose(expected, bandwidth.binned_kde(counts, 1.5), rtol=1e-10, atol=1e-14)
+
+
 class TestExt(unittest.TestCase):
     def test_gauss_curvature_1(self):
         A = np.array([[1], [2], [3], [4], [5], [3], [2], [3], [4]], dtype=np.int64)
@@ -174,6 +200,18 @@ class TestExt(unittest.TestCase):
         optimized = c_bandwidth.c_optimize_bandwidth(A, 1000.0)
         self.assertAlmostEqual(317.11331138268406, optimized)
 
+    def test_optimize_bandwidth_binned_1(self):
+        X = np.array([1, 2, 3, 4, 5], dtype=np.float64)
+        W = np.array([1, 2, 3, 2, 1], dtype=np.float64)
+        optimized = c_bandwidth.c_optimize_bandwidth_binned(X, W, 2.0)
+        self.assertAlmostEqual(0.4116948343202962, optimized)
+
+    def test_gauss_curvature_binned_1(self):
+        X = np.array([1, 2, 3, 4, 5], dtype=np.float64)
+        W = np.array([1, 2, 3, 2, 1], dtype=np.float64)
+        curvature = c_bandwidth.c_get_gauss_curvature_binned(X, W, -1.5, 0.5)
+        self.assertAlmostEqual(3.171746247735917e-05, curvature)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
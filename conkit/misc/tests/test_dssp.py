@@ -0,0 +1,127 @@
+"""Testing facility for conkit.misc.dssp"""
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from Bio.PDB import MMCIFIO, PDBParser
+
+from conkit.misc.dssp import DsspCache, get_dssp_version, run_dssp
+
+PDB_CONTENT = """HEADER    TEST
+ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 10.00           C
+ATOM      2  CA  ALA A   2       3.800   0.000   0.000  1.00 10.00           C
+ATOM      3  CA  ALA A   3       7.600   0.000   0.000  1.00 10.00           C
+END
+"""
+
+FAKE_DSSP = """#!{executable}
+import sys
+if sys.argv[1] == "--version":
+    print("mkdssp version {version}")
+    sys.exit(0)
+with open({counter!r}, "a") as f_out:
+    f_out.write("x")
+print("  #  RESIDUE AA STRUCTURE BP1 BP2  ACC     N-H-->O    O-->H-N    N-H-->O    O-->H-N    TCO  KAPPA ALPHA  PHI   PSI")
+for i, ss in enumerate("HE ", 1):
+    line = "{{:5d}}{{:5d}} A A  {{}}".format(i, i, ss) + " " * 17 + "{{:4d}}".format(10 * i)
+    line += "{{:7d}} {{:4.1f}}{{:6d}} {{:4.1f}}{{:6d}} {{:4.1f}}{{:6d}} {{:4.1f}}".format(0, 0, 0, 0, 0, 0, 0, 0)
+    print(line + " " * 20 + "{{:6.1f}}{{:6.1f}}".format(-60.0, -45.0))
+"""
+
+
+class TestDsspCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.counter = os.path.join(self.directory, "calls")
+        self.dssp_exe = self._dssp_exe("mkdssp", "4.0.4")
+        self.pdbfile = self._pdbfile("model.pdb", PDB_CONTENT)
+        self.model = PDBParser(QUIET=True).get_structure("test", self.pdbfile)[0]
+
+    def _dssp_exe(self, fname, version):
+        fname = os.path.join(self.directory, fname)
+        with open(fname, "w") as f_out:
+            f_out.write(FAKE_DSSP.format(executable=sys.executable, counter=self.counter, version=version))
+        os.chmod(fname, os.stat(fname).st_mode | stat.S_IEXEC)
+        return fname
+
+    def _pdbfile(self, fname, content):
+        fname = os.path.join(self.directory, fname)
+        with open(fname, "w") as f_out:
+            f_out.write(content)
+        return fname
+
+    def _mmcif_file(self, fname, content):
+        pdbfile = self._pdbfile(os.path.splitext(fname)[0] + ".pdb", content)
+        mmcif_io = MMCIFIO()
+        mmcif_io.set_structure(PDBParser(QUIET=True).get_structure("test", pdbfile))
+        fname = os.path.join(self.directory, fname)
+        mmcif_io.save(fname)
+        return fname
+
+    def _ncalls(self):
+        if not os.path.isfile(self.counter):
+            return 0
+        with open(self.counter, "r") as f_in:
+            return len(f_in.read())
+
+    def test_get_dssp_version_1(self):
+        self.assertEqual((4, 0, 4), get_dssp_version(self.dssp_exe))
+
+    def test_run_dssp_1(self):
+        output = run_dssp(self.pdbfile, self.dssp_exe)
+        self.assertEqual(4, len(output.splitlines()))
+        self.assertEqual(1, self._ncalls())
+
+    def test_key_1(self):
+        cache = DsspCache()
+        renamed = self._pdbfile("renamed.pdb", PDB_CONTENT.replace("HEADER    TEST", "REMARK    COPY"))
+        moved = self._pdbfile("moved.pdb", PDB_CONTENT.replace("7.600", "7.700"))
+        self.assertEqual(cache.key(self.pdbfile, self.dssp_exe), cache.key(renamed, self.dssp_exe))
+        self.assertNotEqual(cache.key(self.pdbfile, self.dssp_exe), cache.key(moved, self.dssp_exe))
+
+    def test_key_2(self):
+        cache = DsspCache()
+        mmcif_file = self._mmcif_file("model.txt", PDB_CONTENT)
+        moved = self._mmcif_file("moved.txt", PDB_CONTENT.replace("7.600", "7.700"))
+        self.assertNotEqual(cache.key(mmcif_file, self.dssp_exe, "mmcif"), cache.key(moved, self.dssp_exe, "mmcif"))
+
+    def test_get_dssp_1(self):
+        cache = DsspCache()
+        dssp = cache.get_dssp(self.model, self.pdbfile, dssp_exe=self.dssp_exe)
+        self.assertEqual(["H", "E", "-"], [dssp[key][2] for key in dssp.keys()])
+        self.assertEqual(1, self._ncalls())
+        renamed = self._pdbfile("renamed.pdb", PDB_CONTENT.replace("HEADER    TEST", "REMARK    COPY"))
+        dssp = cache.get_dssp(self.model, renamed, dssp_exe=self.dssp_exe)
+        self.assertEqual(["H", "E", "-"], [dssp[key][2] for key in dssp.keys()])
+        self.assertEqual(1, self._ncalls())
+
+    def test_get_dssp_2(self):
+        cache_directory = os.path.join(self.directory, "cache")
+        DsspCache(cache_directory).get_dssp(self.model, self.pdbfile, dssp_exe=self.dssp_exe)
+        self.assertEqual(1, len(os.listdir(cache_directory)))
+        cache = DsspCache(cache_directory)
+        dssp = cache.get_dssp(self.model, self.pdbfile, dssp_exe=self.dssp_exe)
+        self.assertEqual([10, 20, 30], [dssp[key][3] * dssp.residue_max_acc["ALA"] for key in dssp.keys()])
+        self.assertEqual(1, self._ncalls())
+        cache.clear()
+        self.assertEqual([], os.listdir(cache_directory))
+        self.assertIsNone(cache.get(cache.key(self.pdbfile, self.dssp_exe)))
+
+    def test_get_dssp_3(self):
+        cache = DsspCache()
+        mmcif_file = self._mmcif_file("model.txt", PDB_CONTENT)
+        dssp_exe = self._dssp_exe("mkdssp_3", "3.0.0")
+        for ncalls in (1, 2):
+            dssp = cache.get_dssp(self.model, mmcif_file, dssp_exe=dssp_exe, pdbformat="mmcif")
+            self.assertEqual([("A", (" ", i, " ")) for i in range(1, 4)], list(dssp.keys()))
+            self.assertEqual(["H", "E", "-"], [dssp[key][2] for key in dssp.keys()])
+            self.assertEqual(ncalls, self._ncalls())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,100 @@
+"""Testing facility for conkit.misc.mapalign"""
+
+import numpy as np
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import conkit.io
+from conkit.core.contact import Contact
+from conkit.core.contactmap import ContactMap
+from conkit.misc.mapalign import ContactMapAligner
+from conkit.plot.tools import parse_map_align_stdout
+
+MAP_ALIGN_EXE = shutil.which("map_align")
+
+
+def _contactmap(nres, seed, shift=0):
+    random_state = np.random.RandomState(seed)
+    pairs = {(i, i + 4) for i in range(1, nres - 3) if random_state.uniform() < 0.5}
+    for _ in range(6):
+        start = random_state.randint(1, nres - 30)
+        end = start + random_state.randint(12, 25)
+        pairs.update((start + k, end - k) for k in range(6))
+    cmap = ContactMap("test")
+    for res1, res2 in sorted(pairs):
+        if res1 + shift >= 1:
+            cmap.add(Contact(int(res1 + shift), int(res2 + shift), 0.9))
+    return cmap
+
+
+class TestContactMapAligner(unittest.TestCase):
+
+    def test_get_contact_matrix_1(self):
+        cmap = ContactMap("test")
+        for res1, res2, raw_score in [(1, 2, 0.9), (1, 5, 0.8), (2, 7, 0.7), (3, 10, 0.6), (4, 9, 0.0)]:
+            cmap.add(Contact(res1, res2, raw_score))
+        matrix = ContactMapAligner().get_contact_matrix(cmap)
+        self.assertEqual((10, 10), matrix.shape)
+        np.testing.assert_array_equal(matrix, matrix.T)
+        self.assertEqual(0.0, matrix[0, 1])
+        self.assertAlmostEqual(0.8 * 0.5, matrix[0, 4])
+        self.assertAlmostEqual(0.7 * 0.75, matrix[1, 6])
+        self.assertAlmostEqual(0.6, matrix[2, 9])
+        self.assertEqual(0.0, matrix[3, 8])
+        self.assertEqual(3, np.count_nonzero(np.triu(matrix)))
+
+    def test_get_contact_matrix_2(self):
+        with self.assertRaises(TypeError):
+            ContactMapAligner().get_contact_matrix(np.zeros((5, 5)))
+
+    def test_align_1(self):
+        cmap = _contactmap(60, 1)
+        self.assertEqual({}, ContactMapAligner(n_iterations=5).align(cmap, cmap))
+
+    def test_align_2(self):
+        alignment = ContactMapAligner(n_iterations=5).align(_contactmap(60, 1), _contactmap(60, 1, shift=2))
+        self.assertTrue(alignment)
+        self.assertTrue(all(res_b - res_a == 2 for res_b, res_a in alignment.items()))
+
+    def test_align_3(self):
+        aligner = ContactMapAligner(n_iterations=5)
+        matrix = aligner.get_contact_matrix(_contactmap(60, 1))
+        self.assertEqual(aligner.align(_contactmap(60, 1), _contactmap(60, 1, shift=2)),
+                         aligner.align(matrix, _contactmap(60, 1, shift=2)))
+
+    @unittest.skipIf(MAP_ALIGN_EXE is None, "map_align executable not found")
+    def test_align_4(self):
+        aligner = ContactMapAligner()
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            contact_map_a = os.path.join(tmpdirname, "contact_map_a.mapalign")
+            contact_map_b = os.path.join(tmpdirname, "contact_map_b.mapalign")
+            for seed, shift in [(1, 0), (1, 2), (2, -3), (3, 5)]:
+                map_a, map_b = _contactmap(80, seed), _contactmap(80, seed, shift=shift)
+                conkit.io.write(contact_map_a, "mapalign", map_a)
+                conkit.io.write(contact_map_b, "mapalign", map_b)
+                stdout = subprocess.check_output(
+                    [MAP_ALIGN_EXE, "-a", contact_map_a, "-b", contact_map_b,
+                     "-gap_o", str(aligner.gap_opening_penalty), "-gap_e", str(aligner.gap_extension_penalty),
+                     "-sep_cut", str(aligner.seq_separation_cutoff), "-iter", str(aligner.n_iterations)],
+                    universal_newlines=True,
+                )
+                self.assertEqual(parse_map_align_stdout(stdout), aligner.align(map_a, map_b))
+
+    def test_align_matrices_1(self):
+        aligner = ContactMapAligner(n_iterations=5)
+        matrix = aligner.get_contact_matrix(_contactmap(60, 1))
+        a2b, score = aligner.align_matrices(matrix, matrix)
+        np.testing.assert_array_equal(np.arange(matrix.shape[0]), a2b[a2b >= 0])
+        self.assertAlmostEqual(np.triu(matrix ** 2).sum(), score)
+
+    def test_align_matrices_2(self):
+        a2b, score = ContactMapAligner().align_matrices(np.zeros((4, 4)), np.zeros((0, 0)))
+        np.testing.assert_array_equal([-1, -1, -1, -1], a2b)
+        self.assertEqual(0.0, score)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,118 @@
+"""Testing facility for conkit.misc.selector"""
+
+import numpy as np
+import os
+import shutil
+import tempfile
+import unittest
+
+from conkit import io
+from conkit.core.contact import Contact
+from conkit.core.contactmap import ContactMap
+from conkit.core.sequence import Sequence
+from conkit.misc.selector import StructureSelector
+
+PDB_LINE = "ATOM  {:5d}  {:<3s} ALA A{:4d}    {:8.3f}{:8.3f}{:8.3f}  1.00  0.00           {}\n"
+
+
+class TestStructureSelector(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _decoy(self, name, seed, nres=40):
+        np.random.seed(seed)
+        steps = np.random.normal(size=(nres, 3))
+        steps *= 3.8 / np.linalg.norm(steps, axis=1)[:, None]
+        coords = np.cumsum(steps, axis=0)
+        fname = os.path.join(self.directory, name)
+        with open(fname, "w") as f_out:
+            for i, (x, y, z) in enumerate(coords):
+                f_out.write(PDB_LINE.format(2 * i + 1, "CA", i + 1, x, y, z, "C"))
+                f_out.write(PDB_LINE.format(2 * i + 2, "CB", i + 1, x + 1.0, y, z, "C"))
+            f_out.write("END\n")
+        return fname
+
+    def _reference(self, decoy):
+        reference = ContactMap("reference")
+        for contact in io.read(decoy, "pdb").top_map:
+            if contact.true_positive:
+                reference.add(Contact(contact.res1_seq, contact.res2_seq, 1.0))
+        reference.sequence = Sequence("reference", "A" * 40)
+        return reference
+
+    def _selector(self, nprocesses):
+        return StructureSelector(self._reference(self._decoy("reference.pdb", 0)), nprocesses=nprocesses)
+
+    def test_compute_precision_by_range_1(self):
+        decoys = [self._decoy("{}.pdb".format(i), i) for i in range(6)]
+        serial = self._selector(1).compute_precision_by_range(decoys, "pdb")
+        self.assertEqual(6, len(serial))
+        self.assertTrue(all(len(scores) == 3 for scores in serial))
+        with self._selector(2) as selector:
+            selector.chunksize = 2
+            np.testing.assert_array_equal(serial, selector.compute_precision_by_range(decoys, "pdb"))
+            pool = selector._pool
+            self.assertIsNotNone(pool)
+            np.testing.assert_array_equal(serial[2:], list(selector.iter_precision_by_range(decoys[2:], "pdb")))
+            self.assertIs(pool, selector._pool)
+        self.assertIsNone(selector._pool)
+
+    def test_compute_precision_by_range_2(self):
+        decoys = [self._decoy("{}.pdb".format(i), i) for i in range(3)]
+        with self._selector(2) as selector:
+            selector.compute_precision_by_range(decoys, "pdb")
+            selector.contactmap = self._reference(decoys[1])
+            self.assertIsNone(selector._pool)
+            scores = selector.compute_precision_by_range(decoys, "pdb")
+        expected = StructureSelector(selector.contactmap).compute_precision_by_range(decoys, "pdb")
+        np.testing.assert_array_equal(expected, scores)
+
+    def test_compute_precision_array_1(self):
+        decoys = [self._decoy("{}.pdb".format(i), i) for i in range(6)]
+        selector = self._selector(1)
+        scores = selector.compute_precision_array(decoys, "pdb")
+        self.assertEqual((6, 3), scores.shape)
+        np.testing.assert_array_equal([1.0, 1.0, np.nan], scores[0])
+        self.assertTrue(np.all(scores[1:4, 0] < 1.0))
+        with self._selector(2) as selector:
+            np.testing.assert_array_equal(scores, selector.compute_precision_array(decoys, "pdb"))
+
+    def _truncated(self, decoy, name, last_residue):
+        fname = os.path.join(self.directory, name)
+        with open(decoy, "r") as f_in, open(fname, "w") as f_out:
+            f_out.writelines(line for line in f_in if line.startswith("END") or int(line[22:26]) <= last_residue)
+        return fname
+
+    def test_compute_precision_array_2(self):
+        reference = self._decoy("reference.pdb", 0)
+        decoys = [reference, self._truncated(reference, "truncated_1.pdb", 15),
+                  self._truncated(reference, "truncated_2.pdb", 32)]
+        selector = self._selector(1)
+        selector.contactmap.add(Contact(1, 30, 1.0))
+        scores = selector.compute_precision_array(decoys)
+        np.testing.assert_array_equal([1.0, 1.0, 0.0], scores[0])
+        for last_residue, decoy_scores in zip((15, 32), scores[1:]):
+            for (min_distance, max_distance), score in zip(((6, 11), (12, 23)), decoy_scores):
+                contacts = selector.contactmap.remove_neighbors(min_distance=min_distance, max_distance=max_distance)
+                present = [contact for contact in contacts if contact.res2_seq <= last_residue]
+                self.assertAlmostEqual(len(present) / len(contacts), score)
+            self.assertLess(decoy_scores[0], scores[0, 0])
+        np.testing.assert_array_equal([0.0, 0.0], scores[1, 1:])
+        np.testing.assert_allclose(scores, selector.compute_precision_by_range(decoys, "pdb"))
+
+    def test_compute_precision_array_3(self):
+        with self.assertRaises(ValueError):
+            self._selector(1).compute_precision_array([], "casprr")
+        with self.assertRaises(ValueError):
+            self._selector(1).compute_precision_array([], "unknown")
+
+    def test_assess_1(self):
+        decoys = [self._decoy("{}.pdb".format(i), i) for i in range(3)]
+        with self.assertRaises(ValueError):
+            self._selector(1).assess(decoys, "pdb", mode="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,157 @@
+"""Testing facility for conkit.misc.validation"""
+
+import numpy as np
+import unittest
+from Bio.PDB.AbstractPropertyMap import AbstractResiduePropertyMap
+from Bio.PDB.DSSP import DSSP
+
+from conkit.core.distance import Distance
+from conkit.core.distancefile import DistanceFile
+from conkit.core.distogram import Distogram
+from conkit.core.sequence import Sequence
+from conkit.misc import ALL_VALIDATION_FEATURES, SELECTED_VALIDATION_FEATURES
+from conkit.misc.mapalign import ContactMapAligner
+from conkit.misc.validation import ModelValidationResult, ModelValidator
+
+BINS = ((0, 4), (4, 6), (6, 8), (8, 10), (10, 12), (12, 14), (14, 16), (16, 18), (18, 20), (20, np.inf))
+BIN_CENTERS = np.array([2, 5, 7, 9, 11, 13, 15, 17, 19, 22])
+
+
+def _coordinates(nres, seed):
+    random_state = np.random.RandomState(seed)
+    steps = random_state.normal(size=(nres, 3))
+    steps *= 3.8 / np.linalg.norm(steps, axis=1)[:, None]
+    return np.cumsum(steps, axis=0)
+
+
+def _distogram(nres, seed, original_file_format, absent=()):
+    coordinates = _coordinates(nres, seed)
+    distancefile = DistanceFile("test")
+    distancefile.original_file_format = original_file_format
+    distogram = Distogram("1")
+    distancefile.add(distogram)
+    random_state = np.random.RandomState(seed)
+    for i in range(1, nres + 1):
+        for j in range(i + 1, nres + 1):
+            if i in absent or j in absent:
+                continue
+            distance = np.linalg.norm(coordinates[i - 1] - coordinates[j - 1])
+            if original_file_format == "pdb":
+                distance_scores = (1.0,)
+                distance_bins = ((distance, distance),)
+            else:
+                distance_scores = np.exp(-0.5 * ((BIN_CENTERS - distance) / 2.0) ** 2)
+                distance_scores += random_state.uniform(0, 0.1, len(BINS))
+                distance_scores = tuple((distance_scores / distance_scores.sum()).tolist())
+                distance_bins = BINS
+            distogram.add(Distance(i, j, distance_scores, distance_bins, distance_bound=(0, 8)))
+    return distogram
+
+
+def _dssp(nres, seed):
+    random_state = np.random.RandomState(seed)
+    dssp = DSSP.__new__(DSSP)
+    keys, properties = [], {}
+    for resnum in range(1, nres + 1):
+        key = ("A", (" ", resnum, " "))
+        keys.append(key)
+        properties[key] = (resnum, "A", "HEC-"[random_state.randint(4)], random_state.uniform())
+    AbstractResiduePropertyMap.__init__(dssp, properties, keys, [properties[key] for key in keys])
+    return dssp
+
+
+class TestModelValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.sequence = Sequence("test", "A" * 30)
+        self.validator = ModelValidator(_distogram(30, 1, "caspmode2"), self.sequence)
+
+    def test_validate_1(self):
+        result = self.validator.validate(_distogram(30, 2, "pdb"), _dssp(30, 2))
+        self.assertIsInstance(result, ModelValidationResult)
+        self.assertEqual(list(range(1, 31)), result.data.RESNUM.tolist())
+        self.assertEqual(ALL_VALIDATION_FEATURES + ['COIL', 'HELIX', 'SHEET', 'ACC', 'MISALIGNED', 'SCORE'],
+                         result.data.columns.tolist())
+        self.assertEqual(list(range(1, 31)), sorted(result.scores.keys()))
+        self.assertTrue(all(0 <= score <= 1 for score in result.scores.values()))
+        self.assertFalse(result.data.MISALIGNED.any())
+        self.assertEqual({}, result.alignment)
+        self.assertEqual(set(), result.absent_residues)
+        self.assertEqual((30,), result.smooth_scores.shape)
+
+    def test_validate_2(self):
+        model = _distogram(30, 2, "pdb", absent=(5, 6))
+        result = self.validator.validate(model, _dssp(30, 2))
+        self.assertEqual({5, 6}, result.absent_residues)
+        self.assertTrue(np.isnan(result.scores[5]) and np.isnan(result.scores[6]))
+        self.assertEqual([0.0, 0.0], result.sorted_scores[4:6].tolist())
+        self.assertTrue(result.data.loc[result.data.RESNUM == 5, ['COIL', 'HELIX', 'ACC']].isnull().values.all())
+        self.assertFalse(np.isnan(result.scores[7]))
+
+    def test_validate_3(self):
+        result = self.validator.validate(_distogram(30, 2, "pdb", absent=(8,)), _dssp(30, 2))
+        features = result.data[SELECTED_VALIDATION_FEATURES].values
+        for idx, resnum in enumerate(result.data.RESNUM):
+            if resnum == 8:
+                self.assertTrue(np.isnan(result.scores[resnum]))
+                continue
+            scaled_features = self.validator.scaler.transform(features[idx:idx + 1])
+            expected = self.validator.classifier.predict_proba(scaled_features)[0, 1]
+            self.assertAlmostEqual(expected, result.scores[resnum])
+
+    def test_validate_4(self):
+        with self.assertRaises(TypeError):
+            self.validator.validate(self.sequence, _dssp(30, 2))
+        with self.assertRaises(TypeError):
+            self.validator.validate(_distogram(30, 2, "pdb"), None)
+
+    def test_validate_5(self):
+        validator = ModelValidator(_distogram(30, 1, "caspmode2"), self.sequence,
+                                   aligner=ContactMapAligner(n_iterations=2))
+        result = validator.validate(_distogram(30, 1, "pdb"), _dssp(30, 1))
+        self.assertEqual(validator.align(_distogram(30, 1, "pdb")), result.alignment)
+        self.assertEqual(set(result.alignment.keys()), set(result.data.RESNUM[result.data.MISALIGNED]))
+
+    def test_get_residue_scores_1(self):
+        result = self.validator.validate(_distogram(30, 2, "pdb", absent=(8,)), _dssp(30, 2))
+        result.alignment = {3: 5}
+        residue_scores = result.get_residue_scores()
+        self.assertEqual(['RESNUM', 'SCORE', 'MISALIGNED', 'REGISTER'], residue_scores.columns.tolist())
+        self.assertEqual(list(range(1, 31)), residue_scores.RESNUM.tolist())
+        self.assertTrue(np.isnan(residue_scores.SCORE[7]))
+        self.assertEqual(result.scores[1], residue_scores.SCORE[0])
+        self.assertEqual(5, residue_scores.REGISTER[2])
+        self.assertEqual(1, residue_scores.REGISTER.notna().sum())
+
+    def test_validate_many_1(self):
+        models = [_distogram(30, seed, "pdb") for seed in (2, 3)]
+        results = self.validator.validate_many(models, [_dssp(30, 2), _dssp(30, 3)])
+        self.assertEqual(2, len(results))
+        expected = self.validator.validate(models[1], _dssp(30, 3))
+        self.assertTrue(expected.data.equals(results[1].data))
+        self.assertFalse(results[0].data.equals(results[1].data))
+        with self.assertRaises(ValueError):
+            self.validator.validate_many(models, [_dssp(30, 2)])
+
+    def test_init_1(self):
+        with self.assertRaises(ValueError):
+            ModelValidator(_distogram(30, 1, "caspmode2"), Sequence("test", "AAAA"))
+        with self.assertRaises(TypeError):
+            ModelValidator(self.sequence, self.sequence)
+        with self.assertRaises(ValueError):
+            ModelValidator(_distogram(30, 1, "caspmode2"), self.sequence, dist_bins=((0, 4), (5, np.inf)))
+        with self.assertRaises(TypeError):
+            ModelValidator(_distogram(30, 1, "caspmode2"), self.sequence, aligner="map_align")
+
+    def test_parse_dssp_1(self):
+        dssp = ModelValidator.parse_dssp(_dssp(5, 1), {2})
+        self.assertEqual(['RESNUM', 'COIL', 'HELIX', 'SHEET', 'ACC'], dssp.columns.tolist())
+        self.assertEqual([1, 2, 3, 4, 5], dssp.RESNUM.tolist())
+        self.assertEqual(1, dssp.iloc[0][['COIL', 'HELIX', 'SHEET']].sum())
+        self.assertTrue(dssp.iloc[1][['COIL', 'HELIX', 'SHEET', 'ACC']].isnull().all())
+        with self.assertRaises(TypeError):
+            ModelValidator.parse_dssp({})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
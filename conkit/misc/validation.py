@@ -0,0 +1,456 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-21, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Model validation engine independent of any figure
+
+Contact map alignments are computed in-process with :obj:`~conkit.misc.mapalign.ContactMapAligner`. Optionally,
+the external map_align program can be used instead:
+
+   map_align for contact map alignment
+
+*** This program needs to be installed separately from https://github.com/sokrypton/map_align***
+"""
+
+from __future__ import division
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from Bio.PDB import MMCIFParser, PDBParser
+from Bio.PDB.DSSP import DSSP
+
+import conkit.io
+from conkit.applications import MapAlignCommandline
+from conkit.core.distance import Distance
+from conkit.core.distogram import Distogram
+from conkit.core.sequence import Sequence
+from conkit.misc import load_validation_model, SELECTED_VALIDATION_FEATURES, ALL_VALIDATION_FEATURES
+from conkit.misc.dssp import DsspCache
+from conkit.misc.mapalign import ContactMapAligner
+from conkit.plot import tools
+
+DEFAULT_DISTANCE_BINS = ((0, 4), (4, 6), (6, 8), (8, 10), (10, 12), (12, 14), (14, 16), (16, 18), (18, 20),
+                         (20, np.inf))
+
+
+class ModelValidationResult(object):
+    """The outcome of the validation of a model by a :obj:`~conkit.misc.validation.ModelValidator`
+
+    Attributes
+    ----------
+    data : :obj:`pandas.DataFrame`
+       The features, the misalignment flag and the predicted error score of each residue in the model
+    scores : dict
+       The predicted error score of each residue, `NaN` if it cannot be predicted
+    sorted_scores : :obj:`numpy.ndarray`
+       The error scores sorted by residue number, where `NaN` is replaced by 0
+    smooth_scores : :obj:`numpy.ndarray`
+       The smoothed error scores sorted by residue number
+    alignment : dict
+       The residues misaligned in the contact map alignment and the residues they align to in the prediction
+    absent_residues : set
+       The residues not observed in the model or the prediction
+
+    """
+
+    __slots__ = ("data", "scores", "sorted_scores", "smooth_scores", "alignment", "absent_residues")
+
+    def __init__(self, data, scores, alignment, absent_residues):
+        self.data = data
+        self.scores = scores
+        self.sorted_scores = np.nan_to_num([scores[resnum] for resnum in sorted(scores.keys())])
+        self.smooth_scores = tools.convolution_smooth_values(self.sorted_scores)
+        self.alignment = alignment
+        self.absent_residues = absent_residues
+
+    def __repr__(self):
+        return "{}(nresidues={})".format(self.__class__.__name__, len(self.scores))
+
+    def get_residue_scores(self):
+        """Get the predicted error score and the suggested register of each residue
+
+        Returns
+        -------
+        :obj:`pandas.DataFrame`
+           The residue number, error score and misalignment flag of each residue, and the residue it aligns to in
+           the prediction if it is misaligned
+
+        """
+        residue_scores = self.data.loc[:, ['RESNUM', 'SCORE', 'MISALIGNED']].reset_index(drop=True)
+        residue_scores['REGISTER'] = pd.array([self.alignment.get(resnum) for resnum in residue_scores.RESNUM],
+                                              dtype='Int64')
+        return residue_scores
+
+
+def read_model(pdbfile, pdbformat="pdb", dssp_exe="mkdssp", dssp_cache=None):
+    """Parse a structure file once to obtain both its distances and its DSSP annotation
+
+    Parameters
+    ----------
+    pdbfile: str
+       Path to the structure file
+    pdbformat: str
+       Format of the structure file, either pdb or mmcif [default: pdb]
+    dssp_exe: str
+       Path to the DSSP executable [default: mkdssp]
+    dssp_cache: :obj:`~conkit.misc.dssp.DsspCache`
+       The cache of DSSP outputs [default: None]
+
+    Returns
+    -------
+    tuple
+       The :obj:`~conkit.core.distogram.Distogram` of the model and its :obj:`Bio.PDB.DSSP.DSSP` annotation
+
+    """
+    if dssp_cache is None:
+        dssp_cache = DsspCache()
+    if pdbformat == 'mmcif':
+        structure = MMCIFParser(QUIET=True).get_structure('structure', pdbfile)
+    else:
+        structure = PDBParser(QUIET=True).get_structure('structure', pdbfile)
+    model = conkit.io.PARSER_CACHE.import_class(pdbformat)().read_structure(structure).top
+    dssp = dssp_cache.get_dssp(structure[0], pdbfile, dssp_exe=dssp_exe, acc_array='Wilke', pdbformat=pdbformat)
+    return model, dssp
+
+
+class ModelValidator(object):
+    """Validate structure models against a distance prediction
+
+    The probability that each residue in a model is involved in a model error is predicted by feeding a trained
+    classifier the differences observed between the predicted distogram and the inter-residue contacts and
+    distances in the model. The prediction is prepared once, so that many models can be validated against it.
+
+    Attributes
+    ----------
+    prediction: :obj:`~conkit.core.distogram.Distogram`
+       The distogram with the residue distance predictions
+    sequence: :obj:`~conkit.core.sequence.Sequence`
+       The sequence of the structure
+    map_align_exe: str
+       The path to map_align executable
+    aligner: :obj:`~conkit.misc.mapalign.ContactMapAligner`
+       The in-process contact map aligner used to detect register errors
+    dist_bins: tuple
+       The boundaries of the distance bins used in the calculation
+    l_factor: float
+       The L/N factor used to filter the contacts before finding the False Negatives
+
+    Examples
+    --------
+    >>> from Bio.PDB import PDBParser
+    >>> from Bio.PDB.DSSP import DSSP
+    >>> import conkit
+    >>> from conkit.misc.validation import ModelValidator
+    >>> sequence = conkit.io.read('toxd/toxd.fasta', 'fasta').top
+    >>> prediction = conkit.io.read('toxd/toxd.npz', 'rosettanpz').top_map
+    >>> validator = ModelValidator(prediction, sequence)
+    >>> structure = PDBParser().get_structure('TOXD', 'toxd/toxd.pdb')[0]
+    >>> dssp = DSSP(structure, 'toxd/toxd.pdb', dssp='mkdssp', acc_array='Wilke')
+    >>> model = conkit.io.read('toxd/toxd.pdb', 'pdb').top_map
+    >>> result = validator.validate(model, dssp)
+    >>> result.data[['RESNUM', 'SCORE']]
+
+    """
+
+    def __init__(self, prediction, sequence, map_align_exe=None, dist_bins=None, l_factor=0.5, aligner=None):
+        """A new model validator
+
+        Parameters
+        ----------
+        prediction: :obj:`~conkit.core.distogram.Distogram`
+            The distogram with the residue distance predictions
+        sequence: :obj:`~conkit.core.sequence.Sequence`
+            The sequence of the structure
+        map_align_exe: str
+            The path to map_align executable [default: None]
+        dist_bins: list, tuple
+            A list of tuples with the boundaries of the distance bins to use in the calculation [default: CASP2 bins]
+        l_factor: float
+            The L/N factor used to filter the contacts before finding the False Negatives [default: 0.5]
+        aligner: :obj:`~conkit.misc.mapalign.ContactMapAligner`
+            The in-process contact map aligner, takes precedence over ``map_align_exe`` [default: None]
+
+        Raises
+        ------
+        :exc:`TypeError`
+           The prediction, the sequence or the aligner are not of the expected type
+        :exc:`ValueError`
+           The sequence has less than 5 residues
+
+        """
+        if not isinstance(sequence, Sequence) or not sequence:
+            raise TypeError("Invalid hierarchy type for sequence: %s" % sequence.__class__.__name__)
+        if len(sequence) < 5:
+            raise ValueError('Cannot validate a model with less than 5 residues')
+        if not isinstance(prediction, Distogram) or not prediction:
+            raise TypeError("Invalid hierarchy type for prediction: %s" % prediction.__class__.__name__)
+        if aligner is not None and not isinstance(aligner, ContactMapAligner):
+            raise TypeError("Invalid type for aligner: %s" % aligner.__class__.__name__)
+
+        if dist_bins is None:
+            dist_bins = DEFAULT_DISTANCE_BINS
+        else:
+            Distance._assert_valid_bins(dist_bins)
+
+        self.prediction = prediction
+        self.sequence = sequence
+        self.map_align_exe = map_align_exe
+        self.dist_bins = dist_bins
+        self.l_factor = l_factor
+        self.aligner = aligner
+        self.classifier, self.scaler = load_validation_model()
+
+        self._prediction_distogram = self._prepare_distogram(prediction.copy())
+        self._predicted_dict = self._prepare_contactmap(prediction.copy()).as_dict()
+        self._prediction_absent_residues = set()
+        if prediction.original_file_format == "pdb":
+            self._prediction_absent_residues.update(prediction.get_absent_residues(len(sequence)))
+        self._prediction_matrix = None
+        if aligner is not None:
+            self._prediction_matrix = aligner.get_contact_matrix(prediction)
+
+    def __repr__(self):
+        return "{}(prediction={} nresidues={})".format(self.__class__.__name__, self.prediction.id, len(self.sequence))
+
+    def validate(self, model, dssp):
+        """Validate a model against the prediction
+
+        Parameters
+        ----------
+        model: :obj:`~conkit.core.distogram.Distogram`
+            The PDB model that will be validated
+        dssp: :obj:`Bio.PDB.DSSP.DSSP`
+            The DSSP output for the PDB model that will be validated
+
+        Returns
+        -------
+        :obj:`~conkit.misc.validation.ModelValidationResult`
+           The per-residue features and error scores of the model
+
+        Raises
+        ------
+        :exc:`TypeError`
+           The model or the DSSP output are not of the expected type
+
+        """
+        if not isinstance(model, Distogram) or not model:
+            raise TypeError("Invalid hierarchy type for model: %s" % model.__class__.__name__)
+
+        absent_residues = self.get_absent_residues(model)
+        dssp = self.parse_dssp(dssp, absent_residues)
+        model_distogram = self._prepare_distogram(model.copy())
+        model_dict = self._prepare_contactmap(model.copy()).as_dict()
+
+        cmap_metrics, cmap_metrics_smooth = tools.get_cmap_validation_metrics(model_dict, self._predicted_dict,
+                                                                              self.sequence, absent_residues)
+        rmsd, rmsd_smooth = tools.get_rmsd(self._prediction_distogram, model_distogram)
+        zscore_metrics = tools.get_zscores(model_distogram, self._predicted_dict, absent_residues, rmsd,
+                                           *cmap_metrics)
+
+        features = zip(sorted(self._predicted_dict.keys()), rmsd_smooth, *cmap_metrics, *cmap_metrics_smooth,
+                       *zscore_metrics)
+        data = pd.DataFrame(list(features), columns=ALL_VALIDATION_FEATURES)
+        data = data.merge(dssp, how='inner', on=['RESNUM'])
+
+        alignment = {}
+        if self.aligner is not None or self.map_align_exe is not None:
+            alignment = self.align(model)
+        data['MISALIGNED'] = data.RESNUM.isin(alignment.keys())
+
+        scores = self._predict_scores(data, absent_residues)
+        data['SCORE'] = data['RESNUM'].apply(lambda x: scores.get(x))
+        return ModelValidationResult(data, scores, alignment, absent_residues)
+
+    def validate_many(self, models, dssps):
+        """Validate many models against the prediction
+
+        Parameters
+        ----------
+        models: list, tuple
+            The :obj:`~conkit.core.distogram.Distogram` instances of the PDB models that will be validated
+        dssps: list, tuple
+            The :obj:`Bio.PDB.DSSP.DSSP` output for each of the models
+
+        Returns
+        -------
+        list
+           A :obj:`~conkit.misc.validation.ModelValidationResult` for each model
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The number of models and DSSP outputs differ
+
+        """
+        models = list(models)
+        dssps = list(dssps)
+        if len(models) != len(dssps):
+            raise ValueError('A DSSP output is needed for each model')
+        return [self.validate(model, dssp) for model, dssp in zip(models, dssps)]
+
+    def get_absent_residues(self, model):
+        """Get a set of residues absent from a model and the prediction. Only distograms originating from
+        PDB files are considered.
+
+        Parameters
+        ----------
+        model: :obj:`~conkit.core.distogram.Distogram`
+            The PDB model that will be validated
+
+        Returns
+        -------
+        set
+           The residue numbers absent from the model or the prediction
+
+        """
+        absent_residues = set(self._prediction_absent_residues)
+        if model.original_file_format == "pdb":
+            absent_residues.update(model.get_absent_residues(len(self.sequence)))
+        return absent_residues
+
+    @staticmethod
+    def parse_dssp(dssp, absent_residues=None):
+        """Parse :obj:`Bio.PDB.DSSP.DSSP` into a :obj:`pandas.DataFrame` with secondary structure information
+        about the model
+
+        Parameters
+        ----------
+        dssp: :obj:`Bio.PDB.DSSP.DSSP`
+            The DSSP output for a PDB model
+        absent_residues: set, optional
+            The residues for which no secondary structure information is reported [default: None]
+
+        Returns
+        -------
+        :obj:`pandas.DataFrame`
+           The residue number, the secondary structure and the accessibility of each residue
+
+        Raises
+        ------
+        :exc:`TypeError`
+           The DSSP output is not a :obj:`Bio.PDB.DSSP.DSSP` instance
+
+        """
+        if not isinstance(dssp, DSSP):
+            raise TypeError("Invalid hierarchy type for dssp: %s" % dssp.__class__.__name__)
+        if absent_residues is None:
+            absent_residues = set()
+
+        _dssp_list = []
+        for residue in sorted(dssp.keys(), key=lambda x: x[1][1]):
+            resnum = residue[1][1]
+            if resnum in absent_residues:
+                _dssp_list.append((resnum, np.nan, np.nan, np.nan, np.nan))
+                continue
+            acc = dssp[residue][3]
+            if dssp[residue][2] in ('-', 'T', 'S'):
+                ss2 = (1, 0, 0)
+            elif dssp[residue][2] in ('H', 'G', 'I'):
+                ss2 = (0, 1, 0)
+            else:
+                ss2 = (0, 0, 1)
+            _dssp_list.append((resnum, *ss2, acc))
+
+        return pd.DataFrame(_dssp_list, columns=['RESNUM', 'COIL', 'HELIX', 'SHEET', 'ACC'])
+
+    def align(self, model):
+        """Obtain a contact map alignment between a model and the prediction and get the misaligned residues
+
+        The alignment is computed in-process if an :attr:`aligner` is available, otherwise the map_align executable
+        is used.
+
+        Parameters
+        ----------
+        model: :obj:`~conkit.core.distogram.Distogram`
+            The PDB model that will be validated
+
+        Returns
+        -------
+        dict
+           The misaligned residues in the model as keys and the residues they align to in the prediction as values
+
+        """
+        if self.aligner is not None:
+            return self.aligner.align(self._prediction_matrix, model)
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            contact_map_a = os.path.join(tmpdirname, 'contact_map_a.mapalign')
+            contact_map_b = os.path.join(tmpdirname, 'contact_map_b.mapalign')
+            conkit.io.write(contact_map_a, 'mapalign', self.prediction)
+            conkit.io.write(contact_map_b, 'mapalign', model)
+
+            map_align_cline = MapAlignCommandline(
+                cmd=self.map_align_exe,
+                contact_map_a=contact_map_a,
+                contact_map_b=contact_map_b)
+
+            stdout, stderr = map_align_cline()
+            return tools.parse_map_align_stdout(stdout)
+
+    def _prepare_distogram(self, distogram):
+        """General operations to prepare a :obj:`~conkit.core.distogram.Distogram` instance before validation"""
+        distogram.get_unique_distances(inplace=True)
+        distogram.sequence = self.sequence
+        distogram.set_sequence_register()
+
+        if distogram.original_file_format != "pdb":
+            distogram.reshape_bins(self.dist_bins)
+
+        return distogram
+
+    def _prepare_contactmap(self, distogram):
+        """General operations to prepare a :obj:`~conkit.core.contactmap.ContactMap` instance before validation"""
+        contactmap = distogram.as_contactmap()
+        contactmap.sequence = self.sequence
+        contactmap.set_sequence_register()
+        contactmap.remove_neighbors(inplace=True)
+
+        if distogram.original_file_format != "pdb":
+            contactmap.sort("raw_score", reverse=True, inplace=True)
+            contactmap.slice_map(seq_len=len(self.sequence), l_factor=self.l_factor, inplace=True)
+
+        return contactmap
+
+    def _predict_scores(self, data, absent_residues):
+        """Predict whether each residue is part of a model error or not with a single classifier call"""
+        features = data[SELECTED_VALIDATION_FEATURES].to_numpy(dtype=np.float64)
+        resnums = data.RESNUM.to_numpy()
+        valid = ~np.isnan(features).any(axis=1) & ~np.isin(resnums, list(absent_residues))
+
+        probabilities = np.full(len(resnums), np.nan)
+        if valid.any():
+            scaled_features = self.scaler.transform(features[valid])
+            probabilities[valid] = self.classifier.predict_proba(scaled_features)[:, 1]
+
+        predicted = {}
+        for resnum, probability in zip(resnums.tolist(), probabilities.tolist()):
+            predicted.setdefault(resnum, probability)
+        return {resnum: predicted.get(resnum, np.nan) for resnum in sorted(self._predicted_dict.keys())}
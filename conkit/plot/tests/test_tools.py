@@ -302,6 +302,78 @@ class Test(unittest.TestCase):
 
         self.assertIsNone(np.testing.assert_allclose(expected, np.array(output[0])))
 
+    def test_get_cmap_validation_metrics_4(self):
+        cmap_1 = ContactMap("cmap_1")
+        for c in [Contact(1, 7, 1.0), Contact(2, 8, 0.4), Contact(9, 3, 0.1), Contact(4, 4, 0.2)]:
+            cmap_1.add(c)
+
+        cmap_2 = ContactMap("cmap_2")
+        for c in [Contact(7, 1, 1.0), Contact(2, 8, 0.4), Contact(3, 9, 0.1), Contact(4, 4, 0.2), Contact(5, 9, 0.3)]:
+            cmap_2.add(c)
+
+        sequence = Sequence('seq', 'AAAAAAAAA')
+        cmap_1.sequence = sequence
+        cmap_2.sequence = sequence
+
+        output = tools.get_cmap_validation_metrics(cmap_1.as_dict(), cmap_2.as_dict(), sequence, {6})
+        np.testing.assert_array_equal([1, 0, 1, 0, 1, np.nan, 1, 0, 2], output[0][1])
+        np.testing.assert_array_equal([1, 0, 1, 0, 0, np.nan, 1, 0, 1], output[0][3])
+        self.assertEqual(0.0, output[0][5][0])
+        self.assertEqual(1.0, output[0][5][1])
+        self.assertEqual((9,), output[1][0].shape)
+        np.testing.assert_allclose(tools.convolution_smooth_values(np.nan_to_num(output[0][2])), output[1][2])
+
+    def test_get_adjacency_matrix_1(self):
+        adjacency = tools.get_adjacency_matrix({1: {(1, 3), (2, 1)}, 2: {(2, 1)}, 3: {(1, 3)}})
+        self.assertEqual((4, 4), adjacency.shape)
+        self.assertEqual([(1, 3), (2, 1)], [tuple(x) for x in np.argwhere(adjacency).tolist()])
+        self.assertEqual((6, 6), tools.get_adjacency_matrix({1: set()}, size=6).shape)
+
+    def test_convolution_smooth_matrix_1(self):
+        x = np.random.RandomState(0).uniform(size=(3, 12))
+        expected = [tools.convolution_smooth_values(row) for row in x]
+        np.testing.assert_allclose(expected, tools.convolution_smooth_matrix(x))
+        x = x[:, :3]
+        expected = [tools.convolution_smooth_values(row) for row in x]
+        np.testing.assert_array_equal(expected, tools.convolution_smooth_matrix(x))
+
+    def _distogram(self):
+        distogram = Distogram("test")
+        bins = ((0, 4), (4, 6), (6, 8), (8, 10), (10, 12), (12, np.inf))
+        random_state = np.random.RandomState(0)
+        for i in range(1, 13):
+            for j in range(i + 1, 13):
+                distogram.add(Distance(i, j, tuple(random_state.dirichlet(np.ones(6) * 0.3).tolist()), bins))
+        distogram.sequence = Sequence("test_seq", "A" * 12)
+        return distogram
+
+    def test_get_neighbourhood_mask_1(self):
+        distogram = self._distogram()
+        mask = tools.get_neighbourhood_mask(distogram, 7, 12)
+        for resnum in range(1, 13):
+            expected = distogram.find_residues_within(resnum, 7)
+            self.assertEqual(expected, set(np.flatnonzero(mask[resnum - 1]) + 1))
+        self.assertEqual((10, 10), tools.get_neighbourhood_mask(distogram, 7, 10).shape)
+
+    def test_get_zscores_1(self):
+        distogram = self._distogram()
+        random_state = np.random.RandomState(1)
+        metrics = [random_state.uniform(size=12).tolist(), [1] * 12, random_state.randint(0, 3, 12).tolist()]
+        metrics[0][3] = np.nan
+        predicted_cmap_dict = {resnum: set() for resnum in range(1, 13)}
+        output = tools.get_zscores(distogram, predicted_cmap_dict, {5}, *metrics)
+        for metric, zscores in zip(metrics, output):
+            expected = []
+            for resnum in range(1, 13):
+                if resnum == 5:
+                    expected.append(np.nan)
+                    continue
+                population = [metric[resid - 1] for resid in distogram.find_residues_within(resnum, 10)]
+                expected.append(tools.calculate_zscore(metric[resnum - 1], population))
+            np.testing.assert_allclose(np.array(expected, dtype=np.float64), zscores, atol=1e-12)
+        self.assertEqual([0.0] * 11, [x for x in output[1] if x == x])
+        self.assertEqual([], tools.get_zscores(distogram, predicted_cmap_dict, {5}))
+
     def test_is_executable_1(self):
         self.assertEqual(sys.executable, tools.is_executable(sys.executable))
 
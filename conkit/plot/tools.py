@@ -35,6 +35,7 @@ __version__ = "0.13.3"
 
 import numpy as np
 import os
+import scipy.ndimage
 
 from conkit.core.contact import Contact
 from conkit.core.contactmap import ContactMap
@@ -278,6 +279,33 @@ def convolution_smooth_values(x, window=5):
     return x_smooth
 
 
+def convolution_smooth_matrix(x, window=5):
+    """Use a single convolution to smooth each row of a matrix of numeric values
+
+    Parameters
+    ----------
+    x : :obj:`numpy.ndarray`
+       A 2-D array with the numeric values to be smoothed along each row
+    window : int
+       The residue window to be used to smooth values [default: 5]
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       A 2-D array with the smoothed numeric values of each row
+
+    See Also
+    --------
+    convolution_smooth_values
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if x.shape[1] < window or window % 2 == 0:
+        return np.array([convolution_smooth_values(row, window) for row in x])
+    box = np.ones(window) / window
+    return scipy.ndimage.convolve1d(x, box, axis=1, mode='constant')
+
+
 def get_rmsd(distogram_1, distogram_2, calculate_wrmsd=True):
     """Calculate the RMSD between two different distograms
 
@@ -300,6 +328,37 @@ def get_rmsd(distogram_1, distogram_2, calculate_wrmsd=True):
     return rmsd_raw, rmsd_smooth
 
 
+def get_adjacency_matrix(cmap_dict, size=None):
+    """Convert the dictionary representation of a contact map into a boolean adjacency matrix
+
+    Parameters
+    ----------
+    cmap_dict : dict
+       Dictionary representation of a contact map, as obtained with
+       :meth:`~conkit.core.contactmap.ContactMap.as_dict`
+    size : int, optional
+       The size of the matrix, which must be greater than the highest residue number [default: highest residue
+       number + 1]
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       A square matrix indexed by residue number where element ``[i, j]`` is `True` for the contact ``(i, j)``.
+       The residue order of each contact is kept, so ``(i, j)`` and ``(j, i)`` are distinct contacts.
+
+    """
+    contacts = set()
+    for residue_contacts in cmap_dict.values():
+        contacts.update(residue_contacts)
+    contacts = np.array(sorted(contacts), dtype=np.int64).reshape(-1, 2)
+
+    if size is None:
+        size = max(max(cmap_dict.keys(), default=0), contacts.max(initial=0)) + 1
+    adjacency = np.zeros((size, size), dtype=bool)
+    adjacency[contacts[:, 0], contacts[:, 1]] = True
+    return adjacency
+
+
 def get_cmap_validation_metrics(model_cmap_dict, predicted_cmap_dict, sequence, absent_residues):
     """For a given observed contact map and predicted contact map calculate a series of validation metrics at each
     residue position (Accuracy, FN, FNR, FP, FPR, Sensitivity, Specificity)
@@ -319,66 +378,86 @@ def get_cmap_validation_metrics(model_cmap_dict, predicted_cmap_dict, sequence,
     tuple
         Two lists with the raw/smoothed values of each validation metric at each residue position
     """
+    resnums = np.array(sorted(predicted_cmap_dict.keys()), dtype=np.int64)
+    absent_residues = np.array(sorted(absent_residues or ()), dtype=np.int64)
+
+    model_adjacency = get_adjacency_matrix({resnum: model_cmap_dict[resnum] for resnum in resnums.tolist()})
+    predicted_adjacency = get_adjacency_matrix(predicted_cmap_dict)
+    size = max(len(model_adjacency), len(predicted_adjacency), absent_residues.max(initial=0) + 1)
+    model_adjacency = np.pad(model_adjacency, (0, size - len(model_adjacency)))
+    predicted_adjacency = np.pad(predicted_adjacency, (0, size - len(predicted_adjacency)))
+
+    # Contacts with an absent residue are ignored, and each contact is counted for both of its residues
+    present = np.ones(size, dtype=bool)
+    present[absent_residues] = False
+    present_pairs = np.outer(present, present)
+    model_adjacency &= present_pairs
+    predicted_adjacency &= present_pairs
+
+    def count(adjacency):
+        return (adjacency.sum(axis=1) + adjacency.sum(axis=0) - adjacency.diagonal())[resnums]
+
+    _tp = count(model_adjacency & predicted_adjacency)
+    _fn = count(predicted_adjacency & ~model_adjacency)
+    _fp = count(model_adjacency & ~predicted_adjacency)
+    _tn = len(sequence) - len(absent_residues) - _fn - _tp - _fp
+
+    def ratio(numerator, denominator):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator > 0, numerator / denominator, 0.0)
+
+    metrics = (
+        ratio(_tp + _tn, _tp + _fp + _tn + _fn),  # accuracy
+        _fn,
+        ratio(_fn, _fn + _tn),  # false negative rate
+        _fp,
+        ratio(_fp, _fp + _tp),  # false positive rate
+        ratio(_tp, _fn + _tp),  # sensitivity
+        ratio(_tn, _fp + _tn),  # specificity
+    )
+
+    absent = ~present[resnums]
+    cmap_metrics = []
+    for metric in metrics:
+        metric = metric.tolist()
+        for idx in np.flatnonzero(absent):
+            metric[idx] = np.nan
+        cmap_metrics.append(metric)
+
+    smooth_cmap_metrics = list(convolution_smooth_matrix(np.nan_to_num(np.array(cmap_metrics, dtype=np.float64))))
+    return cmap_metrics, smooth_cmap_metrics
 
-    def accuracy(tp, fp, tn, fn):
-        if (tp + fp + tn + fn) > 0:
-            return (tp + tn) / (tp + fp + tn + fn)
-        return 0
-
-    def fn(*args):
-        return args[-1]
-
-    def fn_rate(tp, fp, tn, fn):
-        if (fn + tn) > 0:
-            return fn / (fn + tn)
-        return 0
-
-    def fp(*args):
-        return args[1]
-
-    def fp_rate(tp, fp, tn, fn):
-        if (fp + tp) > 0:
-            return fp / (fp + tp)
-        return 0
-
-    def sensitivity(tp, fp, tn, fn):
-        if (fn + tp) > 0:
-            return tp / (fn + tp)
-        return 0
-
-    def specificity(tp, fp, tn, fn):
-        if (fp + tn) > 0:
-            return tn / (fp + tn)
-        return 0
-
-    nresidues = len(sequence) - len(absent_residues)
-    cmap_metrics = [[] for i in range(7)]
-    metrics_list = (accuracy, fn, fn_rate, fp, fp_rate, sensitivity, specificity)
-
-    for resnum in sorted(predicted_cmap_dict.keys()):
-        if absent_residues and resnum in absent_residues:
-            for metric in cmap_metrics:
-                metric.append(np.nan)
-            continue
 
-        predicted_contact_set = {c for c in predicted_cmap_dict[resnum] if
-                                 c[0] not in absent_residues and c[1] not in absent_residues}
-        model_contact_set = {c for c in model_cmap_dict[resnum] if
-                             c[0] not in absent_residues and c[1] not in absent_residues}
+def get_neighbourhood_mask(distogram, distance_cutoff, size):
+    """Find the residues within a given distance of each other as a boolean matrix
 
-        _fn = len(predicted_contact_set - model_contact_set)
-        _tp = len(predicted_contact_set & model_contact_set)
-        _fp = len(model_contact_set - predicted_contact_set)
-        _tn = nresidues - _fn - _tp - _fp
+    Parameters
+    ----------
+    distogram : :obj:`~conkit.core.distogram.Distogram`
+       The distogram used to find the residues, using the
+       :attr:`~conkit.core.distance.Distance.predicted_distance` of each residue pair
+    distance_cutoff : int, float
+       The distance cutoff used to find residues
+    size : int
+       The number of residues, so that the matrix covers residue numbers 1 to ``size``
 
-        for idx, metric in enumerate(metrics_list):
-            cmap_metrics[idx].append(metric(_tp, _fp, _tn, _fn))
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       A (size, size) matrix where element ``[i - 1, j - 1]`` is `True` if residue ``j`` is in
+       :meth:`~conkit.core.distogram.Distogram.find_residues_within` for residue ``i``
 
-    smooth_cmap_metrics = []
-    for metric in cmap_metrics:
-        smooth_cmap_metrics.append(convolution_smooth_values(np.nan_to_num(metric), 5))
+    """
+    pairs = [distance.id for distance in distogram if distance.predicted_distance <= distance_cutoff]
+    pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2) - 1
+    pairs = pairs[((pairs >= 0) & (pairs < size)).all(axis=1)]
 
-    return cmap_metrics, smooth_cmap_metrics
+    mask = np.zeros((size, size), dtype=bool)
+    mask[pairs[:, 0], pairs[:, 1]] = True
+    mask[pairs[:, 1], pairs[:, 0]] = True
+    # A residue belongs to its own neighbourhood as long as it has any neighbour
+    mask[np.diag_indices(size)] |= mask.any(axis=1)
+    return mask
 
 
 def get_zscores(model_distogram, predicted_cmap_dict, absent_residues, *metrics):
@@ -402,19 +481,39 @@ def get_zscores(model_distogram, predicted_cmap_dict, absent_residues, *metrics)
        A list of lists where each sublist contains the Z-Scores for the input metrics across all the residues. The
        sublists containing the Z-Scores are ordered in the same original order as in the input *metrics
     """
-    zscore_cmap_metrics = [[] for i in metrics]
-
-    for resnum in sorted(predicted_cmap_dict.keys()):
-        if absent_residues and resnum in absent_residues:
-            for zscore_metric in zscore_cmap_metrics:
+    resnums = sorted(predicted_cmap_dict.keys())
+    if not metrics:
+        return []
+    metrics = np.array(metrics, dtype=np.float64).reshape(len(metrics), -1)
+    mask = get_neighbourhood_mask(model_distogram, 10, metrics.shape[1])
+
+    population_size = mask.sum(axis=1)
+    weights = mask / np.maximum(population_size, 1)[:, None]
+    zscores = []
+    for metric in metrics:
+        # Each row of the mask selects the population of a residue, so the statistics of all residues are
+        # obtained at once. Populations with a missing score yield NaN, as np.std and np.mean would.
+        population_nan = mask @ np.isnan(metric)
+        values = np.nan_to_num(metric)
+        mean = weights @ values
+        stdev = np.sqrt((weights * (values[None, :] - mean[:, None]) ** 2).sum(axis=1))
+        lowest = np.where(mask, values[None, :], np.inf).min(axis=1)
+        highest = np.where(mask, values[None, :], -np.inf).max(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscore = (values - mean) / stdev
+        zscore[population_nan] = np.nan
+        zscore[np.isnan(metric)] = np.nan
+        zscore[(population_size < 2) | ((lowest == highest) & ~population_nan)] = 0
+        zscores.append(zscore)
+
+    zscore_cmap_metrics = [[] for _ in zscores]
+    for resnum in resnums:
+        for zscore, zscore_metric in zip(zscores, zscore_cmap_metrics):
+            if absent_residues and resnum in absent_residues:
                 zscore_metric.append(np.nan)
-            continue
-
-        neighbour_residues = model_distogram.find_residues_within(resnum, 10)
-        for cmap_metric, zscore_metric in zip(metrics, zscore_cmap_metrics):
-            population_scores = [cmap_metric[resid - 1] for resid in neighbour_residues]
-            observed_score = cmap_metric[resnum - 1]
-            zscore_metric.append(calculate_zscore(observed_score, population_scores))
+            else:
+                zscore_metric.append(float(zscore[resnum - 1]))
 
     return zscore_cmap_metrics
 
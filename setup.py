@@ -46,7 +46,8 @@ def dependencies():
 
 
 def extensions():
-    exts = ["conkit/core/ext/c_contactmap.pyx", "conkit/core/ext/c_sequencefile.pyx", "conkit/misc/ext/c_bandwidth.pyx"]
+    exts = ["conkit/core/ext/c_contactmap.pyx", "conkit/core/ext/c_sequencefile.pyx", "conkit/misc/ext/c_bandwidth.pyx",
+            "conkit/misc/ext/c_mapalign.pyx"]
     extensions = []
     for ext in exts:
         extensions.append(